@@ -0,0 +1,132 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Optional
+
+
+class Command(ABC):
+    """
+    An edit that has been applied and can be undone and redone.  A command that holds resources while it is in one
+    of its two states, such as the detached tree nodes of a deletion, releases them in discard, which is invoked when
+    the command is dropped from its CommandJournal.
+
+    """
+    @abstractmethod
+    def undo(self) -> None:
+        """
+        Revert the edit
+
+        :return: None
+
+        """
+        pass
+
+    @abstractmethod
+    def redo(self) -> None:
+        """
+        Apply the edit again after it was undone
+
+        :return: None
+
+        """
+        pass
+
+    def discard(self) -> None:
+        """
+        Release what the command holds.  The command is not used again.
+
+        :return: None
+
+        """
+        pass
+
+
+class CommandJournal:
+    """
+    A bounded history of applied Commands.  Undo reverts the most recently applied command and redo applies the most
+    recently undone command again.  Recording a command drops the undone commands, and when more than capacity
+    commands are held the oldest is dropped, so the memory the journal holds is capped by its capacity.  Every
+    operation takes constant time, apart from the discarding of dropped commands.
+
+    """
+    def __init__(self, capacity: int = 100):
+        """
+        Creates an empty CommandJournal
+
+        :param capacity: the maximum number of commands held, done and undone
+        :type capacity: int
+
+        """
+        if capacity < 1:
+            raise ValueError(f'CommandJournal capacity must be at least 1, not {capacity}')
+        self.capacity: int = capacity
+        self.done: deque[Command] = deque()
+        self.undone: list[Command] = []
+
+    def __len__(self) -> int:
+        return len(self.done) + len(self.undone)
+
+    @property
+    def can_undo(self) -> bool:
+        return len(self.done) > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return len(self.undone) > 0
+
+    def record(self, command: Command) -> None:
+        """
+        Add a command that has just been applied, discarding the undone commands and, if the journal is full, the
+        oldest command
+
+        :param command: the applied command
+        :type command: plugin_manager.gui.command_journal.Command
+        :return: None
+
+        """
+        while len(self.undone) > 0:
+            self.undone.pop().discard()
+        self.done.append(command)
+        while len(self.done) > self.capacity:
+            self.done.popleft().discard()
+
+    def undo(self) -> Optional[Command]:
+        """
+        Revert the most recently applied command
+
+        :return: the reverted command, or None if there is nothing to undo
+        :rtype: Optional[plugin_manager.gui.command_journal.Command]
+
+        """
+        if len(self.done) == 0:
+            return None
+        command: Command = self.done.pop()
+        command.undo()
+        self.undone.append(command)
+        return command
+
+    def redo(self) -> Optional[Command]:
+        """
+        Apply the most recently undone command again
+
+        :return: the applied command, or None if there is nothing to redo
+        :rtype: Optional[plugin_manager.gui.command_journal.Command]
+
+        """
+        if len(self.undone) == 0:
+            return None
+        command: Command = self.undone.pop()
+        command.redo()
+        self.done.append(command)
+        return command
+
+    def clear(self) -> None:
+        """
+        Discard every command
+
+        :return: None
+
+        """
+        while len(self.undone) > 0:
+            self.undone.pop().discard()
+        while len(self.done) > 0:
+            self.done.pop().discard()
@@ -0,0 +1,148 @@
+import re
+from typing import Hashable, Iterable, Optional
+
+# the characters that separate the words of an indexed text
+WORD_SPLIT = re.compile(r'[^\w]+')
+
+
+def trigrams(text: str) -> set[str]:
+    """
+    List the distinct three character substrings of a text
+
+    :param text: the text
+    :type text: str
+    :return: the trigrams
+    :rtype: set[str]
+
+    """
+    return {text[char_idx:char_idx + 3] for char_idx in range(0, len(text) - 2)}
+
+
+def word_prefixes(text: str) -> set[str]:
+    """
+    List the distinct one and two character prefixes of the words of a text
+
+    :param text: the text
+    :type text: str
+    :return: the prefixes
+    :rtype: set[str]
+
+    """
+    prefixes: set[str] = set()
+    for word in WORD_SPLIT.split(text):
+        prefixes.update(word[0:prefix_len] for prefix_len in (1, 2) if len(word) >= prefix_len)
+    return prefixes
+
+
+class SearchIndex:
+    """
+    A case insensitive substring index over a set of short texts, each identified by a key, such as the iid of a
+    Treeview node.  A query is split into terms, and a text matches if it matches every term.  A term of three or
+    more characters matches texts containing it, and is looked up through a trigram index, so only the texts
+    containing every trigram of the term are examined.  A shorter term matches texts with a word starting with it,
+    and is looked up in a word prefix index.  Texts are added, replaced and removed one at a time, so the index can
+    be kept up to date as the texts are edited.
+
+    """
+    def __init__(self):
+        """
+        Creates an empty SearchIndex
+
+        """
+        self.texts: dict[Hashable, str] = {}
+        self.trigram_keys: dict[str, set[Hashable]] = {}
+        self.prefix_keys: dict[str, set[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.texts
+
+    def add(self, key: Hashable, text: str) -> None:
+        """
+        Index a text, replacing the text previously indexed for the key
+
+        :param key: identifies the text
+        :type key: Hashable
+        :param text: the text
+        :type text: str
+        :return: None
+
+        """
+        text = text.lower()
+        previous: Optional[str] = self.texts.get(key)
+        if previous == text:
+            return
+        if previous is not None:
+            self.remove(key)
+        self.texts[key] = text
+        for trigram in trigrams(text):
+            self.trigram_keys.setdefault(trigram, set()).add(key)
+        for prefix in word_prefixes(text):
+            self.prefix_keys.setdefault(prefix, set()).add(key)
+
+    def remove(self, key: Hashable) -> None:
+        """
+        Remove a text from the index.  Has no effect if the key is not indexed.
+
+        :param key: identifies the text
+        :type key: Hashable
+        :return: None
+
+        """
+        text: Optional[str] = self.texts.pop(key, None)
+        if text is None:
+            return
+        for postings, grams in ((self.trigram_keys, trigrams(text)), (self.prefix_keys, word_prefixes(text))):
+            for gram in grams:
+                keys: set[Hashable] = postings[gram]
+                keys.discard(key)
+                if len(keys) == 0:
+                    del postings[gram]
+
+    def term_keys(self, term: str) -> set[Hashable]:
+        """
+        Find the keys of the texts matching a single, lower case, term
+
+        :param term: the term
+        :type term: str
+        :return: the matching keys
+        :rtype: set[Hashable]
+
+        """
+        if len(term) < 3:
+            return set(self.prefix_keys.get(term, ()))
+        postings: list[set[Hashable]] = []
+        for trigram in trigrams(term):
+            keys: Optional[set[Hashable]] = self.trigram_keys.get(trigram)
+            if keys is None:
+                return set()
+            postings.append(keys)
+        postings.sort(key=len)
+        candidates: Iterable[Hashable] = postings[0].intersection(*postings[1:])
+        return {key for key in candidates if term in self.texts[key]}
+
+    def search(self, query: str) -> set[Hashable]:
+        """
+        Find the keys of the texts matching every term of a query
+
+        :param query: the whitespace separated terms
+        :type query: str
+        :return: the matching keys, or every key if the query has no terms
+        :rtype: set[Hashable]
+
+        """
+        terms: list[str] = sorted(set(query.lower().split()), key=len, reverse=True)
+        if len(terms) == 0:
+            return set(self.texts)
+        matches: set[Hashable] = self.term_keys(terms[0])
+        # the longest term is looked up in the index, and the other terms only filter its matches
+        for term in terms[1:]:
+            if len(matches) == 0:
+                break
+            if len(term) < 3:
+                matches &= self.prefix_keys.get(term, set())
+            else:
+                matches = {key for key in matches if term in self.texts[key]}
+        return matches
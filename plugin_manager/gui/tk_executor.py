@@ -0,0 +1,313 @@
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+import queue
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+import plugin_manager.model.plugin as model
+
+
+@dataclass
+class ExecutorMetrics:
+    """
+    Counters and latencies reported by a TkCallExecutor.  Latencies are in seconds.
+
+    :param submitted: the number of calls submitted to the thread pool
+    :type submitted: int
+    :param completed: the number of calls whose result was delivered
+    :type completed: int
+    :param failed: the number of calls whose exception was delivered
+    :type failed: int
+    :param deduplicated: the number of calls ignored because the same call was already in flight
+    :type deduplicated: int
+    :param max_queue_depth: the largest number of calls that were waiting for a worker thread at once
+    :type max_queue_depth: int
+    :param total_wait: the total time calls spent waiting for a worker thread
+    :type total_wait: float
+    :param max_wait: the longest time a call spent waiting for a worker thread
+    :type max_wait: float
+    :param total_run: the total time spent running calls
+    :type total_run: float
+    :param max_run: the longest time spent running a call
+    :type max_run: float
+    :param total_delivery: the total time between calls finishing and their results being delivered on the Tk thread
+    :type total_delivery: float
+    :param max_delivery: the longest time between a call finishing and its result being delivered on the Tk thread
+    :type max_delivery: float
+
+    """
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    deduplicated: int = 0
+    max_queue_depth: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    total_run: float = 0.0
+    max_run: float = 0.0
+    total_delivery: float = 0.0
+    max_delivery: float = 0.0
+
+    @property
+    def delivered(self) -> int:
+        return self.completed + self.failed
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.delivered if self.delivered > 0 else 0.0
+
+    @property
+    def mean_run(self) -> float:
+        return self.total_run / self.delivered if self.delivered > 0 else 0.0
+
+    @property
+    def mean_delivery(self) -> float:
+        return self.total_delivery / self.delivered if self.delivered > 0 else 0.0
+
+
+@dataclass
+class CallOutcome:
+    """
+    The outcome of a call run on the thread pool, passed from the worker thread to the Tk thread
+
+    :param key: the key the call was submitted with
+    :type key: Hashable
+    :param result: the value returned by the call
+    :type result: Any
+    :param error: the exception raised by the call, or None
+    :type error: Optional[BaseException]
+    :param submitted: the time the call was submitted
+    :type submitted: float
+    :param started: the time a worker thread started the call
+    :type started: float
+    :param finished: the time the call finished
+    :type finished: float
+
+    """
+    key: Hashable
+    result: Any
+    error: Optional[BaseException]
+    submitted: float
+    started: float
+    finished: float
+
+
+class TkCallExecutor:
+    """
+    Runs calls on a thread pool on behalf of a Tk application, and delivers their results and exceptions back to the
+    Tk thread.  Worker threads never touch Tk: each outcome is placed on a queue that is polled on the Tk thread with
+    after(), so the result and error callbacks always run on the Tk thread.  Polling is only scheduled while calls are
+    in flight.
+
+    Calls are submitted with a key.  While a call is in flight, further calls with the same key are ignored, so
+    repeated clicks on a menu item whose entry point is still running do not start it again.
+
+    The executor only depends on the after and after_cancel methods of the widget it is given, and may be used with
+    any object providing them.
+
+    """
+    def __init__(self, widget, max_workers: int = 4, poll_interval: int = 20, executor: Optional[Executor] = None,
+                 result_action: Optional[Callable] = None, error_action: Optional[Callable] = None):
+        """
+        Creates an instance of TkCallExecutor
+
+        :param widget: a Tk widget, or other object with after and after_cancel methods, used to poll for outcomes
+        :param max_workers: the number of worker threads, if an executor is not provided
+        :type max_workers: int
+        :param poll_interval: the number of milliseconds between polls for outcomes
+        :type poll_interval: int
+        :param executor: the executor calls are run on, by default a ThreadPoolExecutor owned by this object
+        :type executor: Optional[concurrent.futures.Executor]
+        :param result_action: invoked on the Tk thread with the result of each entry point wrapped by wrap_entry_point
+        :type result_action: Optional[Callable]
+        :param error_action: invoked on the Tk thread with the exception raised by each entry point wrapped by
+            wrap_entry_point
+        :type error_action: Optional[Callable]
+
+        """
+        self.widget = widget
+        self.poll_interval: int = poll_interval
+        self.owns_executor: bool = executor is None
+        self.executor: Executor = executor if executor is not None else \
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='tk-call')
+        self.result_action: Optional[Callable] = result_action
+        self.error_action: Optional[Callable] = error_action
+        self.outcomes: queue.SimpleQueue = queue.SimpleQueue()
+        self.lock = threading.Lock()
+        # the result and error callbacks of each call in flight
+        self.in_flight: dict[Hashable, tuple[Optional[Callable], Optional[Callable]]] = {}
+        self.waiting: int = 0
+        self.metrics: ExecutorMetrics = ExecutorMetrics()
+        self.after_id: Optional[str] = None
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        The number of submitted calls that are waiting for a worker thread
+
+        :return: the queue depth
+        :rtype: int
+
+        """
+        return self.waiting
+
+    def run(self, key: Hashable, submitted: float, func: Callable, args: tuple, kwargs: dict) -> None:
+        """
+        Run a call on a worker thread and queue its outcome for the Tk thread
+
+        :param key: identifies the call for deduplication
+        :type key: Hashable
+        :param submitted: the time the call was submitted
+        :type submitted: float
+        :param func: the Callable to be run
+        :type func: Callable
+        :param args: the positional arguments for func
+        :type args: tuple
+        :param kwargs: the keyword arguments for func
+        :type kwargs: dict
+        :return: None
+
+        """
+        started: float = time.perf_counter()
+        with self.lock:
+            self.waiting -= 1
+        try:
+            result: Any = func(*args, **kwargs)
+            error: Optional[BaseException] = None
+        except BaseException as exc:
+            result = None
+            error = exc
+        self.outcomes.put(CallOutcome(key=key, result=result, error=error, submitted=submitted, started=started,
+                                      finished=time.perf_counter()))
+
+    def submit(self, key: Hashable, func: Callable, *args, on_result: Optional[Callable] = None,
+               on_error: Optional[Callable] = None, **kwargs) -> bool:
+        """
+        Run a call on the thread pool.  Must be invoked on the Tk thread.
+
+        :param key: identifies the call for deduplication
+        :type key: Hashable
+        :param func: the Callable to be run
+        :type func: Callable
+        :param args: the positional arguments for func
+        :param on_result: invoked on the Tk thread with the value returned by func
+        :type on_result: Optional[Callable]
+        :param on_error: invoked on the Tk thread with the exception raised by func
+        :type on_error: Optional[Callable]
+        :param kwargs: the keyword arguments for func
+        :return: True if the call was submitted, False if a call with the same key is already in flight
+        :rtype: bool
+
+        """
+        if key in self.in_flight:
+            self.metrics.deduplicated += 1
+            return False
+        self.in_flight[key] = (on_result, on_error)
+        with self.lock:
+            self.waiting += 1
+            self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self.waiting)
+        self.metrics.submitted += 1
+        try:
+            self.executor.submit(self.run, key, time.perf_counter(), func, args, kwargs)
+        except BaseException:
+            del self.in_flight[key]
+            with self.lock:
+                self.waiting -= 1
+            raise
+        self.schedule_poll()
+        return True
+
+    def in_flight_keys(self) -> list[Hashable]:
+        return list(self.in_flight)
+
+    def schedule_poll(self) -> None:
+        if self.after_id is None:
+            self.after_id = self.widget.after(self.poll_interval, self.poll)
+
+    def poll(self) -> None:
+        """
+        Deliver the outcomes of finished calls on the Tk thread, then poll again if calls are still in flight
+
+        :return: None
+
+        """
+        self.after_id = None
+        while True:
+            try:
+                outcome: CallOutcome = self.outcomes.get_nowait()
+            except queue.Empty:
+                break
+            self.deliver(outcome)
+        if len(self.in_flight) > 0:
+            self.schedule_poll()
+
+    def deliver(self, outcome: CallOutcome) -> None:
+        """
+        Update the metrics for a finished call and invoke its result or error callback
+
+        :param outcome: the finished call's outcome
+        :type outcome: plugin_manager.gui.tk_executor.CallOutcome
+        :return: None
+
+        """
+        on_result, on_error = self.in_flight.pop(outcome.key, (None, None))
+        wait: float = outcome.started - outcome.submitted
+        run: float = outcome.finished - outcome.started
+        delivery: float = time.perf_counter() - outcome.finished
+        metrics: ExecutorMetrics = self.metrics
+        metrics.total_wait += wait
+        metrics.max_wait = max(metrics.max_wait, wait)
+        metrics.total_run += run
+        metrics.max_run = max(metrics.max_run, run)
+        metrics.total_delivery += delivery
+        metrics.max_delivery = max(metrics.max_delivery, delivery)
+        if outcome.error is None:
+            metrics.completed += 1
+            if on_result is not None:
+                on_result(outcome.result)
+        else:
+            metrics.failed += 1
+            if on_error is not None:
+                on_error(outcome.error)
+
+    def wrap_entry_point(self, item: model.PluginMenuItem, entry_point: Callable, module_name: str) -> Callable:
+        """
+        A wrap_entry_point hook for plugin_manager.model.plugin.PluginMenu.create_menu.  The Callable returned runs
+        the entry point on the thread pool, so the selection action still runs on the Tk thread and the entry point
+        runs after it, with the arguments the selection action collected.  Results and exceptions are passed to the
+        executor's result_action and error_action.
+
+        :param item: the menu item
+        :type item: plugin_manager.model.plugin.PluginMenuItem
+        :param entry_point: the menu item's resolved entry point
+        :type entry_point: Callable
+        :param module_name: the name of the menu's plugin module
+        :type module_name: str
+        :return: a Callable that submits the entry point to the thread pool
+        :rtype: Callable
+
+        """
+        key: tuple[str, int] = ('entry_point', id(item))
+
+        def submit_entry_point(*args, **kwargs) -> bool:
+            return self.submit(key, entry_point, *args, on_result=self.result_action, on_error=self.error_action,
+                               **kwargs)
+        return submit_entry_point
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Stop polling and, if the executor is owned by this object, shut it down.  Outcomes of calls still in flight
+        are discarded.
+
+        :param wait: wait for the calls in flight to finish
+        :type wait: bool
+        :return: None
+
+        """
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+        if self.owns_executor:
+            self.executor.shutdown(wait=wait, cancel_futures=True)
+        self.in_flight.clear()
@@ -10,6 +10,7 @@ import ttkbootstrap as ttkb
 import plugin_manager.model.json_handler as jh
 
 import plugin_manager.model.plugin as model
+import plugin_manager.model.workspace as workspace
 import plugin_manager.gui.tk_widgets as plugin_widgets
 
 
@@ -17,13 +18,22 @@ class Application(ttkb.Window):
     """
     The top level GUI for the Plugin Manager application
 
+    A folder of Plugin JSON files can be opened as a workspace.  Its files are listed from their headers, and a
+    Plugin is only decoded when it is selected.  The PluginWidgets of the most recently selected Plugins are kept,
+    hidden, in an LRUCache, so switching back to one of them shows it with its tree state and edits intact rather
+    than building it again.  When a PluginWidget is evicted, its unsaved edits are applied to its Plugin, which the
+    Workspace holds until it is saved.
+
     """
     MLABEL_NEW = 'New'
     MLABEL_OPEN = 'Open...'
+    MLABEL_OPEN_FOLDER = 'Open Folder...'
     MLABEL_SAVE = 'Save'
     MLABEL_SAVE_AS = 'Save As...'
     MLABEL_QUIT = 'Quit'
     JSON_LABEL_TEXT = 'Plugin JSON File:'
+    # the number of workspace PluginWidgets kept
+    WIDGET_CAPACITY = 8
 
     def __init__(self):
         """
@@ -36,6 +46,7 @@ class Application(ttkb.Window):
         self.file_menu = ttkb.Menu(menubar, title='File')
         self.file_menu.add_command(label=Application.MLABEL_NEW, command=self.create_plugin)
         self.file_menu.add_command(label=Application.MLABEL_OPEN, command=self.browse_plugins)
+        self.file_menu.add_command(label=Application.MLABEL_OPEN_FOLDER, command=self.browse_folder)
         self.file_menu.add_command(label=Application.MLABEL_SAVE, command=self.save)
         self.file_menu.add_command(label=Application.MLABEL_SAVE_AS, command=self.save_as)
         self.file_menu.add_separator()
@@ -45,12 +56,18 @@ class Application(ttkb.Window):
 
         self.json_path: Optional[pathlib.Path] = pathlib.Path.cwd()
         self.plugin: Optional[model.Plugin] = None
+        self.workspace: Optional[workspace.Workspace] = None
+        self.plugin_widgets = workspace.LRUCache(Application.WIDGET_CAPACITY, on_evict=self.evict_plugin_widget)
 
         row: int = 0
         self.json_file_label = ttkb.Label(self, text=Application.JSON_LABEL_TEXT, anchor=tk.W, width=120)
         self.json_file_label.grid(column=0, row=row, padx=5, pady=5)
         self.plugin_widget = plugin_widgets.PluginWidget(self, plugin=None)
 
+        row += 1
+        self.workspace_list = plugin_widgets.WorkspaceList(self, select_action=self.select_workspace_plugin)
+        self.workspace_list_row = row
+
         row += 1
         self.plugin_widget_row = row
         self.plugin_widget_columnspan = 6
@@ -83,9 +100,7 @@ class Application(ttkb.Window):
             try:
                 plugin = self.read_json(self.json_path)
                 self.plugin = plugin
-                self.plugin_widget.forget()
-                self.plugin_widget = plugin_widgets.PluginWidget(self, plugin=self.plugin)
-                self.plugin_widget.grid(column=0, row=self.plugin_widget_row, columnspan=self.plugin_widget_columnspan)
+                self.show_plugin_widget(plugin_widgets.PluginWidget(self, plugin=self.plugin))
                 self.file_menu.entryconfigure(Application.MLABEL_SAVE, state=ttkb.NORMAL)
                 self.file_menu.entryconfigure(Application.MLABEL_SAVE_AS, state=ttkb.NORMAL)
                 self.plugin_widget.focus_set()
@@ -93,6 +108,103 @@ class Application(ttkb.Window):
             except TypeError:
                 raise TypeError(sys.exc_info())
 
+    def show_plugin_widget(self, plugin_widget: plugin_widgets.PluginWidget) -> None:
+        """
+        Show a PluginWidget in place of the current one.  The current PluginWidget is hidden if it is kept in the
+        workspace cache, and destroyed otherwise.
+
+        :param plugin_widget: the PluginWidget to be shown
+        :type plugin_widget: plugin_manager.gui.tk_widgets.PluginWidget
+        :return: None
+
+        """
+        if plugin_widget is self.plugin_widget:
+            return
+        if self.plugin_widget in self.plugin_widgets.entries.values():
+            self.plugin_widget.grid_remove()
+        else:
+            self.plugin_widget.destroy()
+        self.plugin_widget = plugin_widget
+        self.plugin_widget.grid(column=0, row=self.plugin_widget_row, columnspan=self.plugin_widget_columnspan)
+
+    def browse_folder(self) -> None:
+        """
+        Presents a 'choose directory' dialog to allow the user to select a folder of plugin spec JSON files, and opens
+        it as a workspace
+
+        :return: None
+
+        """
+        folder_str: str = filedialog.askdirectory(mustexist=True)
+        if len(folder_str) > 0:
+            self.open_workspace(pathlib.Path(folder_str))
+
+    def open_workspace(self, plugin_path: pathlib.Path) -> None:
+        """
+        List the Plugin JSON files in a folder by their headers.  The PluginWidgets kept for the previous workspace
+        are discarded.
+
+        :param plugin_path: a Path object pointing to the folder containing the Plugin JSON files
+        :type plugin_path: pathlib.Path
+        :return: None
+
+        """
+        self.show_plugin_widget(plugin_widgets.PluginWidget(self, plugin=None))
+        for json_path in self.plugin_widgets.keys():
+            self.plugin_widgets.pop(json_path).destroy()
+        self.plugin = None
+        self.workspace = workspace.Workspace(plugin_path)
+        self.workspace_list.set_headers(self.workspace.headers())
+        self.workspace_list.grid(column=0, row=self.workspace_list_row, columnspan=self.plugin_widget_columnspan,
+                                 padx=10, pady=5, sticky=tk.EW)
+        self.file_menu.entryconfigure(Application.MLABEL_SAVE, state=ttkb.DISABLED)
+        self.set_json_file_label(str(plugin_path))
+
+    def select_workspace_plugin(self, event) -> None:
+        """
+        A callback invoked when a Plugin JSON file is selected in the WorkspaceList.  The file's PluginWidget is shown
+        if it is kept, and otherwise the file's Plugin is provided by the Workspace and a PluginWidget is built for it.
+
+        :param event:
+        :return: None
+
+        """
+        json_path: Optional[pathlib.Path] = self.workspace_list.selected_path()
+        if json_path is None or self.workspace is None:
+            return
+        plugin_widget: Optional[plugin_widgets.PluginWidget] = self.plugin_widgets.get(json_path)
+        if plugin_widget is None:
+            plugin: Optional[model.Plugin] = self.workspace.plugin(json_path)
+            if plugin is None:
+                raise TypeError(f'Decoding JSON file {json_path.__str__()} did not create a '
+                                'plugin-manager.model.Plugin')
+            plugin_widget = plugin_widgets.PluginWidget(self, plugin=plugin)
+            plugin_widget.edited = json_path in self.workspace.modified_plugins
+            self.plugin_widgets.put(json_path, plugin_widget)
+        self.show_plugin_widget(plugin_widget)
+        self.json_path = json_path
+        self.plugin = plugin_widget.plugin
+        self.file_menu.entryconfigure(Application.MLABEL_SAVE, state=ttkb.NORMAL)
+        self.file_menu.entryconfigure(Application.MLABEL_SAVE_AS, state=ttkb.NORMAL)
+        self.set_json_file_label(str(json_path))
+
+    def evict_plugin_widget(self, json_path: pathlib.Path, plugin_widget: plugin_widgets.PluginWidget) -> None:
+        """
+        The eviction callback of the PluginWidget cache.  Unsaved edits are applied to the widget's Plugin, which the
+        Workspace keeps until it is saved, and the widget is destroyed unless it is shown.
+
+        :param json_path: the path of the widget's Plugin JSON file
+        :type json_path: pathlib.Path
+        :param plugin_widget: the evicted PluginWidget
+        :type plugin_widget: plugin_manager.gui.tk_widgets.PluginWidget
+        :return: None
+
+        """
+        if self.workspace is not None and plugin_widget.modified:
+            self.workspace.keep_modified(json_path, plugin_widget.rebuild_plugin())
+        if plugin_widget is not self.plugin_widget:
+            plugin_widget.destroy()
+
     def create_plugin(self) -> None:
         """
         Set up the GUI to create a new Plugin JSON file.  Disables the Save menu selection and enables the Save As
@@ -101,8 +213,8 @@ class Application(ttkb.Window):
         :return: None
 
         """
-        self.plugin_widget = plugin_widgets.PluginWidget(self, plugin=None)
-        self.plugin_widget.grid(column=0, row=self.plugin_widget_row, columnspan=self.plugin_widget_columnspan)
+        self.plugin = None
+        self.show_plugin_widget(plugin_widgets.PluginWidget(self, plugin=None))
         self.file_menu.entryconfigure(Application.MLABEL_SAVE, state=ttkb.DISABLED)
         self.file_menu.entryconfigure(Application.MLABEL_SAVE_AS, state=ttkb.NORMAL)
         self.set_json_file_label('')
@@ -157,7 +269,7 @@ class Application(ttkb.Window):
         """
         with self.json_path.open(mode='r') as json_file:
             json_str = json_file.read()
-            plugin = json.loads(eval(json_str), object_hook=jh.plugin_object_hook)
+            plugin = jh.decode_plugin_json(json_str)
             if not isinstance(plugin, model.Plugin):
                 raise TypeError(f'Decoding JSON file {json_path.__str__()} created a {plugin.__class__.name}, not a'
                                 'plugin-manager.model.Plugin')
@@ -166,7 +278,11 @@ class Application(ttkb.Window):
 
     def write_json(self, json_path: pathlib.Path):
         """
-        Encode the state of the current Plugin to JSON and write it to the specified file
+        Encode the state of the current Plugin to JSON and write it to the specified file.  The file is replaced
+        atomically, so an interrupted save does not leave a truncated file.  The PluginWidget is kept, and only
+        applies the edits made since the last save to the Plugin, so editing can continue after saving.  When the
+        Plugin is saved to another file, the workspace forgets it for the file it was read from, and a PluginWidget
+        saved into the workspace folder is kept under its new path.
 
         :param json_path: a Path object for the file to be written
         :type json_path: pathlib.Path
@@ -175,11 +291,27 @@ class Application(ttkb.Window):
         """
         plugin: model.Plugin = self.plugin_widget.rebuild_plugin()
         json_str = json.dumps(plugin, cls=jh.PluginJSONEncoder)
-        with json_path.open(mode='w') as json_file:
-            json_file.write(json_str)
+        jh.write_plugin_files({json_path: json_str})
+        jh.record_file(plugin, json_path, jh.content_hash(json_str))
+        previous_path: Optional[pathlib.Path] = self.json_path
         self.json_path = json_path
-        self.plugin_widget = plugin_widgets.PluginWidget(self, plugin=None)
-        self.plugin_widget.grid(column=0, row=self.plugin_widget_row, columnspan=self.plugin_widget_columnspan)
+        self.plugin = plugin
+        self.plugin_widget.edited = False
+        self.file_menu.entryconfigure(Application.MLABEL_SAVE, state=ttkb.NORMAL)
+        if self.workspace is None:
+            return
+        if previous_path is not None and previous_path != json_path:
+            self.workspace.forget(previous_path, plugin)
+            if previous_path in self.plugin_widgets and \
+                    self.plugin_widgets.entries[previous_path] is self.plugin_widget:
+                self.plugin_widgets.pop(previous_path)
+        if json_path.parent == self.workspace.plugin_path:
+            replaced: Optional[plugin_widgets.PluginWidget] = self.plugin_widgets.pop(json_path)
+            if replaced is not None and replaced is not self.plugin_widget:
+                replaced.destroy()
+            self.plugin_widgets.put(json_path, self.plugin_widget)
+            header: jh.PluginHeader = self.workspace.saved(json_path, plugin)
+            self.workspace_list.update_header(header, idx=self.workspace.headers().index(header))
 
 
 if __name__ == '__main__':
@@ -1,72 +1,156 @@
-import importlib
+import bisect
+from dataclasses import dataclass, field
 import pathlib
 import tkinter as tk
 import tkinter.filedialog as filedialog
-import types
-from typing import Any, Callable, Optional, Union
+from typing import Any, Callable, Hashable, Optional, Union
 
 import ttkbootstrap as ttkb
 
 import widgets.ttkb_widgets as widgets
 
+import plugin_manager.gui.command_journal as command_journal
+import plugin_manager.gui.search_index as search_index
+import plugin_manager.gui.tk_executor as tk_executor
+import plugin_manager.model.entry_points as entry_points
+import plugin_manager.model.json_handler as jh
 import plugin_manager.model.plugin as model
 
 
 class EntryPointWidget(ttkb.Frame):
     """
     A ttkbootstrap.Combobox based widget that presents a list of module level functions that may be selected
-    entrypoints for PluginMenuItems
+    entrypoints for PluginMenuItems.  The functions are discovered by parsing the module's source, so the module is
+    not imported.  If an executor is provided and the module's functions are not already cached, the module is
+    searched for and parsed on the executor's thread pool.  The combobox shows a placeholder until the functions
+    arrive, so the Tk event loop is never blocked.
 
     """
-    def __init__(self, parent, module: types.ModuleType, entry_point: Optional[types.FunctionType], column: int, row: int):
+    LOADING_TEXT = 'Loading entry points ...'
+
+    def __init__(self, parent, module_name: str, entry_point_name: Optional[str], column: int, row: int,
+                 discovery: Optional[entry_points.EntryPointDiscovery] = None,
+                 executor: Optional[tk_executor.TkCallExecutor] = None):
         """
         Creates an instance of plugin_manager.gui.tk_widgets.EntryPointWidget
 
         :param parent: The GUI parent for this widget
-        :param module: The Python module from which the functions will be drawn
-        :type module: types.ModuleType
-        :param entry_point: The current value for the widget
-        :type entry_point: types.FunctionType
+        :param module_name: The name of the Python module from which the functions will be drawn
+        :type module_name: str
+        :param entry_point_name: The current value for the widget
+        :type entry_point_name: Optional[str]
         :param column: the column for the widget's label to be gridded
         :type column: int
         :param row: the row for the widget's label to be gridded
         :type row: int
+        :param discovery: the EntryPointDiscovery used to list the module's functions, by default the shared instance
+        :type discovery: Optional[plugin_manager.model.entry_points.EntryPointDiscovery]
+        :param executor: the executor used to list the module's functions in the background, or None to list them
+            on the Tk thread
+        :type executor: Optional[plugin_manager.gui.tk_executor.TkCallExecutor]
 
         """
         ttkb.Frame.__init__(self, master=parent)
-        self.module = module
+        self.module_name: str = module_name
+        self.discovery: entry_points.EntryPointDiscovery = discovery if discovery is not None else \
+            entry_points.default_discovery
+        self.executor: Optional[tk_executor.TkCallExecutor] = executor
         ttkb.Label(master=self, text='Entry Point', width=10).grid(column=column, row=row, padx=5, pady=5,
                                                                    sticky=tk.NW)
         self.entry_point_name_var: ttkb.StringVar = ttkb.StringVar()
-        entry_point_list: list[str] = []
-        if self.module is not None:
-            for name, obj in self.module.__dict__.items():
-                if isinstance(obj, types.FunctionType):
-                    entry_point_list.append(name)
-        self.combo = ttkb.Combobox(master=self, textvariable=self.entry_point_name_var, values=entry_point_list,
+        self.entry_point_list: list[str] = []
+        self.loading: bool = False
+        self.pending_name: Optional[str] = None
+        self.combo = ttkb.Combobox(master=self, textvariable=self.entry_point_name_var, values=self.entry_point_list,
                                    width=30)
         self.combo.grid(column=column+1, row=row, padx=5, pady=5, sticky=tk.NW)
-        if entry_point is not None:
-            if isinstance(entry_point, types.FunctionType):
-                self.entry_point_name_var.set(entry_point.__name__)
+        self.load_entry_points(module_name, entry_point_name)
+
+    def load_entry_points(self, module_name: str, entry_point_name: Optional[str]) -> None:
+        """
+        List the functions of a module in the combobox, and select the provided entry point name once they are
+        listed.  Cached functions are listed at once.  Otherwise, if the widget has an executor, a placeholder is
+        shown while the module is searched for and parsed in the background.
+
+        :param module_name: The name of the Python module from which the functions will be drawn
+        :type module_name: str
+        :param entry_point_name: The entry point name to be selected
+        :type entry_point_name: Optional[str]
+        :return: None
+
+        """
+        self.module_name = module_name
+        self.pending_name = entry_point_name
+        if len(module_name) == 0:
+            self.set_entry_point_list([])
+            return
+        names: Optional[list[str]] = self.discovery.cached_entry_points(module_name)
+        if names is not None:
+            self.set_entry_point_list(names)
+        elif self.executor is None:
+            self.set_entry_point_list(self.discovery.entry_points(module_name) or [])
+        else:
+            self.loading = True
+            self.combo.configure(values=[], state=tk.DISABLED)
+            self.entry_point_name_var.set(EntryPointWidget.LOADING_TEXT)
+            self.executor.submit(('entry_points', id(self), module_name), self.discovery.entry_points, module_name,
+                                 on_result=lambda names, loaded=module_name: self.entry_points_loaded(loaded, names),
+                                 on_error=lambda exc, loaded=module_name: self.entry_points_loaded(loaded, None))
+
+    def entry_points_loaded(self, module_name: str, names: Optional[list[str]]) -> None:
+        """
+        Invoked on the Tk thread when a module's functions have been listed in the background.  The result is ignored
+        if the widget has since been destroyed or switched to another module.
+
+        :param module_name: the name of the module whose functions were listed
+        :type module_name: str
+        :param names: the function names, or None if the module could not be found or parsed
+        :type names: Optional[list[str]]
+        :return: None
+
+        """
+        if module_name != self.module_name or not self.winfo_exists():
+            return
+        self.set_entry_point_list(names or [])
+
+    def set_entry_point_list(self, names: list[str]) -> None:
+        """
+        List the provided function names in the combobox, enabling it if it was disabled while a module was being
+        listed, and select the pending entry point name.  A pending name
+        that was not found in the module's source, such as one bound in a way the source can not show, is listed
+        after the found names rather than cleared, so saving the menu item does not lose it.
+
+        :param names: the function names
+        :type names: list[str]
+        :return: None
+
+        """
+        self.loading = False
+        entry_point_name: Optional[str] = self.pending_name
+        self.pending_name = None
+        if entry_point_name is not None and len(entry_point_name) > 0 and entry_point_name not in names:
+            names = names + [entry_point_name]
+        self.entry_point_list = names
+        self.combo.configure(values=names, state=tk.NORMAL)
+        self.entry_point_name_var.set(entry_point_name if entry_point_name is not None else '')
 
     def set_entry_point_name(self, name: str) -> None:
         """
-        Set the value of the entry point name
+        Set the value of the entry point name.  While the module's functions are being listed, the name is selected
+        once they arrive.
 
         :param name: the name's value
         :type name: str
         :return: None
 
         """
-        if len(name) > 0:
-            if name in self.module.__dict__:
-                if isinstance(self.module.__dict__[name], types.FunctionType):
-                    self.entry_point_name_var.set(name)
-                else:
-                    raise ValueError(f'{name} is not a Function')
+        if self.loading:
+            self.pending_name = name
+        elif len(name) > 0:
+            if name in self.entry_point_list:
+                self.entry_point_name_var.set(name)
             else:
-                raise ValueError(f'{name} is not in module {self.module.__name__}')
+                raise ValueError(f'{name} is not a function in module {self.module_name}')
         else:
             self.entry_point_name_var.set(name)
 
@@ -78,29 +162,29 @@ class EntryPointWidget(ttkb.Frame):
         :rtype: str
 
         """
+        if self.loading:
+            return self.pending_name if self.pending_name is not None else ''
         return self.entry_point_name_var.get()
 
-    def get_entry_point(self) -> Optional[types.FunctionType]:
+    def get_entry_point_names(self) -> list[str]:
         """
-        Retrieve the entry point function object or None if no entry point has been selected
+        Retrieve the names of the functions that may be selected as the entry point
 
-        :return: the entry point function object
-        :rtype: Optional[types.FunctionType]
+        :return: the function names
+        :rtype: list[str]
 
         """
-        if self.get_entry_point_name() in self.module:
-            return self.module[self.get_entry_point_name()]
-        return None
+        return self.entry_point_list
 
-    def get_module(self) -> types.ModuleType:
+    def get_module_name(self) -> str:
         """
-        Retrieve the module object
+        Retrieve the module name
 
-        :return: the module object
-        :rtype: types.ModuleType
+        :return: the module name
+        :rtype: str
 
         """
-        return self.module
+        return self.module_name
 
 
 class PluginMenuItemWidget(ttkb.Frame):
@@ -108,15 +192,15 @@ class PluginMenuItemWidget(ttkb.Frame):
     A ttkbootstrap based widget that presents and collects the information to create a plugin_manager.model.PluginMenuItem object
 
     """
-    def __init__(self, parent, module: types.ModuleType, cancel_action: Callable, save_action: Callable,
+    def __init__(self, parent, module_name: str, cancel_action: Callable, save_action: Callable,
                  menu_item: Optional[model.PluginMenuItem] = None, menu_iid: Optional[str] = None,
-                 item_iid: Optional[str] = None):
+                 item_iid: Optional[str] = None, executor: Optional[tk_executor.TkCallExecutor] = None):
         """
         Creates an instance of plugin_manager.gui.tk_widgets.PluginMenuItemWidget
 
         :param parent: the GUI parent for this widget
-        :param module: the module associated with the parent plugin_manager.model.PluginMenu
-        :type module: types.ModuleType
+        :param module_name: the name of the module associated with the parent plugin_manager.model.PluginMenu
+        :type module_name: str
         :param cancel_action: a callback routine to be invoked if the Cancel button is clicked
         :type cancel_action: Callable
         :param save_action: a callback routine to be invoked if the Save button is clicked
@@ -127,12 +211,15 @@ class PluginMenuItemWidget(ttkb.Frame):
         :type menu_iid: str
         :param item_iid: the iid of the existing PluginMenuItem in the PluginMenuTreeWidget
         :type item_iid: str
+        :param executor: the executor used to list the module's functions in the background, or None to list them
+            on the Tk thread
+        :type executor: Optional[plugin_manager.gui.tk_executor.TkCallExecutor]
 
         """
         ttkb.Frame.__init__(self, master=parent)
         self.menu_iid: Optional[str] = menu_iid
         self.item_iid: Optional[str] = item_iid
-        self.module = module
+        self.module_name: str = module_name
         self.menu_item: model.PluginMenuItem = menu_item
         row: int = 0
         self.title_widget = widgets.LabeledTextWidget(parent=self, label_text='Title', label_width=10,
@@ -142,12 +229,8 @@ class PluginMenuItemWidget(ttkb.Frame):
                                                       'columnspan': 3})
 
         row += 1
-        if self.menu_item is not None:
-            self.entry_point = None
-            if self.module is not None and self.menu_item.entry_point_name in self.module.__dict__:
-                self.entry_point = self.module.__dict__[self.menu_item.entry_point_name]
-        self.entry_point_widget = EntryPointWidget(parent=self, module=module, entry_point=self.entry_point, column=0,
-                                                   row=row)
+        self.entry_point_widget = EntryPointWidget(parent=self, module_name='', entry_point_name=None, column=0,
+                                                   row=row, executor=executor)
         self.entry_point_widget.grid(column=1, row=row, columnspan=3)
 
         row += 1
@@ -170,15 +253,35 @@ class PluginMenuItemWidget(ttkb.Frame):
         row += 1
         ttkb.Button(self, text='Cancel', command=cancel_action).grid(column=1, row=row, padx=5, pady=5, sticky=tk.NW)
         ttkb.Button(self, text='Save', command=save_action).grid(column=3, row=row, padx=5, pady=5, sticky=tk.NE)
+        self.populate(module_name=module_name, menu_item=menu_item, menu_iid=menu_iid, item_iid=item_iid)
 
-        if self.menu_item is not None:
-            self.title_widget.set_value(menu_item.title)
-            if self.menu_item.select_person:
-                self.sel_person_var.set(1)
-            if self.menu_item.select_date_range:
-                self.sel_dates_var.set(1)
-            if self.menu_item.select_dp_type:
-                self.sel_dp_type_var.set(1)
+    def populate(self, module_name: str, menu_item: Optional[model.PluginMenuItem], menu_iid: Optional[str],
+                 item_iid: Optional[str]) -> None:
+        """
+        Set the widget's prompt values from the provided PluginMenuItem, so the widget can be reused for another
+        menu item rather than being recreated
+
+        :param module_name: the name of the module associated with the parent plugin_manager.model.PluginMenu
+        :type module_name: str
+        :param menu_item: an existing PluginMenuItem object, or None to clear the prompts
+        :type menu_item: Optional[plugin_manager.model.PluginMenuItem]
+        :param menu_iid: the iid of the parent PluginMenu in the PluginMenuTreeWidget
+        :type menu_iid: Optional[str]
+        :param item_iid: the iid of the existing PluginMenuItem in the PluginMenuTreeWidget
+        :type item_iid: Optional[str]
+        :return: None
+
+        """
+        self.menu_iid = menu_iid
+        self.item_iid = item_iid
+        self.module_name = module_name
+        self.menu_item = menu_item
+        self.title_widget.set_value(menu_item.title if menu_item is not None else '')
+        self.entry_point_widget.load_entry_points(module_name,
+                                                  menu_item.entry_point_name if menu_item is not None else None)
+        self.sel_person_var.set(1 if menu_item is not None and menu_item.select_person else 0)
+        self.sel_dates_var.set(1 if menu_item is not None and menu_item.select_date_range else 0)
+        self.sel_dp_type_var.set(1 if menu_item is not None and menu_item.select_dp_type else 0)
 
     def get_menu_item(self) -> model.PluginMenuItem:
         """
@@ -200,7 +303,7 @@ class PluginMenuItemWidget(ttkb.Frame):
         else:
             self.menu_item.title = title
             self.menu_item.entry_point_name = entry_point_name
-            self.menu_item.sel_person = sel_person
+            self.menu_item.select_person = sel_person
             self.menu_item.select_date_range = sel_date_range
             self.menu_item.select_dp_type = sel_dp_type
         return self.menu_item
@@ -286,21 +389,16 @@ class ModuleWidget(widgets.LabeledTextWidget):
         """
         self.set_value(module_name)
 
-    def get_module(self) -> types.ModuleType:
+    def get_entry_point_names(self) -> Optional[list[str]]:
         """
-        Retrieves the module object selected by the user
+        Lists the functions defined at the top level of the module selected by the user.  The module's source is
+        parsed rather than imported, so no plugin code is run.
 
-        :return: a Python module object
-        :rtype: types.ModuleType
+        :return: the function names, or None if the module can not be found or parsed
+        :rtype: Optional[list[str]]
 
         """
-        try:
-            module = importlib.import_module(self.get_module_name())
-        except ModuleNotFoundError:
-            module = None
-        except ImportError:
-            module = None
-        return module
+        return entry_points.default_discovery.entry_points(self.get_module_name())
 
 
 class PluginMenuWidget(ttkb.Frame):
@@ -332,15 +430,29 @@ class PluginMenuWidget(ttkb.Frame):
                                                       entry_grid_args={'column': 1, 'row': row, 'padx': 5, 'pady': 5,
                                                                        'columnspan': 2})
         row += 1
-        module_name: str = ''
-        if menu is not None:
-            self.title_widget.set_value(menu.title)
-            module_name = menu.module_name
-        self.module_widget = ModuleWidget(parent=self, module_name=module_name, column=0, row=row)
+        self.module_widget = ModuleWidget(parent=self, module_name='', column=0, row=row)
 
         row += 1
         ttkb.Button(self, text='Cancel', command=cancel_action).grid(column=0, row=row, padx=5, pady=5, sticky=tk.NW)
         ttkb.Button(self, text='Save', command=save_action).grid(column=2, row=row, padx=5, pady=5, sticky=tk.NW)
+        self.populate(menu=menu, menu_iid=menu_iid)
+
+    def populate(self, menu: Optional[model.PluginMenu], menu_iid: Optional[str]) -> None:
+        """
+        Set the widget's prompt values from the provided PluginMenu, so the widget can be reused for another menu
+        rather than being recreated
+
+        :param menu: a PluginMenu object, or None to clear the prompts
+        :type menu: Optional[plugin_manager.model.PluginMenu]
+        :param menu_iid: the iid of the PluginMenu object, taken from the PluginMenuTreeWidget
+        :type menu_iid: Optional[str]
+        :return: None
+
+        """
+        self.menu_iid = menu_iid
+        self.menu = menu
+        self.title_widget.set_value(menu.title if menu is not None else '')
+        self.module_widget.set_module_name(menu.module_name if menu is not None else '')
 
     def get_menu(self) -> model.PluginMenu:
         """
@@ -361,23 +473,68 @@ class PluginMenuWidget(ttkb.Frame):
         return self.menu
 
 
+@dataclass
+class DetachedNode:
+    """
+    A PluginMenuTree node that was detached from the tree, along with what is needed to reattach it where it was
+
+    :param iid: the iid of the node
+    :type iid: str
+    :param parent_iid: the iid of the node's parent, '' for a menu node
+    :type parent_iid: str
+    :param index: the node's index among its siblings
+    :type index: int
+    :param nodes: the objects of the node and its descendants, keyed by iid
+    :type nodes: dict[str, Union[plugin_manager.model.PluginMenu, plugin_manager.model.PluginMenuItem]]
+    :param pending: the menu's PluginMenuItem objects whose nodes were not inserted yet, or None
+    :type pending: Optional[list[plugin_manager.model.PluginMenuItem]]
+
+    """
+    iid: str
+    parent_iid: str
+    index: int
+    nodes: dict[str, Union[model.PluginMenu, model.PluginMenuItem]] = field(default_factory=dict)
+    pending: Optional[list[model.PluginMenuItem]] = None
+
+
 class PluginMenuTree(ttkb.Treeview):
     """
     A widget based on the ttkbootstrap.Treeview widget.  The tree items are PluginMenu object and their PluginMenuItem
     children.  The tree structure is the repository for the PluginMenu and PluginMenuItems maintained by the Plugin
     Management app.  This is an easy way to keep track of insertions and deletions.  The Plugin object written to JSON
-    is created from the nodes in this tree.  Each PluginMenu node contains two fields; one containing the output of
-    the Plugin Menu object's __str__ method, and the other containing the object itself.  The PluginMenu objects are
-    stored with an empty PluginMenuItem list.  A PluginMenu object children will be stored in PluginMenuItem nodes
-    that descend for it's node. Each PluginMenuItem node also contains two fields;  one for the output of it's
-    __str__ method and the other for the object itself.
+    is created from the nodes in this tree.  The PluginMenu or PluginMenuItem object of each node is kept in the
+    nodes dict, keyed by the node's iid, and the node's displayed fields contain the output of the object's __str__
+    method.  A PluginMenu object's items are rebuilt from the PluginMenuItem nodes that descend from its node.
+
+    The tree is populated on demand, so a Plugin with thousands of menu items opens in roughly constant time.  Every
+    PluginMenu node is inserted up front, but the PluginMenuItem nodes of a menu are only inserted when the menu node
+    is opened, or when the view is scrolled close to the end of the populated nodes, in batches of about
+    POPULATE_BATCH nodes.  Until then, the menu's items are kept in the pending dict.
+
+    Edits are tracked so rebuild_plugin does work in proportion to the edits made since the last rebuild, rather than
+    to the size of the tree.  PluginMenu and PluginMenuItem objects are edited in place, so only changes to a menu's
+    list of items, recorded in dirty_menus, and to the list of menus, recorded by menus_dirty, need to be rebuilt.
+
+    The tree can be filtered by the title, module or entry point name, or selection flags of its nodes.  The first
+    filter builds a SearchIndex, which is then kept up to date as nodes are saved.  Pending items are indexed by their
+    menu's iid and their index in the pending list, and only the menus of matching pending items are populated.
+    Nodes that do not match are detached rather than deleted.  A filter starts by detaching the menu nodes, and the
+    item nodes of a menu are only detached when the menu is first shown.  After that, each filter only detaches and
+    reattaches the nodes whose visibility changed, so its cost is in proportion to the number of matches rather than
+    the size of the tree.  Inserting or deleting a node clears the filter.
+
+    A node can also be detached, with detach_node, rather than deleted, so an undone insertion or a deletion can be
+    reverted by reattaching it, without rebuilding anything else.  The objects of a detached node and its descendants
+    are taken out of the nodes dict until it is reattached, so the tree's other operations only see attached nodes.
 
     """
     MENU_STR = 'menu_str'
     ITEM_STR = 'item_str'
-    REPR = 'repr'
     MENU_TAG = 'menu'
     ITEM_TAG = 'item'
+    POPULATE_BATCH = 500
+    # the fraction of the populated nodes left below the view when the next batch is populated
+    POPULATE_LOOKAHEAD = 0.2
 
     def __init__(self, parent, select_menu_action: Callable, select_item_action: Callable,
                  menus: list[model.PluginMenu] = []):
@@ -393,13 +550,26 @@ class PluginMenuTree(ttkb.Treeview):
         :type menus: list[PluginMenu]
 
         """
-        ttkb.Treeview.__init__(self, master=parent, columns=(PluginMenuTree.MENU_STR, PluginMenuTree.ITEM_STR,
-                                                             PluginMenuTree.REPR), show='headings')
+        ttkb.Treeview.__init__(self, master=parent, columns=(PluginMenuTree.MENU_STR, PluginMenuTree.ITEM_STR),
+                               show='headings')
+        self.nodes: dict[str, Union[model.PluginMenu, model.PluginMenuItem]] = {}
+        self.pending: dict[str, list[model.PluginMenuItem]] = {}
+        self.populate_id: Optional[str] = None
+        self.dirty_menus: set[str] = set()
+        self.menus_dirty: bool = True
+        self.built_menus: Optional[list[model.PluginMenu]] = None
+        self.search_index: Optional[search_index.SearchIndex] = None
+        # while a filter is applied, the visible nodes, the parent and original sibling index of every menu node and
+        # of the item nodes of the menus shown so far, and the original sibling indexes of each parent's visible nodes
+        self.visible: Optional[set[str]] = None
+        self.node_parents: dict[str, str] = {}
+        self.node_ranks: dict[str, int] = {}
+        self.visible_ranks: dict[str, list[int]] = {}
         hscroll = ttkb.Scrollbar(master=self, orient=tk.HORIZONTAL, command=self.xview)
-        vscroll = ttkb.Scrollbar(master=self, orient=tk.VERTICAL, command=self.yview)
+        self.vscroll = ttkb.Scrollbar(master=self, orient=tk.VERTICAL, command=self.yview)
         self.configure(displaycolumns=[PluginMenuTree.MENU_STR, PluginMenuTree.ITEM_STR], height=50,
-                       yscrollcommand=vscroll.set, xscrollcommand=hscroll.set)
-        vscroll.grid(column=1, row=0, sticky=tk.NS)
+                       yscrollcommand=self.scroll_y, xscrollcommand=hscroll.set)
+        self.vscroll.grid(column=1, row=0, sticky=tk.NS)
         hscroll.grid(column=0, row=1, sticky=tk.EW)
         self.columnconfigure(0, weight=1)
         self.rowconfigure(0, weight=1)
@@ -411,16 +581,283 @@ class PluginMenuTree(ttkb.Treeview):
         if len(menus) > 0:
             for menu in menus:
                 menu_iid: str = self.insert(parent='', index='end', text='Menu:', open=True,
-                                            tags=[PluginMenuTree.MENU_TAG, ])
-                self.save_menu_attr(menu_iid=menu_iid, menu=menu)
-                for item in menu.items:
-                    item_iid = self.insert(parent=menu_iid, index='end', text='Menu Item:',
-                                           tags=[PluginMenuTree.ITEM_TAG, ])
-                    self.save_item_attr(item_iid, item)
+                                            tags=[PluginMenuTree.MENU_TAG, ], values=self.menu_values(menu))
+                self.register(menu_iid, menu)
+                if len(menu.items) > 0:
+                    self.pending[menu_iid] = list(menu.items)
+            self.populate_batch()
         else:
             self.insert_menu(idx=-1)
         self.tag_bind(PluginMenuTree.MENU_TAG, '<<TreeviewSelect>>', self.select_menu_action)
         self.tag_bind(PluginMenuTree.ITEM_TAG, '<<TreeviewSelect>>', self.select_item_action)
+        self.bind('<<TreeviewOpen>>', self.open_menu)
+
+    @staticmethod
+    def node_text(node: Union[model.PluginMenu, model.PluginMenuItem]) -> str:
+        """
+        Returns the text a node is found by when the tree is filtered
+
+        :param node: the node's PluginMenu or PluginMenuItem object
+        :type node: Union[plugin_manager.model.PluginMenu, plugin_manager.model.PluginMenuItem]
+        :return: the title and module name of a menu, or the title, entry point name and selection flags of an item
+        :rtype: str
+
+        """
+        if isinstance(node, model.PluginMenu):
+            return f'{node.title} {node.module_name}'
+        flags: list[str] = [flag for flag, selected in (('select_person', node.select_person),
+                                                        ('select_date_range', node.select_date_range),
+                                                        ('select_dp_type', node.select_dp_type)) if selected]
+        return ' '.join([node.title, node.entry_point_name] + flags)
+
+    def register(self, iid: str, node: Union[model.PluginMenu, model.PluginMenuItem]) -> None:
+        """
+        Store a node's object, and index it if the tree has been filtered
+
+        :param iid: the node's iid
+        :type iid: str
+        :param node: the node's PluginMenu or PluginMenuItem object
+        :type node: Union[plugin_manager.model.PluginMenu, plugin_manager.model.PluginMenuItem]
+        :return: None
+
+        """
+        self.nodes[iid] = node
+        if self.search_index is not None:
+            self.search_index.add(iid, self.node_text(node))
+
+    def filter(self, query: str) -> int:
+        """
+        Show only the nodes matching a query, along with the menu nodes of the matching item nodes.  An empty query
+        clears the filter.
+
+        :param query: whitespace separated terms, each of which a node's title, module or entry point name, or
+            selection flags must contain
+        :type query: str
+        :return: the number of matching nodes
+        :rtype: int
+
+        """
+        if len(query.strip()) == 0:
+            self.clear_filter()
+            return len(self.nodes)
+        if self.search_index is None:
+            self.build_search_index()
+        if self.visible is None:
+            self.start_filter()
+        matches: set[Hashable] = self.search_index.search(query)
+        pending_menus: set[str] = {key[0] for key in matches if isinstance(key, tuple)}
+        if len(pending_menus) > 0:
+            for menu_iid in pending_menus:
+                self.populate_menu(menu_iid)
+            matches = self.search_index.search(query)
+        visible: set[str] = set(matches)
+        for iid in matches:
+            # an item node keeps its parent while its menu node is detached, until the menu is trimmed
+            parent_iid: str = self.node_parents[iid] if iid in self.node_parents else self.parent(iid)
+            menu_iid: str = iid if parent_iid == '' else parent_iid
+            visible.add(menu_iid)
+            if menu_iid not in self.visible_ranks:
+                self.trim_menu(menu_iid)
+        self.show_nodes(visible)
+        return len(matches)
+
+    def build_search_index(self) -> None:
+        """
+        Index the text of every node, and of every pending item, without inserting the pending items' nodes
+
+        :return: None
+
+        """
+        self.search_index = search_index.SearchIndex()
+        for iid, node in self.nodes.items():
+            self.search_index.add(iid, self.node_text(node))
+        for menu_iid in self.pending:
+            self.index_pending(menu_iid)
+
+    def index_pending(self, menu_iid: str) -> None:
+        """
+        Index the pending items of a menu, keyed by the menu's iid and the item's index in the pending list, if the
+        tree has been filtered
+
+        :param menu_iid: the iid of the PluginMenu node
+        :type menu_iid: str
+        :return: None
+
+        """
+        if self.search_index is not None:
+            for item_idx, item in enumerate(self.pending.get(menu_iid, [])):
+                self.search_index.add((menu_iid, item_idx), self.node_text(item))
+
+    def unindex_pending(self, menu_iid: str) -> None:
+        """
+        Remove the pending items of a menu from the index, if the tree has been filtered
+
+        :param menu_iid: the iid of the PluginMenu node
+        :type menu_iid: str
+        :return: None
+
+        """
+        if self.search_index is not None:
+            for item_idx in range(0, len(self.pending.get(menu_iid, []))):
+                self.search_index.remove((menu_iid, item_idx))
+
+    def start_filter(self) -> None:
+        """
+        Record the sibling index of every menu node, so detached nodes can be reattached where they were, and detach
+        the menu nodes with one detach call
+
+        :return: None
+
+        """
+        menu_iids: tuple[str] = self.get_children('')
+        self.node_parents = dict.fromkeys(menu_iids, '')
+        self.node_ranks = {menu_iid: menu_idx for menu_idx, menu_iid in enumerate(menu_iids)}
+        self.visible_ranks = {'': []}
+        if len(menu_iids) > 0:
+            self.detach(*menu_iids)
+        self.visible = set()
+
+    def trim_menu(self, menu_iid: str) -> None:
+        """
+        Record the parent and sibling index of the item nodes of a menu about to be shown, and detach them with one
+        detach call, so only its matching item nodes are shown with it
+
+        :param menu_iid: the iid of the PluginMenu node
+        :type menu_iid: str
+        :return: None
+
+        """
+        item_iids: tuple[str] = self.get_children(menu_iid)
+        self.visible_ranks[menu_iid] = []
+        for item_idx, item_iid in enumerate(item_iids):
+            self.node_parents[item_iid] = menu_iid
+            self.node_ranks[item_iid] = item_idx
+        if len(item_iids) > 0:
+            self.detach(*item_iids)
+
+    def show_nodes(self, visible: set[str]) -> None:
+        """
+        Detach the visible nodes that are not in the provided set, with one detach call, and reattach the detached
+        nodes that are, at their original positions among their visible siblings.  Only the nodes shown by the last
+        filter, and the provided nodes, are looked at.
+
+        :param visible: the iids of the nodes to be shown
+        :type visible: set[str]
+        :return: None
+
+        """
+        hidden: list[str] = [iid for iid in self.visible if iid not in visible]
+        shown: list[str] = [iid for iid in visible if iid not in self.visible]
+        for iid in hidden:
+            ranks: list[int] = self.visible_ranks[self.node_parents[iid]]
+            del ranks[bisect.bisect_left(ranks, self.node_ranks[iid])]
+        if len(hidden) > 0:
+            self.detach(*hidden)
+        # menu nodes are reattached before item nodes, so each item's menu is in place when the item is moved
+        shown.sort(key=lambda iid: self.node_parents[iid] != '')
+        for iid in shown:
+            parent_iid: str = self.node_parents[iid]
+            ranks = self.visible_ranks[parent_iid]
+            idx: int = bisect.bisect_left(ranks, self.node_ranks[iid])
+            ranks.insert(idx, self.node_ranks[iid])
+            self.move(iid, parent_iid, idx)
+        self.visible = visible
+
+    def clear_filter(self) -> None:
+        """
+        Reattach every node detached by the filter and stop filtering
+
+        :return: None
+
+        """
+        if self.visible is None:
+            return
+        self.show_nodes(set(self.node_parents))
+        self.visible = None
+        self.node_parents = {}
+        self.node_ranks = {}
+        self.visible_ranks = {}
+
+    @staticmethod
+    def menu_values(menu: model.PluginMenu) -> tuple[str, str]:
+        return menu.__str__(), ''
+
+    @staticmethod
+    def item_values(item: model.PluginMenuItem) -> tuple[str, str]:
+        return '', item.__str__()
+
+    def populate_menu(self, menu_iid: str) -> int:
+        """
+        Insert the PluginMenuItem nodes of a menu whose items have not been inserted yet.  If the menu was already
+        shown by the current filter, the nodes are detached until a filter matches them.
+
+        :param menu_iid: the iid of the PluginMenu node
+        :type menu_iid: str
+        :return: the number of nodes inserted
+        :rtype: int
+
+        """
+        self.unindex_pending(menu_iid)
+        items: Optional[list[model.PluginMenuItem]] = self.pending.pop(menu_iid, None)
+        if items is None:
+            return 0
+        for item in items:
+            item_iid: str = self.insert(parent=menu_iid, index='end', text='Menu Item:',
+                                        tags=[PluginMenuTree.ITEM_TAG, ], values=self.item_values(item))
+            self.register(item_iid, item)
+        if menu_iid in self.visible_ranks:
+            self.trim_menu(menu_iid)
+        return len(items)
+
+    def populate_batch(self) -> None:
+        """
+        Insert the PluginMenuItem nodes of the pending menus, in tree order, until about POPULATE_BATCH nodes have
+        been inserted
+
+        :return: None
+
+        """
+        self.populate_id = None
+        inserted: int = 0
+        while len(self.pending) > 0 and inserted < PluginMenuTree.POPULATE_BATCH:
+            inserted += self.populate_menu(next(iter(self.pending)))
+
+    def populate_all(self) -> None:
+        """
+        Insert the PluginMenuItem nodes of every pending menu
+
+        :return: None
+
+        """
+        while len(self.pending) > 0:
+            self.populate_menu(next(iter(self.pending)))
+
+    def open_menu(self, event) -> None:
+        """
+        A callback invoked when a node is opened, which inserts the node's PluginMenuItem nodes if they are pending
+
+        :param event:
+        :return: None
+
+        """
+        self.populate_menu(self.focus())
+
+    def scroll_y(self, first: str, last: str) -> None:
+        """
+        The tree's yscrollcommand.  Updates the scroll bar, and schedules the next batch of pending nodes to be
+        inserted when the view nears the end of the populated nodes.
+
+        :param first: the fraction of the nodes above the view
+        :type first: str
+        :param last: the fraction of the nodes above the bottom of the view
+        :type last: str
+        :return: None
+
+        """
+        self.vscroll.set(first, last)
+        if len(self.pending) > 0 and self.populate_id is None and \
+                float(last) >= 1.0 - PluginMenuTree.POPULATE_LOOKAHEAD:
+            self.populate_id = self.after_idle(self.populate_batch)
 
     def prev_index(self, iid: str) -> int:
         """
@@ -441,6 +878,109 @@ class PluginMenuTree(ttkb.Treeview):
         else:
             return idx
 
+    def node_object(self, iid: str) -> Union[model.PluginMenu, model.PluginMenuItem]:
+        """
+        Returns the PluginMenu or PluginMenuItem object stored in a node
+
+        :param iid: the iid of the tree node
+        :type iid: str
+        :return: the node's object
+        :rtype: Union[plugin_manager.model.PluginMenu, plugin_manager.model.PluginMenuItem]
+
+        """
+        try:
+            return self.nodes[iid]
+        except KeyError:
+            raise ValueError(f'No PluginMenu or PluginMenuItem is stored at iid {iid}')
+
+    def delete(self, *items) -> None:
+        """
+        Delete the specified nodes and their descendants, and discard the objects stored in them
+
+        :param items: the iids of the nodes to be deleted
+        :return: None
+
+        """
+        self.clear_filter()
+        for iid in items:
+            parent_iid: str = self.parent(iid)
+            if parent_iid == '':
+                self.menus_dirty = True
+            else:
+                self.dirty_menus.add(parent_iid)
+        pending: list[str] = list(items)
+        while len(pending) > 0:
+            iid: str = pending.pop()
+            self.nodes.pop(iid, None)
+            self.unindex_pending(iid)
+            self.pending.pop(iid, None)
+            self.dirty_menus.discard(iid)
+            if self.search_index is not None:
+                self.search_index.remove(iid)
+            pending.extend(self.get_children(iid))
+        ttkb.Treeview.delete(self, *items)
+
+    def mark_dirty(self, parent_iid: str) -> None:
+        if parent_iid == '':
+            self.menus_dirty = True
+        else:
+            self.dirty_menus.add(parent_iid)
+
+    def detach_node(self, iid: str) -> DetachedNode:
+        """
+        Detach a node and its descendants from the tree, and take their objects out of the nodes dict
+
+        :param iid: the iid of the node
+        :type iid: str
+        :return: the detached node
+        :rtype: plugin_manager.gui.tk_widgets.DetachedNode
+
+        """
+        self.clear_filter()
+        self.unindex_pending(iid)
+        detached = DetachedNode(iid=iid, parent_iid=self.parent(iid), index=self.index(iid),
+                                pending=self.pending.pop(iid, None))
+        self.mark_dirty(detached.parent_iid)
+        for node_iid in (iid,) + self.get_children(iid):
+            detached.nodes[node_iid] = self.nodes.pop(node_iid)
+            if self.search_index is not None:
+                self.search_index.remove(node_iid)
+        self.dirty_menus.discard(iid)
+        self.detach(iid)
+        return detached
+
+    def reattach_node(self, detached: DetachedNode) -> None:
+        """
+        Reattach a node detached by detach_node where it was, and restore the objects of the node and its descendants
+
+        :param detached: the detached node
+        :type detached: plugin_manager.gui.tk_widgets.DetachedNode
+        :return: None
+
+        """
+        self.clear_filter()
+        self.move(detached.iid, detached.parent_iid, detached.index)
+        for node_iid, node in detached.nodes.items():
+            self.register(node_iid, node)
+        if detached.pending is not None:
+            self.pending[detached.iid] = detached.pending
+            self.index_pending(detached.iid)
+        self.mark_dirty(detached.parent_iid)
+        if detached.parent_iid == '':
+            self.dirty_menus.add(detached.iid)
+
+    def free_node(self, detached: DetachedNode) -> None:
+        """
+        Delete a node detached by detach_node, which will not be reattached
+
+        :param detached: the detached node
+        :type detached: plugin_manager.gui.tk_widgets.DetachedNode
+        :return: None
+
+        """
+        if self.exists(detached.iid):
+            ttkb.Treeview.delete(self, detached.iid)
+
     def save_menu_attr(self, menu_iid: str, menu: model.PluginMenu) -> None:
         """
         Update the node specified my menu_iid with the supplied PluginMenu object
@@ -452,9 +992,10 @@ class PluginMenuTree(ttkb.Treeview):
         :return: None
 
         """
-        self.set(menu_iid, PluginMenuTree.MENU_STR, menu.__str__())
-        self.set(menu_iid, PluginMenuTree.ITEM_STR, '')
-        self.set(menu_iid, PluginMenuTree.REPR, menu.__repr__())
+        self.item(menu_iid, values=self.menu_values(menu))
+        if self.nodes.get(menu_iid) is not menu:
+            self.menus_dirty = True
+        self.register(menu_iid, menu)
 
     def insert_menu(self, idx: Union[int, str]) -> tuple[str, model.PluginMenu]:
         """
@@ -469,9 +1010,12 @@ class PluginMenuTree(ttkb.Treeview):
         :rtype: plugin_manager.model.PluginMenu
 
         """
-        menu_iid: str = self.insert(parent='', index=idx, text='Menu:', open=True, tags=[PluginMenuTree.MENU_TAG])
+        self.clear_filter()
         new_menu: model.PluginMenu = model.PluginMenu(title='New Menu', module_name='', items=[])
-        self.save_menu_attr(menu_iid, new_menu)
+        menu_iid: str = self.insert(parent='', index=idx, text='Menu:', open=True, tags=[PluginMenuTree.MENU_TAG],
+                                    values=self.menu_values(new_menu))
+        self.register(menu_iid, new_menu)
+        self.menus_dirty = True
         _, new_item = self.insert_menu_item(menu_iid=menu_iid, idx='end')
         new_menu.add_item(new_item)
         self.selection_set(menu_iid)
@@ -488,9 +1032,10 @@ class PluginMenuTree(ttkb.Treeview):
         :return: None
 
         """
-        self.set(item_iid, PluginMenuTree.MENU_STR, '')
-        self.set(item_iid, PluginMenuTree.ITEM_STR, item.__str__())
-        self.set(item_iid, PluginMenuTree.REPR, item.__repr__())
+        self.item(item_iid, values=self.item_values(item))
+        if self.nodes.get(item_iid) is not item:
+            self.dirty_menus.add(self.parent(item_iid))
+        self.register(item_iid, item)
 
     def insert_menu_item(self, menu_iid: str, idx: Union[int, str]) -> tuple[str, model.PluginMenuItem]:
         """
@@ -506,15 +1051,21 @@ class PluginMenuTree(ttkb.Treeview):
         new_item: model.PluginMenuItem = model.PluginMenuItem(title='New Item', entry_point_name='',
                                                               select_person=False, select_date_range=False,
                                                               select_dp_type=False)
-        item_iid: str = self.insert(parent=menu_iid, index=idx, text='Menu Item:', tags=[PluginMenuTree.ITEM_TAG, ])
-        self.save_item_attr(item_iid, new_item)
+        self.clear_filter()
+        self.populate_menu(menu_iid)
+        item_iid: str = self.insert(parent=menu_iid, index=idx, text='Menu Item:', tags=[PluginMenuTree.ITEM_TAG, ],
+                                    values=self.item_values(new_item))
+        self.register(item_iid, new_item)
+        self.dirty_menus.add(menu_iid)
         self.selection_set(item_iid)
         return item_iid, new_item
 
     def rebuild_plugin(self, plugin: model.Plugin) -> model.Plugin:
         """
         Update the provided Plugin object with the PluginMenu/PluginMenuItem objects stored in the Treeview widget's
-        nodes.
+        nodes.  Only the item lists of the menus in dirty_menus are rebuilt, and the list of menus is only rebuilt if
+        it may have changed or the Plugin was not the one last rebuilt.  A menu whose PluginMenuItem nodes are still
+        pending keeps its pending items.
 
         :param plugin: the Plugin to be updated.
         :type plugin: plugin_manager.model.Plugin
@@ -522,38 +1073,158 @@ class PluginMenuTree(ttkb.Treeview):
         :rtype; plugin_manager.model.Plugin
 
         """
-        menu_list: list[model.PluginMenu] = []
-        menu_iids: tuple[str] = self.get_children(item='')
-        for menu_idx in range(0, len(menu_iids)):
-            menu_iid = menu_iids[menu_idx]
-            menu_item_list: list[model.PluginMenuItem] = []
-            menu_item_iids: tuple[str] = self.get_children(item=menu_iid)
-            if len(menu_item_iids) > 0:
-                for menu_item_idx in range(0, len(menu_item_iids)):
-                    menu_item_iid = menu_item_iids[menu_item_idx]
-                    repr_str: str = self.set(menu_item_iid, PluginMenuTree.REPR)
-                    menu_item_list.append(eval(repr_str))
-                repr_str = self.set(menu_iid, PluginMenuTree.REPR)
-                menu: model.PluginMenu = eval(repr_str)
-                menu.items.extend(menu_item_list)
-                menu_list.append(menu)
-        plugin.menus = menu_list
+        for menu_iid in self.dirty_menus:
+            if menu_iid in self.nodes and menu_iid not in self.pending:
+                menu: model.PluginMenu = self.node_object(menu_iid)
+                was_empty: bool = len(menu.items) == 0
+                menu.items = [self.node_object(menu_item_iid) for menu_item_iid in self.get_children(item=menu_iid)]
+                if was_empty != (len(menu.items) == 0):
+                    self.menus_dirty = True
+        if self.menus_dirty or plugin.menus is not self.built_menus:
+            menu_list: list[model.PluginMenu] = []
+            for menu_iid in self.get_children(item=''):
+                menu = self.node_object(menu_iid)
+                if len(menu.items) > 0:
+                    menu_list.append(menu)
+            plugin.menus = menu_list
+            self.built_menus = plugin.menus
+        self.dirty_menus.clear()
+        self.menus_dirty = False
         return plugin
 
+    @property
+    def modified(self) -> bool:
+        """
+        Whether the tree has structural edits that have not been applied by rebuild_plugin
+
+        :return: True if there are unapplied edits
+        :rtype: bool
+
+        """
+        return self.menus_dirty or len(self.dirty_menus) > 0
+
+
+class NodeCommand(command_journal.Command):
+    """
+    Inserts or deletes a PluginMenuTree node.  Reverting either leaves the node detached rather than deleted, so it
+    can be reattached, and the node is only deleted when the command is discarded while the node is detached.
+
+    """
+    def __init__(self, tree: PluginMenuTree, iid: str, inserted: bool):
+        """
+        Creates an instance of NodeCommand for a node that has just been inserted, or is to be deleted
+
+        :param tree: the tree the node belongs to
+        :type tree: plugin_manager.gui.tk_widgets.PluginMenuTree
+        :param iid: the iid of the node
+        :type iid: str
+        :param inserted: True if the node was inserted, False if it is deleted, in which case it is detached now
+        :type inserted: bool
+
+        """
+        self.tree: PluginMenuTree = tree
+        self.iid: str = iid
+        self.inserted: bool = inserted
+        self.detached: Optional[DetachedNode] = None if inserted else tree.detach_node(iid)
+
+    def toggle(self) -> None:
+        if self.detached is None:
+            self.detached = self.tree.detach_node(self.iid)
+        else:
+            self.tree.reattach_node(self.detached)
+            self.detached = None
+
+    def undo(self) -> None:
+        self.toggle()
+
+    def redo(self) -> None:
+        self.toggle()
+
+    def discard(self) -> None:
+        if self.detached is not None:
+            self.tree.free_node(self.detached)
+            self.detached = None
+
+
+class SaveCommand(command_journal.Command):
+    """
+    Saves new attribute values to the PluginMenu or PluginMenuItem object of a PluginMenuTree node.  The objects are
+    edited in place, so the command holds the previous and saved values of the edited attributes.
+
+    """
+    MENU_ATTRS = ('title', 'module_name')
+    ITEM_ATTRS = ('title', 'entry_point_name', 'select_person', 'select_date_range', 'select_dp_type')
+
+    def __init__(self, tree: PluginMenuTree, iid: str, previous: dict[str, Any], saved: dict[str, Any]):
+        """
+        Creates an instance of SaveCommand for values that have just been saved
+
+        :param tree: the tree the node belongs to
+        :type tree: plugin_manager.gui.tk_widgets.PluginMenuTree
+        :param iid: the iid of the node
+        :type iid: str
+        :param previous: the attribute values before the save
+        :type previous: dict[str, Any]
+        :param saved: the attribute values after the save
+        :type saved: dict[str, Any]
+
+        """
+        self.tree: PluginMenuTree = tree
+        self.iid: str = iid
+        self.previous: dict[str, Any] = previous
+        self.saved: dict[str, Any] = saved
+
+    @staticmethod
+    def attrs(node: Union[model.PluginMenu, model.PluginMenuItem]) -> dict[str, Any]:
+        """
+        Returns the values of the attributes of a node's object that a save edits
+
+        :param node: the PluginMenu or PluginMenuItem object
+        :type node: Union[plugin_manager.model.PluginMenu, plugin_manager.model.PluginMenuItem]
+        :return: the values, keyed by attribute name
+        :rtype: dict[str, Any]
+
+        """
+        names = SaveCommand.MENU_ATTRS if isinstance(node, model.PluginMenu) else SaveCommand.ITEM_ATTRS
+        return {name: getattr(node, name) for name in names}
+
+    def apply(self, values: dict[str, Any]) -> None:
+        node: Union[model.PluginMenu, model.PluginMenuItem] = self.tree.node_object(self.iid)
+        for name, value in values.items():
+            setattr(node, name, value)
+        if isinstance(node, model.PluginMenu):
+            self.tree.save_menu_attr(self.iid, node)
+        else:
+            self.tree.save_item_attr(self.iid, node)
+
+    def undo(self) -> None:
+        self.apply(self.previous)
+
+    def redo(self) -> None:
+        self.apply(self.saved)
+
 
 class PluginWidget(ttkb.Frame):
     """
     Prompts the user for the title, description, author name and author email properties to be used in creating or
     updating a plugin_manager.model.Plugin object
 
+    Every insert, delete and save of a menu or menu item is recorded as a Command on a CommandJournal of at most
+    journal_size commands, and can be undone and redone with the Undo and Redo buttons, or Control-Z and Control-Y in
+    the tree.  Undoing or redoing a command only touches the node it edited.
+
     """
-    def __init__(self, parent, plugin: Optional[model.Plugin]):
+    JOURNAL_SIZE = 100
+
+    def __init__(self, parent, plugin: Optional[model.Plugin], journal_size: Optional[int] = None):
         """
         Creates an instance of PluginWidget
 
         :param parent: the GUI parent of this widget
         :param plugin: a Plugin object or none
         :type plugin: plugin_manager.model.Plugin
+        :param journal_size: the number of edits that can be undone, by default JOURNAL_SIZE
+        :type journal_size: Optional[int]
 
         """
         ttkb.Frame.__init__(self, master=parent)
@@ -566,6 +1237,12 @@ class PluginWidget(ttkb.Frame):
         self.current_menu_iid: Optional[str] = None
         self.current_item: Optional[model.PluginMenuItem] = None
         self.current_item_iid: Optional[str] = None
+        # set by each edit of the menus, and cleared by the host when the Plugin is saved
+        self.edited: bool = False
+        self.journal = command_journal.CommandJournal(journal_size if journal_size is not None else
+                                                      PluginWidget.JOURNAL_SIZE)
+        # lists the entry points of plugin modules in the background, so selecting a menu item never blocks
+        self.executor = tk_executor.TkCallExecutor(self, max_workers=1)
 
         header_frame: ttkb.Frame = ttkb.Frame(master=self)
         header_frame.columnconfigure(0, weight=0)
@@ -640,15 +1317,66 @@ class PluginWidget(ttkb.Frame):
         self.delete_btn = ttkb.Button(master=self.tree_frame, text='Delete', command=self.delete)
         self.delete_btn.grid(column=1, row=2, padx=5, pady=5, sticky=tk.EW)
 
+        search_frame = ttkb.Frame(self.tree_frame)
+        ttkb.Label(search_frame, text='Search:', width=10).grid(column=0, row=0, padx=5, pady=5, sticky=tk.W)
+        self.search_var: ttkb.StringVar = ttkb.StringVar()
+        ttkb.Entry(search_frame, textvariable=self.search_var, width=60).grid(column=1, row=0, padx=5, pady=5,
+                                                                            sticky=tk.EW)
+        search_frame.grid(column=0, row=3, sticky=tk.EW)
+        undo_frame = ttkb.Frame(self.tree_frame)
+        self.undo_btn = ttkb.Button(master=undo_frame, text='Undo', command=self.undo, state=tk.DISABLED)
+        self.undo_btn.grid(column=0, row=0, padx=5, pady=5, sticky=tk.EW)
+        self.redo_btn = ttkb.Button(master=undo_frame, text='Redo', command=self.redo, state=tk.DISABLED)
+        self.redo_btn.grid(column=1, row=0, padx=5, pady=5, sticky=tk.EW)
+        undo_frame.grid(column=1, row=3, sticky=tk.EW)
+        self.menu_tree.bind('<Control-z>', self.undo)
+        self.menu_tree.bind('<Control-y>', self.redo)
+        self.search_id: Optional[str] = None
+        self.search_var.trace_add('write', self.schedule_search)
+
         self.tree_frame.grid(column=0, row=2, padx=10, pady=5, stick=tk.NSEW)
 
-        self.footer_frame: Optional[ttkb.Frame] = None
-        self.footer_widget: Optional[ttkb.Frame] = None
-        self.replace_footer()
+        # the footer editors are created once and repopulated for each selection, and only the one in use is gridded
+        self.footer_frame = ttkb.Frame(self)
+        self.blank_footer = ttkb.Frame(self.footer_frame)
+        for row in range(0, 4):
+            ttkb.Label(self.blank_footer, text=' ', width=150).grid(column=0, row=row, padx=5, pady=5)
+        self.menu_widget = PluginMenuWidget(self.footer_frame, cancel_action=self.cancel, save_action=self.save_menu)
+        self.menu_item_widget = PluginMenuItemWidget(self.footer_frame, module_name='', cancel_action=self.cancel,
+                                                     save_action=self.save_menu_item, executor=self.executor)
+        self.footer_widget: ttkb.Frame = self.blank_footer
+        self.blank_footer.grid(column=0, row=0, sticky=tk.NSEW)
+        self.footer_frame.grid(column=0, row=3, padx=15, pady=5, sticky=tk.NSEW)
 
         if self.plugin is not None:
             self.populate_plugin_widget()
 
+    def destroy(self) -> None:
+        """
+        Stop the background executor and destroy the widget
+
+        :return: None
+
+        """
+        self.executor.shutdown()
+        ttkb.Frame.destroy(self)
+
+    @property
+    def modified(self) -> bool:
+        """
+        Whether the Plugin has edits that have not been saved: an edit of its menus since the edited flag was
+        cleared, or general info that differs from the Plugin's
+
+        :return: True if there are unsaved edits
+        :rtype: bool
+
+        """
+        if self.plugin is None or self.edited:
+            return True
+        return (self.name_widget.get_value(), self.desc_widget.get_value(), self.author_name_widget.get_value(),
+                self.author_email_widget.get_value()) != (self.plugin.name, self.plugin.description,
+                                                          self.plugin.author_name, self.plugin.author_email)
+
     def focus_set(self):
         """
         Delegate focus set calls to the Plugin Name widgetd
@@ -678,21 +1406,28 @@ class PluginWidget(ttkb.Frame):
         self.insert_above_btn.configure(state=tk.NORMAL)
         self.insert_below_btn.configure(state=tk.NORMAL)
 
+    def show_footer(self, footer_widget: ttkb.Frame) -> None:
+        """
+        Grid one of the footer widgets into the footer frame, removing the one currently shown
+
+        :param footer_widget: the blank placeholder Frame, the PluginMenuWidget or the PluginMenuItemWidget
+        :type footer_widget: ttkbootstrap.Frame
+        :return: None
+
+        """
+        if footer_widget is not self.footer_widget:
+            self.footer_widget.grid_remove()
+            footer_widget.grid(column=0, row=0, sticky=tk.NSEW)
+            self.footer_widget = footer_widget
+
     def replace_footer(self):
         """
-        Create a blank place holder Frame and grid it into footer frame
+        Show the blank place holder Frame in the footer frame
 
         :return: None
 
         """
-        if self.footer_frame is not None:
-            self.footer_frame.forget()
-        self.footer_frame = ttkb.Frame(self)
-        self.footer_widget = ttkb.Frame(self.footer_frame)
-        for row in range(0, 4):
-            ttkb.Label(self.footer_widget, text=' ', width=150).grid(column=0, row=row, padx=5, pady=5)
-        self.footer_widget.grid(column=0, row=0, sticky=tk.NSEW)
-        self.footer_frame.grid(column=0, row=3, padx=15, pady=5, sticky=tk.NSEW)
+        self.show_footer(self.blank_footer)
 
     def cancel(self):
         """
@@ -726,8 +1461,12 @@ class PluginWidget(ttkb.Frame):
         :return: None
 
         """
-        self.current_menu = self.footer_widget.get_menu()
+        previous: Optional[dict[str, Any]] = SaveCommand.attrs(self.menu_widget.menu) \
+            if self.menu_widget.menu is not None else None
+        self.current_menu = self.menu_widget.get_menu()
         self.menu_tree.save_menu_attr(self.current_menu_iid, self.current_menu)
+        self.record_save(self.current_menu_iid, previous, SaveCommand.attrs(self.current_menu))
+        self.edited = True
         self.enable_insert()
         self.replace_footer()
 
@@ -739,10 +1478,9 @@ class PluginWidget(ttkb.Frame):
         :return: None
         """
         tree_element = self.menu_tree.selection()
-        repr_str: str = self.menu_tree.set(tree_element[0], PluginMenuTree.REPR)
-        menu: model.PluginMenu = eval(repr_str)
+        menu: model.PluginMenu = self.menu_tree.node_object(tree_element[0])
         if not isinstance(menu, model.PluginMenu):
-            raise ValueError(f'The __repr__ value {repr_str} at iid {tree_element[0]} is not valid')
+            raise ValueError(f'The node at iid {tree_element[0]} does not contain a PluginMenu')
         else:
             self.current_menu = menu
             self.current_menu_iid = tree_element[0]
@@ -753,14 +1491,10 @@ class PluginWidget(ttkb.Frame):
 
     def populate_menu_widget(self, menu_iid: str, menu: model.PluginMenu):
         """
-        Creates a PluginMenuWidget from the provided PluginMenu object, places the widget in the footer frame
+        Populates the PluginMenuWidget from the provided PluginMenu object and shows it in the footer frame
         """
-        self.footer_frame.forget()
-        self.footer_widget = PluginMenuWidget(self.footer_frame, cancel_action=self.cancel,
-                                              save_action=self.save_menu, menu=menu,
-                                              menu_iid=menu_iid)
-        self.footer_widget.grid(column=0, row=0, sticky=tk.NSEW)
-        self.footer_frame.grid(column=0, row=3, padx=15, pady=5, sticky=tk.NSEW)
+        self.menu_widget.populate(menu=menu, menu_iid=menu_iid)
+        self.show_footer(self.menu_widget)
 
     def save_menu_item(self):
         """
@@ -769,8 +1503,12 @@ class PluginWidget(ttkb.Frame):
         :return: None
 
         """
-        self.current_item: model.PluginMenuItem = self.footer_widget.get_menu_item()
+        previous: Optional[dict[str, Any]] = SaveCommand.attrs(self.menu_item_widget.menu_item) \
+            if self.menu_item_widget.menu_item is not None else None
+        self.current_item: model.PluginMenuItem = self.menu_item_widget.get_menu_item()
         self.menu_tree.save_item_attr(self.current_item_iid, self.current_item)
+        self.record_save(self.current_item_iid, previous, SaveCommand.attrs(self.current_item))
+        self.edited = True
         self.enable_insert()
         self.replace_footer()
 
@@ -783,15 +1521,13 @@ class PluginWidget(ttkb.Frame):
 
         """
         tree_element = self.menu_tree.selection()
-        repr_str: str = self.menu_tree.set(tree_element[0], PluginMenuTree.REPR)
-        item: model.PluginMenuItem = eval(repr_str)
+        item: model.PluginMenuItem = self.menu_tree.node_object(tree_element[0])
         if not isinstance(item, model.PluginMenuItem):
-            raise ValueError(f'The __repr__ value {repr_str} at iid {tree_element[0]} is not valid')
+            raise ValueError(f'The node at iid {tree_element[0]} does not contain a PluginMenuItem')
         item_parent = self.menu_tree.parent(tree_element[0])
-        repr_str: str = self.menu_tree.set(item_parent, PluginMenuTree.REPR)
-        menu: model.PluginMenu = eval(repr_str)
+        menu: model.PluginMenu = self.menu_tree.node_object(item_parent)
         if not isinstance(menu, model.PluginMenu):
-            raise ValueError(f'The __repr__ value {repr_str} at iid {tree_element[0]} is not valid')
+            raise ValueError(f'The node at iid {item_parent} does not contain a PluginMenu')
         else:
             self.current_menu = menu
             self.current_menu_iid = item_parent
@@ -804,10 +1540,11 @@ class PluginWidget(ttkb.Frame):
     def populate_menu_item_widget(self, module_name: str, menu_iid: str, item_iid: str,
                                   item: model.PluginMenuItem) -> None:
         """
-        Creates a PluginMenuItemWidget and populates its prompt values fro the provided PluginMenuItem.  Before
-        creating the widget, the module specified by the module_name property is imported.  If the module is not
-        found a ModuleNotFound exception is thrown.  If the module cannot be imported because off syntax errors,
-        an ImportError exception is thrown.
+        Populates the PluginMenuItemWidget's prompt values from the provided PluginMenuItem and shows it.  The
+        candidate entry points are discovered by parsing the source of the module specified by the module_name
+        property, so the module is not imported.  Modules whose entry points are not cached are parsed on the
+        widget's executor, and the entry points are listed when the result arrives.  If the module is not found, or
+        its source can not be parsed, no entry points are listed.
 
         :param module_name:
         :param menu_iid:
@@ -815,22 +1552,41 @@ class PluginWidget(ttkb.Frame):
         :param item:
         :return:
         """
-        if len(module_name) > 0:
-            try:
-                module: Optional[types.ModuleType] = importlib.import_module(module_name)
-            except ModuleNotFoundError:
-                module = None
-            except ImportError:
-                module = None
-        else:
-            module = None
-        self.footer_frame.forget()
-        self.footer_frame = ttkb.Frame(self)
-        self.footer_widget = PluginMenuItemWidget(self.footer_frame, module=module, cancel_action=self.cancel,
-                                                  save_action=self.save_menu_item, menu_item=item,
-                                                  menu_iid=menu_iid, item_iid=item_iid)
-        self.footer_widget.grid(column=0, row=0, sticky=tk.NSEW)
-        self.footer_frame.grid(column=0, row=3, padx=15, pady=5, sticky=tk.NSEW)
+        self.menu_item_widget.populate(module_name=module_name, menu_item=item, menu_iid=menu_iid, item_iid=item_iid)
+        self.show_footer(self.menu_item_widget)
+
+    def schedule_search(self, *args) -> None:
+        """
+        A callback invoked when the search text changes.  The tree is filtered when Tk is next idle, so a burst of
+        keystrokes results in a single filter.
+
+        :return: None
+
+        """
+        if self.search_id is None:
+            self.search_id = self.after_idle(self.search)
+
+    def search(self) -> int:
+        """
+        Filter the PluginMenuTree by the search text
+
+        :return: the number of matching nodes
+        :rtype: int
+
+        """
+        self.search_id = None
+        return self.menu_tree.filter(self.search_var.get())
+
+    def clear_search(self) -> None:
+        """
+        Clear the search text and show every node of the PluginMenuTree
+
+        :return: None
+
+        """
+        if len(self.search_var.get()) > 0:
+            self.search_var.set('')
+        self.menu_tree.clear_filter()
 
     def insert_above(self) -> None:
         """
@@ -841,16 +1597,18 @@ class PluginWidget(ttkb.Frame):
         :return: None
 
         """
+        self.clear_search()
         if self.current_menu is not None:
+            self.edited = True
             if self.current_item is not None:
                 self.current_item_iid, self.current_item = self.insert_item_above()
-                self.current_menu.add_item(self.current_item)
+                self.record(NodeCommand(self.menu_tree, self.current_item_iid, inserted=True))
                 self.populate_menu_item_widget(module_name=self.current_menu.module_name,
                                                menu_iid=self.current_menu_iid, item_iid=self.current_item_iid,
                                                item=self.current_item)
             else:
                 self.current_menu_iid, self.current_menu = self.insert_menu_above()
-                self.plugin.add_menu(self.current_menu)
+                self.record(NodeCommand(self.menu_tree, self.current_menu_iid, inserted=True))
                 self.populate_menu_widget(menu_iid=self.current_menu_iid, menu=self.current_menu)
         self.disable_insert()
 
@@ -863,16 +1621,18 @@ class PluginWidget(ttkb.Frame):
         :return: None
 
         """
+        self.clear_search()
         if self.current_menu is not None:
+            self.edited = True
             if self.current_item is not None:
                 self.current_item_iid, self.current_item = self.insert_item_below()
-                self.current_menu.add_item(self.current_item)
+                self.record(NodeCommand(self.menu_tree, self.current_item_iid, inserted=True))
                 self.populate_menu_item_widget(module_name=self.current_menu.module_name,
                                                menu_iid=self.current_menu_iid, item_iid=self.current_item_iid,
                                                item=self.current_item)
             else:
                 self.current_menu_iid, self.current_menu = self.insert_menu_below()
-                self.plugin.add_menu(self.current_menu)
+                self.record(NodeCommand(self.menu_tree, self.current_menu_iid, inserted=True))
                 self.populate_menu_widget(menu_iid=self.current_menu_iid, menu=self.current_menu)
         self.disable_insert()
 
@@ -885,7 +1645,9 @@ class PluginWidget(ttkb.Frame):
         :return: None
 
         """
+        self.clear_search()
         if self.current_menu is not None:
+            self.edited = True
             if self.current_item is not None:
                 self.delete_item()
             else:
@@ -917,12 +1679,13 @@ class PluginWidget(ttkb.Frame):
 
     def delete_menu(self):
         """
-        Delete the currently selected PluginMenu node on the PluginMenuTreeWidget
+        Delete the currently selected PluginMenu node on the PluginMenuTreeWidget.  The node is detached, so the
+        deletion can be undone.
 
         :return: None
 
         """
-        self.menu_tree.delete(self.footer_widget.menu_iid)
+        self.record(NodeCommand(self.menu_tree, self.menu_widget.menu_iid, inserted=False))
         self.current_menu = None
         self.current_menu_iid = None
 
@@ -950,14 +1713,91 @@ class PluginWidget(ttkb.Frame):
 
     def delete_item(self):
         """
-        Delete the currently selected PluginMenuItem node on the PluginMenuTreeWidget
+        Delete the currently selected PluginMenuItem node on the PluginMenuTreeWidget.  The node is detached, so the
+        deletion can be undone.
+
+        :return: None
+
+        """
+        self.record(NodeCommand(self.menu_tree, self.menu_item_widget.item_iid, inserted=False))
+        self.current_item = None
+        self.current_item_iid = None
+
+    def record(self, command: command_journal.Command) -> None:
+        """
+        Record an applied edit on the journal
+
+        :param command: the edit
+        :type command: plugin_manager.gui.command_journal.Command
+        :return: None
+
+        """
+        self.journal.record(command)
+        self.update_undo_buttons()
+
+    def record_save(self, iid: str, previous: Optional[dict[str, Any]], saved: dict[str, Any]) -> None:
+        """
+        Record a save of a node's attribute values on the journal, unless no value changed
+
+        :param iid: the iid of the saved node
+        :type iid: str
+        :param previous: the attribute values before the save, or None if the node's object was replaced
+        :type previous: Optional[dict[str, Any]]
+        :param saved: the attribute values after the save
+        :type saved: dict[str, Any]
+        :return: None
+
+        """
+        if previous is not None and previous != saved:
+            self.record(SaveCommand(self.menu_tree, iid, previous, saved))
+
+    def update_undo_buttons(self) -> None:
+        self.undo_btn.configure(state=tk.NORMAL if self.journal.can_undo else tk.DISABLED)
+        self.redo_btn.configure(state=tk.NORMAL if self.journal.can_redo else tk.DISABLED)
+
+    def undo(self, event=None) -> None:
+        """
+        Revert the most recent edit recorded on the journal.  The selection is cleared, since the selected node may
+        have been detached.
+
+        :param event:
+        :return: None
+
+        """
+        self.clear_search()
+        if self.journal.undo() is not None:
+            self.edited = True
+            self.clear_selection()
+        self.update_undo_buttons()
+
+    def redo(self, event=None) -> None:
+        """
+        Apply the most recently undone edit again.  The selection is cleared, since the selected node may have been
+        detached.
 
+        :param event:
         :return: None
 
         """
-        self.menu_tree.delete(self.footer_widget.item_iid)
+        self.clear_search()
+        if self.journal.redo() is not None:
+            self.edited = True
+            self.clear_selection()
+        self.update_undo_buttons()
+
+    def clear_selection(self) -> None:
+        """
+        Forget the selected menu and menu item and show the blank footer
+
+        :return: None
+
+        """
+        self.current_menu = None
+        self.current_menu_iid = None
         self.current_item = None
         self.current_item_iid = None
+        self.replace_footer()
+        self.enable_insert()
 
     def rebuild_plugin(self) -> model.Plugin:
         """
@@ -980,3 +1820,76 @@ class PluginWidget(ttkb.Frame):
             self.plugin.author_email = self.author_email_widget.get_value()
         return self.menu_tree.rebuild_plugin(self.plugin)
 
+
+class WorkspaceList(ttkb.Treeview):
+    """
+    Lists the Plugin JSON files of a workspace folder by the name, author and menu count read from their headers.
+    Each node's iid is the path of its file.
+
+    """
+    NAME_STR = 'name'
+    AUTHOR_STR = 'author'
+    MENU_COUNT_STR = 'menu_count'
+
+    def __init__(self, parent, select_action: Callable):
+        """
+        Creates an instance of WorkspaceList
+
+        :param parent: the GUI parent for this widget
+        :param select_action: a callback method to be invoked when a Plugin JSON file is selected by the user
+        :type select_action: Callable
+
+        """
+        ttkb.Treeview.__init__(self, master=parent, columns=(WorkspaceList.NAME_STR, WorkspaceList.AUTHOR_STR,
+                                                             WorkspaceList.MENU_COUNT_STR),
+                               show='headings', selectmode=tk.BROWSE, height=8)
+        self.heading(WorkspaceList.NAME_STR, text='Plugin', anchor=tk.W)
+        self.heading(WorkspaceList.AUTHOR_STR, text='Author', anchor=tk.W)
+        self.heading(WorkspaceList.MENU_COUNT_STR, text='Menus', anchor=tk.W)
+        self.column(WorkspaceList.MENU_COUNT_STR, width=80, stretch=False)
+        self.bind('<<TreeviewSelect>>', select_action)
+
+    @staticmethod
+    def header_values(header: jh.PluginHeader) -> tuple[str, str, int]:
+        return header.name, header.author_name, header.menu_count
+
+    def set_headers(self, headers: list[jh.PluginHeader]) -> None:
+        """
+        Replace the listed files
+
+        :param headers: the headers of the files, in display order
+        :type headers: list[plugin_manager.model.json_handler.PluginHeader]
+        :return: None
+
+        """
+        self.delete(*self.get_children(item=''))
+        for header in headers:
+            self.insert(parent='', index='end', iid=str(header.json_path), values=self.header_values(header))
+
+    def update_header(self, header: jh.PluginHeader, idx: Union[int, str] = 'end') -> None:
+        """
+        Update the listed values of a file, or list it at the provided index if it is not listed
+
+        :param header: the header of the file
+        :type header: plugin_manager.model.json_handler.PluginHeader
+        :param idx: the index a file that is not listed is inserted at
+        :type idx: Union[int, str]
+        :return: None
+
+        """
+        iid: str = str(header.json_path)
+        if self.exists(iid):
+            self.item(iid, values=self.header_values(header))
+        else:
+            self.insert(parent='', index=idx, iid=iid, values=self.header_values(header))
+
+    def selected_path(self) -> Optional[pathlib.Path]:
+        """
+        Returns the path of the selected file
+
+        :return: the path, or None if no file is selected
+        :rtype: Optional[pathlib.Path]
+
+        """
+        selection = self.selection()
+        return pathlib.Path(selection[0]) if len(selection) > 0 else None
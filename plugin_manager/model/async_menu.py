@@ -0,0 +1,253 @@
+import asyncio
+from concurrent.futures import Executor, Future
+import functools
+import inspect
+from typing import Any, Callable, Iterable, Optional, Union
+
+import plugin_manager.model.plugin as model
+
+
+async def resolve_result(result: Any) -> Any:
+    """
+    Await a result for as long as it is awaitable, so a synchronous callback that returns a coroutine, such as a
+    selection action that invokes an async entry point, is run to completion
+
+    :param result: the value returned by a callback
+    :type result: Any
+    :return: the final, non awaitable, result
+    :rtype: Any
+
+    """
+    while inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+class AsyncMenuAction:
+    """
+    The action passed to add_menu_item by create_menu_async.  Calling the action schedules the entry point on the
+    event loop and returns the asyncio.Task running it, which may be awaited or cancelled.  When the action is called
+    from a thread other than the event loop's, a concurrent.futures.Future is returned instead.
+
+    Async entry points and selection actions are awaited.  A synchronous entry point is run in an executor so it
+    does not block the event loop, unless offload is False.  A synchronous selection action is run on the event loop,
+    since it typically presents UI.  If a timeout is provided and the invocation does not finish in time, it is
+    cancelled and asyncio.TimeoutError is raised; a synchronous entry point already running in an executor thread
+    can not be interrupted, so only the wait for it is abandoned.
+
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop, entry_point: Callable,
+                 item: Optional[model.PluginMenuItem] = None, selection_action: Optional[Callable] = None,
+                 timeout: Optional[float] = None, executor: Optional[Executor] = None, offload: bool = True):
+        """
+        Creates an instance of AsyncMenuAction
+
+        :param loop: the event loop the entry point is scheduled on
+        :type loop: asyncio.AbstractEventLoop
+        :param entry_point: the entry point, or the not found action if the entry point could not be resolved
+        :type entry_point: Callable
+        :param item: the menu item, whose select properties are passed to the selection action
+        :type item: Optional[plugin_manager.model.plugin.PluginMenuItem]
+        :param selection_action: the callback to be used for Person, date range and DataPointType selections
+        :type selection_action: Optional[Callable]
+        :param timeout: the maximum number of seconds an invocation may take, or None for no limit
+        :type timeout: Optional[float]
+        :param executor: the executor synchronous entry points are run in, by default the loop's default executor
+        :type executor: Optional[concurrent.futures.Executor]
+        :param offload: if False, synchronous entry points are run on the event loop
+        :type offload: bool
+
+        """
+        self.loop: asyncio.AbstractEventLoop = loop
+        self.entry_point: Callable = entry_point
+        self.item: Optional[model.PluginMenuItem] = item
+        self.selection_action: Optional[Callable] = selection_action
+        self.timeout: Optional[float] = timeout
+        self.executor: Optional[Executor] = executor
+        self.offload: bool = offload
+
+    async def run(self, *args, **kwargs) -> Any:
+        """
+        Invoke the selection action, or the entry point, and await its result
+
+        :return: the entry point's result
+        :rtype: Any
+
+        """
+        if self.selection_action is not None and self.item is not None:
+            result: Any = self.selection_action(self.item.select_person, self.item.select_date_range,
+                                                self.item.select_dp_type, self.entry_point)
+        elif self.offload and not inspect.iscoroutinefunction(self.entry_point):
+            result = await self.loop.run_in_executor(self.executor,
+                                                     functools.partial(self.entry_point, *args, **kwargs))
+        else:
+            result = self.entry_point(*args, **kwargs)
+        return await resolve_result(result)
+
+    async def invoke(self, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Invoke the entry point on the event loop, applying the per invocation timeout
+
+        :param timeout: overrides the action's timeout for this invocation
+        :type timeout: Optional[float]
+        :return: the entry point's result
+        :rtype: Any
+
+        """
+        return await asyncio.wait_for(self.run(*args, **kwargs), timeout if timeout is not None else self.timeout)
+
+    def __call__(self, *args, **kwargs) -> Union[asyncio.Task, Future]:
+        try:
+            running_loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self.loop:
+            return self.loop.create_task(self.invoke(*args, **kwargs))
+        return asyncio.run_coroutine_threadsafe(self.invoke(*args, **kwargs), self.loop)
+
+
+async def resolve_modules(module_names: Iterable[str], module_cache: Optional[model.ModuleCache] = None,
+                          executor: Optional[Executor] = None) -> dict[str, Optional[Exception]]:
+    """
+    Resolve plugin modules concurrently, in an executor so the imports do not block the event loop
+
+    :param module_names: the names of the plugin modules
+    :type module_names: Iterable[str]
+    :param module_cache: the ModuleCache used to resolve the modules, by default the shared default_module_cache
+    :type module_cache: Optional[plugin_manager.model.plugin.ModuleCache]
+    :param executor: the executor the imports are run in, by default the loop's default executor
+    :type executor: Optional[concurrent.futures.Executor]
+    :return: None for each module that was resolved, or the exception raised, keyed by module name
+    :rtype: dict[str, Optional[Exception]]
+
+    """
+    if module_cache is None:
+        module_cache = model.default_module_cache
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    names: list[str] = list(dict.fromkeys(module_names))
+    results: list[Any] = await asyncio.gather(*[loop.run_in_executor(executor, module_cache.resolve, name)
+                                                for name in names], return_exceptions=True)
+    outcomes: dict[str, Optional[Exception]] = {}
+    for name, result in zip(names, results):
+        if isinstance(result, asyncio.CancelledError):
+            raise result
+        outcomes[name] = result if isinstance(result, Exception) else None
+    return outcomes
+
+
+async def build_menu(menu: model.PluginMenu, not_found_action: Callable, selection_action: Optional[Callable],
+                     add_menu_item: Callable, add_menu: Callable, module_cache: model.ModuleCache,
+                     timeout: Optional[float], executor: Optional[Executor]) -> None:
+    """
+    Build a menu whose module has already been resolved.  The add_menu_item and add_menu callbacks may be async.
+
+    :param menu: the PluginMenu to be built
+    :type menu: plugin_manager.model.plugin.PluginMenu
+    :param not_found_action: the callback to be used when an entry point can not be found
+    :type not_found_action: Callable
+    :param selection_action: the callback to be used for Person, date range and DataPointType selections
+    :type selection_action: Optional[Callable]
+    :param add_menu_item: the callback to be used to add menu items to the menu
+    :type add_menu_item: Callable
+    :param add_menu: the callback to be used to associate the menu created with a parent menu
+    :type add_menu: Callable
+    :param module_cache: the ModuleCache the menu's module was resolved into
+    :type module_cache: plugin_manager.model.plugin.ModuleCache
+    :param timeout: the maximum number of seconds each entry point invocation may take, or None for no limit
+    :type timeout: Optional[float]
+    :param executor: the executor used for synchronous entry points, by default the loop's default executor
+    :type executor: Optional[concurrent.futures.Executor]
+    :return: None
+
+    """
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    for item in menu.items:
+        try:
+            found, entry_point = item.import_entry_point(menu.module_name, not_found_action, module_cache)
+            if found:
+                action = AsyncMenuAction(loop, entry_point, item, selection_action, timeout, executor)
+            else:
+                # the not found callable carries its message as a default argument, so arguments are not passed on
+                action = AsyncMenuAction(loop, lambda *args, not_found=entry_point, **kwargs: not_found(),
+                                         timeout=timeout, offload=False)
+            label: str = item.title
+        except model.PluginNotFoundError:
+            label = f'{item.title} not found'
+            action = AsyncMenuAction(loop, lambda *args, **kwargs: not_found_action(), timeout=timeout,
+                                     offload=False)
+        except model.PluginImportError:
+            label = f'{item.title} import error'
+            action = AsyncMenuAction(loop, lambda *args, **kwargs: not_found_action(), timeout=timeout,
+                                     offload=False)
+        await resolve_result(add_menu_item(label=label, action=action))
+    await resolve_result(add_menu(label=menu.title))
+
+
+async def create_menus_async(menus: Iterable[model.PluginMenu], not_found_action: Callable,
+                             selection_action: Optional[Callable], add_menu_item: Callable, add_menu: Callable,
+                             module_cache: Optional[model.ModuleCache] = None, timeout: Optional[float] = None,
+                             executor: Optional[Executor] = None) -> None:
+    """
+    The async counterpart of PluginMenu.create_menu for a list of menus.  The distinct modules named by the menus are
+    resolved concurrently in an executor, then the menus are built, in order, on the event loop.  Each menu item's
+    action is an AsyncMenuAction.
+
+    :param menus: the PluginMenus to be built
+    :type menus: Iterable[plugin_manager.model.plugin.PluginMenu]
+    :param not_found_action: the callback to be used when an entry point can not be found
+    :type not_found_action: Callable
+    :param selection_action: the callback to be used for Person, date range and DataPointType selections
+    :type selection_action: Optional[Callable]
+    :param add_menu_item: the callback to be used to add menu items to the menu
+    :type add_menu_item: Callable
+    :param add_menu: the callback to be used to associate the menu created with a parent menu
+    :type add_menu: Callable
+    :param module_cache: the ModuleCache used to resolve the modules, by default the shared default_module_cache
+    :type module_cache: Optional[plugin_manager.model.plugin.ModuleCache]
+    :param timeout: the maximum number of seconds each entry point invocation may take, or None for no limit
+    :type timeout: Optional[float]
+    :param executor: the executor used for imports and synchronous entry points, by default the loop's default
+        executor
+    :type executor: Optional[concurrent.futures.Executor]
+    :return: None
+
+    """
+    if module_cache is None:
+        module_cache = model.default_module_cache
+    menus = list(menus)
+    await resolve_modules([menu.module_name for menu in menus], module_cache, executor)
+    for menu in menus:
+        await build_menu(menu, not_found_action, selection_action, add_menu_item, add_menu, module_cache, timeout,
+                         executor)
+
+
+async def create_menu_async(menu: model.PluginMenu, not_found_action: Callable, selection_action: Optional[Callable],
+                            add_menu_item: Callable, add_menu: Callable,
+                            module_cache: Optional[model.ModuleCache] = None, timeout: Optional[float] = None,
+                            executor: Optional[Executor] = None) -> None:
+    """
+    The async counterpart of PluginMenu.create_menu.  The menu's module is resolved in an executor, so the import
+    does not block the event loop.  Each menu item's action is an AsyncMenuAction.
+
+    :param menu: the PluginMenu to be built
+    :type menu: plugin_manager.model.plugin.PluginMenu
+    :param not_found_action: the callback to be used when an entry point can not be found
+    :type not_found_action: Callable
+    :param selection_action: the callback to be used for Person, date range and DataPointType selections
+    :type selection_action: Optional[Callable]
+    :param add_menu_item: the callback to be used to add menu items to the menu
+    :type add_menu_item: Callable
+    :param add_menu: the callback to be used to associate the menu created with a parent menu
+    :type add_menu: Callable
+    :param module_cache: the ModuleCache used to resolve the module, by default the shared default_module_cache
+    :type module_cache: Optional[plugin_manager.model.plugin.ModuleCache]
+    :param timeout: the maximum number of seconds each entry point invocation may take, or None for no limit
+    :type timeout: Optional[float]
+    :param executor: the executor used for the import and synchronous entry points, by default the loop's default
+        executor
+    :type executor: Optional[concurrent.futures.Executor]
+    :return: None
+
+    """
+    await create_menus_async([menu], not_found_action, selection_action, add_menu_item, add_menu, module_cache,
+                             timeout, executor)
@@ -0,0 +1,266 @@
+from dataclasses import dataclass, field
+import marshal
+import os
+import pathlib
+import tempfile
+import time
+from typing import Optional
+
+import plugin_manager.model.json_handler as jh
+import plugin_manager.model.plugin as model
+
+CACHE_VERSION: int = 1
+PluginRecord = tuple[str, str, str, str, tuple[tuple[str, str, tuple[tuple[str, str, bool, bool, bool], ...]], ...]]
+# files modified this close to the time the cache was written are verified by hash, since a second write within the
+# file system's timestamp resolution would not change the modification time
+MTIME_RACE_NS: int = 2_000_000_000
+
+
+@dataclass
+class CatalogEntry:
+    """
+    Holds the decoded Plugin for a single JSON file, along with the file attributes used to determine whether the
+    file has changed since it was decoded
+
+    :param size: the size of the file in bytes
+    :type size: int
+    :param mtime_ns: the modification time of the file in nanoseconds
+    :type mtime_ns: int
+    :param content_hash: a hash of the file contents
+    :type content_hash: str
+    :param plugin: the decoded Plugin, or None if the file could not be decoded
+    :type plugin: Optional[plugin_manager.model.plugin.Plugin]
+
+    """
+    size: int
+    mtime_ns: int
+    content_hash: str
+    plugin: Optional[model.Plugin]
+
+
+@dataclass
+class CatalogLoadStats:
+    """
+    Reports how a CatalogCache.load call was satisfied
+
+    :param reused: the number of files whose Plugin was taken from the cache
+    :type reused: int
+    :param decoded: the number of files that were added or changed and had to be decoded
+    :type decoded: int
+    :param removed: the number of cached files that no longer exist
+    :type removed: int
+    :param verified: the number of unchanged files whose contents were hashed, because they were modified too close
+        to the time the cache was written for their modification time to be trusted
+    :type verified: int
+    :param full_load: True if the cache could not be used and every file was decoded
+    :type full_load: bool
+    :param changed_files: the names of the files that were decoded
+    :type changed_files: list[str]
+
+    """
+    reused: int = 0
+    decoded: int = 0
+    removed: int = 0
+    verified: int = 0
+    full_load: bool = False
+    changed_files: list[str] = field(default_factory=list)
+
+
+def default_cache_path(plugin_path: pathlib.Path) -> pathlib.Path:
+    """
+    Returns the path of the catalog cache file for a plugin folder.  The file is stored next to the plugin folder,
+    so it is not mistaken for a plugin spec.
+
+    :param plugin_path: a Path object pointing to the folder containing the Plugin JSON files
+    :type plugin_path: pathlib.Path
+    :return: the path of the cache file
+    :rtype: pathlib.Path
+
+    """
+    plugin_path = plugin_path.resolve()
+    return pathlib.Path(plugin_path.parent, f'.{plugin_path.name}.catalog')
+
+
+def plugin_record(plugin: model.Plugin) -> PluginRecord:
+    """
+    Converts a Plugin to the nested tuple of built in types it is stored as in the cache file
+
+    :param plugin: the Plugin object to be converted
+    :type plugin: plugin_manager.model.plugin.Plugin
+    :return: a nested tuple holding the Plugin's properties
+    :rtype: PluginRecord
+
+    """
+    return (plugin.name, plugin.description, plugin.author_name, plugin.author_email,
+            tuple((menu.title, menu.module_name,
+                   tuple((item.title, item.entry_point_name, item.select_person, item.select_date_range,
+                          item.select_dp_type) for item in menu.items)) for menu in plugin.menus))
+
+
+def plugin_from_record(record: PluginRecord) -> model.Plugin:
+    """
+    Creates a Plugin from the nested tuple it is stored as in the cache file
+
+    :param record: a nested tuple created by plugin_record
+    :type record: PluginRecord
+    :return: the Plugin object
+    :rtype: plugin_manager.model.plugin.Plugin
+
+    """
+    name, description, author_name, author_email, menu_records = record
+    menus: list[model.PluginMenu] = []
+    for title, module_name, item_records in menu_records:
+        items: list[model.PluginMenuItem] = [model.PluginMenuItem(*item_record) for item_record in item_records]
+        menus.append(model.PluginMenu(title=title, module_name=module_name, items=items))
+    return model.Plugin(name=name, description=description, author_name=author_name, author_email=author_email,
+                        menus=menus)
+
+
+class CatalogCache:
+    """
+    An on-disk cache of the Plugin objects decoded from a plugin folder.  Each entry is keyed by file name and holds
+    the file's size, modification time and content hash, so a load only decodes files that were added or changed.
+    If the cache file is missing, corrupt or was written by a different cache version, every file is decoded.
+
+    The cache file is written with marshal and holds only built in types, so loading it does not run any code.
+
+    """
+    def __init__(self, plugin_path: pathlib.Path, cache_path: Optional[pathlib.Path] = None):
+        """
+        Creates an instance of CatalogCache
+
+        :param plugin_path: a Path object pointing to the folder containing the Plugin JSON files
+        :type plugin_path: pathlib.Path
+        :param cache_path: the path of the cache file, by default a hidden file next to the plugin folder
+        :type cache_path: Optional[pathlib.Path]
+
+        """
+        self.plugin_path: pathlib.Path = plugin_path
+        self.cache_path: pathlib.Path = cache_path if cache_path is not None else default_cache_path(plugin_path)
+        self.stats: CatalogLoadStats = CatalogLoadStats()
+
+    def read_entries(self) -> tuple[Optional[dict[str, CatalogEntry]], int]:
+        """
+        Read the entries from the cache file
+
+        :return: the cached entries keyed by file name, or None if the cache file is missing or can not be used, and
+            the time the cache was written in nanoseconds
+        :rtype: tuple[Optional[dict[str, CatalogEntry]], int]
+
+        """
+        try:
+            cache = marshal.loads(self.cache_path.read_bytes())
+            if not isinstance(cache, dict) or cache.get('version') != CACHE_VERSION:
+                return None, 0
+            entries: dict[str, CatalogEntry] = {}
+            for name, (size, mtime_ns, digest, record) in cache['entries'].items():
+                plugin: Optional[model.Plugin] = plugin_from_record(record) if record is not None else None
+                entries[name] = CatalogEntry(size=size, mtime_ns=mtime_ns, content_hash=digest, plugin=plugin)
+            return entries, int(cache['written_ns'])
+        except Exception:
+            # a missing, truncated or corrupt cache, or one with an unexpected layout, is discarded
+            return None, 0
+
+    def write_entries(self, entries: dict[str, CatalogEntry]) -> None:
+        """
+        Write the entries to the cache file.  The cache is written to a temporary file which is then renamed over
+        the cache file, so a reader never sees a partially written cache.  Writing the cache is best effort: if the
+        cache folder can not be written, the cache is left as it is.
+
+        :param entries: the entries keyed by file name
+        :type entries: dict[str, CatalogEntry]
+        :return: None
+
+        """
+        records: dict[str, tuple] = {}
+        for name, entry in entries.items():
+            record: Optional[PluginRecord] = plugin_record(entry.plugin) if entry.plugin is not None else None
+            records[name] = (entry.size, entry.mtime_ns, entry.content_hash, record)
+        temp_name: Optional[str] = None
+        try:
+            fd, temp_name = tempfile.mkstemp(dir=self.cache_path.parent, prefix=self.cache_path.name, suffix='.tmp')
+            with os.fdopen(fd, mode='wb') as cache_file:
+                os.chmod(temp_name, jh.replacement_mode(self.cache_path))
+                cache_file.write(marshal.dumps({'version': CACHE_VERSION, 'written_ns': time.time_ns(),
+                                                'entries': records}))
+            os.replace(temp_name, self.cache_path)
+        except OSError:
+            if temp_name is not None:
+                pathlib.Path(temp_name).unlink(missing_ok=True)
+
+    def load(self) -> list[model.Plugin]:
+        """
+        Return the Plugins in the plugin folder in sorted file path order, decoding only the files that were added
+        or changed since the cache was written.  A file whose size or modification time changed but whose contents
+        hash to the cached value is not decoded.  The outcome is recorded in the stats property.
+
+        :return: a list of Plugin objects
+        :rtype: list[plugin_manager.model.plugin.Plugin]
+
+        """
+        cached, written_ns = self.read_entries()
+        self.stats = CatalogLoadStats(full_load=cached is None)
+        if cached is None:
+            cached = {}
+        entries: dict[str, CatalogEntry] = {}
+        modified: bool = False
+        with os.scandir(self.plugin_path) as dir_entries:
+            json_entries: list[os.DirEntry] = sorted((dir_entry for dir_entry in dir_entries
+                                                      if dir_entry.name.endswith('.json') and dir_entry.is_file()),
+                                                     key=lambda dir_entry: dir_entry.name)
+        for dir_entry in json_entries:
+            json_path: pathlib.Path = pathlib.Path(dir_entry.path)
+            stat: os.stat_result = dir_entry.stat()
+            entry: Optional[CatalogEntry] = cached.get(json_path.name)
+            if entry is not None and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns and \
+                    stat.st_mtime_ns < written_ns - MTIME_RACE_NS:
+                entries[json_path.name] = entry
+                self.stats.reused += 1
+                continue
+            content: bytes = json_path.read_bytes()
+            digest: str = jh.content_hash(content)
+            if entry is not None and entry.content_hash == digest:
+                self.stats.reused += 1
+                plugin: Optional[model.Plugin] = entry.plugin
+                if entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+                    # rewriting the cache moves written_ns forward, so the file is only hashed again while it is
+                    # still within the race window
+                    entries[json_path.name] = entry
+                    self.stats.verified += 1
+                    modified = True
+                    continue
+            else:
+                self.stats.decoded += 1
+                self.stats.changed_files.append(json_path.name)
+                # valid JSON that does not hold a Plugin, such as a stray settings file, is cached as undecodable
+                plugin = jh.decode_plugin_text(content.decode())
+            entries[json_path.name] = CatalogEntry(size=stat.st_size, mtime_ns=stat.st_mtime_ns,
+                                                   content_hash=digest, plugin=plugin)
+            modified = True
+        self.stats.removed = len(cached.keys() - entries.keys())
+        if modified or self.stats.removed > 0:
+            self.write_entries(entries)
+        plugins: list[model.Plugin] = []
+        for name, entry in entries.items():
+            if entry.plugin is not None:
+                # the entry's attributes and hash describe the file, so saving an unchanged Plugin does not read it
+                entry.plugin.file_record = (os.path.abspath(pathlib.Path(self.plugin_path, name)), entry.content_hash,
+                                            entry.size, entry.mtime_ns)
+                plugins.append(entry.plugin)
+        return plugins
+
+
+def retrieve_plugins_cached(plugin_path: pathlib.Path, cache_path: Optional[pathlib.Path] = None) -> list[model.Plugin]:
+    """
+    Deserialize the Plugin objects encoded in the JSON files in the plugins folder, using a CatalogCache so that
+    only added or changed files are decoded
+
+    :param plugin_path: a Path object pointing to the folder containing the Plugin JSON files
+    :type plugin_path: pathlib.Path
+    :param cache_path: the path of the cache file, by default a hidden file next to the plugin folder
+    :type cache_path: Optional[pathlib.Path]
+    :return: a list of de-serialized Plugin objects
+    :rtype: list[plugin_manager.model.plugin.Plugin]
+
+    """
+    return CatalogCache(plugin_path, cache_path).load()
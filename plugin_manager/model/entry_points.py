@@ -0,0 +1,230 @@
+import ast
+from dataclasses import dataclass
+from importlib.machinery import ModuleSpec, PathFinder
+import os
+import pathlib
+import threading
+from typing import Optional
+
+import plugin_manager.model.finder as finder
+
+
+def find_module_source(module_name: str, search_path: Optional[list[str]] = None) -> Optional[pathlib.Path]:
+    """
+    Locate the source file of a module without importing it.  Each package named in module_name is located with
+    importlib.machinery.PathFinder, using the search locations of the package before it, so no package __init__
+    module is executed.  Modules in sys.modules are not consulted.  If no search path is provided, any installed
+    plugin_manager.model.finder.PluginModuleFinder is consulted first.
+
+    :param module_name: the dotted name of the module
+    :type module_name: str
+    :param search_path: the folders to search for the module's top level package, by default sys.path
+    :type search_path: Optional[list[str]]
+    :return: the path of the module's .py file, or None if the module can not be found or is not a source module
+    :rtype: Optional[pathlib.Path]
+
+    """
+    if len(module_name.strip()) == 0:
+        return None
+    if search_path is None:
+        for plugin_finder in finder.installed_finders():
+            source_path: Optional[pathlib.Path] = plugin_finder.module_path(module_name.strip())
+            if source_path is not None:
+                return source_path if source_path.suffix == '.py' else None
+    spec: Optional[ModuleSpec] = None
+    locations: Optional[list[str]] = search_path
+    parts: list[str] = module_name.strip().split('.')
+    for part_idx in range(0, len(parts)):
+        if part_idx > 0:
+            if spec.submodule_search_locations is None:
+                return None
+            locations = list(spec.submodule_search_locations)
+        try:
+            spec = PathFinder.find_spec('.'.join(parts[0:part_idx + 1]), locations)
+        except (ImportError, ValueError):
+            return None
+        if spec is None:
+            return None
+    if spec.origin is None or not spec.origin.endswith('.py'):
+        return None
+    return pathlib.Path(spec.origin)
+
+
+def parse_entry_points(source: str) -> list[str]:
+    """
+    List the names that may be bound to functions at the top level of a module's source: the functions, including
+    async functions, it defines, the names it imports with from ... import, so re-exported entry points are listed,
+    and the names it assigns from another name, an attribute, a call or a lambda, such as report = _report_impl.
+    Names bound to literals and imported modules are not listed.
+
+    :param source: the module's source code
+    :type source: str
+    :return: the names in the order they are first bound
+    :rtype: list[str]
+
+    """
+    names: list[str] = []
+    for node in ast.parse(source).body:
+        bound: list[str] = []
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            bound = [node.name]
+        elif isinstance(node, ast.ImportFrom):
+            bound = [alias.asname or alias.name for alias in node.names if alias.name != '*']
+        elif isinstance(node, ast.Assign) and isinstance(node.value, (ast.Name, ast.Attribute, ast.Call, ast.Lambda)):
+            bound = [target.id for target in node.targets if isinstance(target, ast.Name)]
+        for name in bound:
+            if name not in names:
+                names.append(name)
+    return names
+
+
+@dataclass
+class SourceEntry:
+    """
+    The entry points discovered in a module source file, along with the file attributes used to determine whether
+    the file has changed since it was parsed
+
+    :param mtime_ns: the modification time of the file in nanoseconds
+    :type mtime_ns: int
+    :param size: the size of the file in bytes
+    :type size: int
+    :param entry_points: the names listed by parse_entry_points, or None if the file could not be parsed
+    :type entry_points: Optional[list[str]]
+
+    """
+    mtime_ns: int
+    size: int
+    entry_points: Optional[list[str]]
+
+
+class EntryPointDiscovery:
+    """
+    Lists the candidate entry points of plugin modules by parsing their source with the ast module, so plugin code is
+    never executed.  Results are cached by source file path and are parsed again only when the file's modification
+    time or size changes.  The source file found for each module name is remembered, so cached_entry_points can
+    answer for a module without searching for it.  EntryPointDiscovery instances are thread safe.
+
+    """
+    def __init__(self, search_path: Optional[list[str]] = None):
+        """
+        Creates an instance of EntryPointDiscovery
+
+        :param search_path: the folders to search for plugin modules, by default sys.path
+        :type search_path: Optional[list[str]]
+
+        """
+        self.search_path: Optional[list[str]] = search_path
+        self.lock = threading.Lock()
+        self.sources: dict[pathlib.Path, SourceEntry] = {}
+        self.module_sources: dict[str, pathlib.Path] = {}
+        self.parse_count: int = 0
+
+    def file_entry_points(self, source_path: pathlib.Path) -> Optional[list[str]]:
+        """
+        List the candidate entry points of a source file, as found by parse_entry_points
+
+        :param source_path: the path of the module's .py file
+        :type source_path: pathlib.Path
+        :return: the names in the order they are bound, or None if the file can not be read or parsed
+        :rtype: Optional[list[str]]
+
+        """
+        try:
+            stat: os.stat_result = source_path.stat()
+        except OSError:
+            with self.lock:
+                self.sources.pop(source_path, None)
+            return None
+        with self.lock:
+            entry: Optional[SourceEntry] = self.sources.get(source_path)
+        if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            return entry.entry_points
+        try:
+            entry_points: Optional[list[str]] = parse_entry_points(source_path.read_bytes().decode())
+        except (OSError, SyntaxError, ValueError):
+            entry_points = None
+        with self.lock:
+            self.sources[source_path] = SourceEntry(mtime_ns=stat.st_mtime_ns, size=stat.st_size,
+                                                    entry_points=entry_points)
+            self.parse_count += 1
+        return entry_points
+
+    def entry_points(self, module_name: str) -> Optional[list[str]]:
+        """
+        List the candidate entry points of a plugin module, without importing it
+
+        :param module_name: the dotted name of the module
+        :type module_name: str
+        :return: the names in the order they are bound, or None if the module can not be found or parsed
+        :rtype: Optional[list[str]]
+
+        """
+        source_path: Optional[pathlib.Path] = find_module_source(module_name, self.search_path)
+        with self.lock:
+            if source_path is None:
+                self.module_sources.pop(module_name, None)
+            else:
+                self.module_sources[module_name] = source_path
+        if source_path is None:
+            return None
+        return self.file_entry_points(source_path)
+
+    def cached_entry_points(self, module_name: str) -> Optional[list[str]]:
+        """
+        List the candidate entry points of a plugin module if they are already cached and the module's source
+        file has not changed since it was parsed.  The module is not searched for and its source is not parsed, so
+        the cost is one stat call.
+
+        :param module_name: the dotted name of the module
+        :type module_name: str
+        :return: the names in the order they are bound, or None if they are not cached or are out of date
+        :rtype: Optional[list[str]]
+
+        """
+        with self.lock:
+            source_path: Optional[pathlib.Path] = self.module_sources.get(module_name)
+            entry: Optional[SourceEntry] = self.sources.get(source_path) if source_path is not None else None
+        if entry is None or entry.entry_points is None:
+            return None
+        try:
+            stat: os.stat_result = source_path.stat()
+        except OSError:
+            return None
+        if entry.mtime_ns != stat.st_mtime_ns or entry.size != stat.st_size:
+            return None
+        return entry.entry_points
+
+    def has_entry_point(self, module_name: str, entry_point_name: str) -> bool:
+        """
+        Check whether a candidate entry point with the provided name is bound at the top level of a plugin module
+
+        :param module_name: the dotted name of the module
+        :type module_name: str
+        :param entry_point_name: the name of the entry point
+        :type entry_point_name: str
+        :return: True if the name is bound
+        :rtype: bool
+
+        """
+        entry_points: Optional[list[str]] = self.entry_points(module_name)
+        return entry_points is not None and entry_point_name in entry_points
+
+    def invalidate(self, source_path: Optional[pathlib.Path] = None) -> None:
+        """
+        Discard the cached entry points of a source file, or of every file if no path is provided
+
+        :param source_path: the path of the module's .py file, or None to discard every cached file
+        :type source_path: Optional[pathlib.Path]
+        :return: None
+
+        """
+        with self.lock:
+            if source_path is None:
+                self.sources.clear()
+                self.module_sources.clear()
+            else:
+                self.sources.pop(source_path, None)
+
+
+# the EntryPointDiscovery used by the plugin editor widgets
+default_discovery: EntryPointDiscovery = EntryPointDiscovery()
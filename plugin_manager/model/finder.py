@@ -0,0 +1,188 @@
+from importlib.abc import MetaPathFinder
+from importlib.machinery import ModuleSpec
+import importlib.util
+import os
+import pathlib
+import sys
+import threading
+from typing import Optional, Sequence, Union
+
+# the top level names that are never claimed, so a plugin module can not shadow a built in or standard library module.
+# sys.stdlib_module_names is available from Python 3.10.
+RESERVED_NAMES: frozenset[str] = frozenset(sys.builtin_module_names) | \
+    frozenset(getattr(sys, 'stdlib_module_names', ()))
+
+class PluginModuleFinder(MetaPathFinder):
+    """
+    A meta path finder that locates plugin modules through an index of the configured plugin root folders, rather
+    than by searching every sys.path entry.  Each folder is scanned once, and is scanned again only when its
+    modification time changes, so finding a plugin module takes a stat of the folder it lives in rather than a stat
+    of every sys.path entry.  The finder is installed ahead of the default finders, but only claims the names found
+    in the plugin roots, and never a built in or standard library module name, so modules that are not in the plugin
+    roots are left to the default finders and are not shadowed.
+
+    Only regular packages, folders containing an __init__.py file, are indexed.
+
+    """
+    def __init__(self, roots: Sequence[Union[pathlib.Path, str]]):
+        """
+        Creates an instance of PluginModuleFinder
+
+        :param roots: the folders containing plugin modules and packages, in search order
+        :type roots: Sequence[Union[pathlib.Path, str]]
+
+        """
+        self.roots: list[str] = [os.path.abspath(root) for root in roots]
+        self.lock = threading.Lock()
+        # the modification time of each scanned folder, and the modules and packages it contains
+        self.folders: dict[str, tuple[int, dict[str, tuple[str, bool]]]] = {}
+        self.scan_count: int = 0
+
+    def folder_index(self, folder: str) -> dict[str, tuple[str, bool]]:
+        """
+        Returns the modules and packages in a folder, scanning the folder if it has not been scanned or its
+        modification time has changed
+
+        :param folder: the folder's path
+        :type folder: str
+        :return: the path of each module's .py file, or package's __init__.py file, and whether it is a package, keyed
+            by module name
+        :rtype: dict[str, tuple[str, bool]]
+
+        """
+        try:
+            mtime_ns: int = os.stat(folder).st_mtime_ns
+        except OSError:
+            with self.lock:
+                self.folders.pop(folder, None)
+            return {}
+        scanned: Optional[tuple[int, dict[str, tuple[str, bool]]]] = self.folders.get(folder)
+        if scanned is not None and scanned[0] == mtime_ns:
+            return scanned[1]
+        index: dict[str, tuple[str, bool]] = {}
+        try:
+            with os.scandir(folder) as dir_entries:
+                for dir_entry in dir_entries:
+                    if dir_entry.name.endswith('.py') and dir_entry.is_file():
+                        index.setdefault(dir_entry.name[:-3], (dir_entry.path, False))
+                    elif dir_entry.name.isidentifier() and dir_entry.is_dir():
+                        init_path: str = os.path.join(dir_entry.path, '__init__.py')
+                        if os.path.isfile(init_path):
+                            # a package takes precedence over a module of the same name, as it does for FileFinder
+                            index[dir_entry.name] = (init_path, True)
+        except OSError:
+            index = {}
+        with self.lock:
+            self.folders[folder] = (mtime_ns, index)
+            self.scan_count += 1
+        return index
+
+    def locate(self, fullname: str) -> Optional[tuple[str, bool]]:
+        """
+        Locate a plugin module by name
+
+        :param fullname: the dotted name of the module
+        :type fullname: str
+        :return: the path of the module's .py file, or package's __init__.py file, and whether it is a package, or
+            None if the module is not in the plugin roots
+        :rtype: Optional[tuple[str, bool]]
+
+        """
+        parts: list[str] = fullname.split('.')
+        if parts[0] in RESERVED_NAMES:
+            return None
+        for root in self.roots:
+            location: Optional[tuple[str, bool]] = self.folder_index(root).get(parts[0])
+            if location is not None:
+                break
+        else:
+            return None
+        for part in parts[1:]:
+            path, is_package = location
+            if not is_package:
+                return None
+            location = self.folder_index(os.path.dirname(path)).get(part)
+            if location is None:
+                return None
+        return location
+
+    def module_path(self, fullname: str) -> Optional[pathlib.Path]:
+        """
+        Returns the path of a plugin module's source file, without importing the module
+
+        :param fullname: the dotted name of the module
+        :type fullname: str
+        :return: the path of the module's .py file, or None if the module is not in the plugin roots
+        :rtype: Optional[pathlib.Path]
+
+        """
+        location: Optional[tuple[str, bool]] = self.locate(fullname)
+        return pathlib.Path(location[0]) if location is not None else None
+
+    def find_spec(self, fullname: str, path: Optional[Sequence[str]] = None, target=None) -> Optional[ModuleSpec]:
+        """
+        Returns a module spec for a plugin module, or None if the module is not in the plugin roots.  A submodule is
+        only claimed if its parent package was found in the plugin roots.
+
+        :param fullname: the dotted name of the module
+        :type fullname: str
+        :param path: the search locations of the parent package, or None for a top level module
+        :type path: Optional[Sequence[str]]
+        :param target: unused
+        :return: the module's spec, or None
+        :rtype: Optional[importlib.machinery.ModuleSpec]
+
+        """
+        location: Optional[tuple[str, bool]] = self.locate(fullname)
+        if location is None:
+            return None
+        module_path, is_package = location
+        folder: str = os.path.dirname(os.path.dirname(module_path)) if is_package else os.path.dirname(module_path)
+        if path is not None and folder not in path:
+            return None
+        search_locations: Optional[list[str]] = [os.path.dirname(module_path)] if is_package else None
+        return importlib.util.spec_from_file_location(fullname, module_path,
+                                                      submodule_search_locations=search_locations)
+
+    def invalidate_caches(self) -> None:
+        """
+        Discard the folder index, so every folder is scanned again.  Invoked by importlib.invalidate_caches.
+
+        :return: None
+
+        """
+        with self.lock:
+            self.folders.clear()
+
+    def install(self) -> 'PluginModuleFinder':
+        """
+        Insert the finder at the front of sys.meta_path, ahead of the default finders
+
+        :return: this PluginModuleFinder
+        :rtype: plugin_manager.model.finder.PluginModuleFinder
+
+        """
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+        return self
+
+    def uninstall(self) -> None:
+        """
+        Remove the finder from sys.meta_path
+
+        :return: None
+
+        """
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+
+def installed_finders() -> list[PluginModuleFinder]:
+    """
+    Returns the PluginModuleFinders that are installed in sys.meta_path
+
+    :return: a list of PluginModuleFinder objects
+    :rtype: list[plugin_manager.model.finder.PluginModuleFinder]
+
+    """
+    return [finder for finder in sys.meta_path if isinstance(finder, PluginModuleFinder)]
@@ -1,59 +1,566 @@
+from concurrent import futures
+from dataclasses import dataclass, field
+import hashlib
 import json
+import os
 import pathlib
-from typing import Any, Union
+import stat
+import tempfile
+from typing import Any, Iterator, Optional, Union
 
 import plugin_manager.model.plugin as model
 
+JSON_FORMAT: int = 2
+# the number of characters read at a time by read_plugin_header
+HEADER_CHUNK_SIZE: int = 4096
 
-def retrieve_plugins(plugin_path: pathlib.Path) -> list[model.Plugin]:
+
+@dataclass
+class SaveSummary:
+    """
+    Reports the outcome of a save_plugins call
+
+    :param written: the files that were written because their contents changed
+    :type written: list[pathlib.Path]
+    :param unchanged: the files that were skipped because they already held the serialized Plugin
+    :type unchanged: list[pathlib.Path]
+
+    """
+    written: list[pathlib.Path] = field(default_factory=list)
+    unchanged: list[pathlib.Path] = field(default_factory=list)
+
+
+@dataclass
+class PluginHeader:
+    """
+    The general info of a Plugin JSON file, read without decoding its menus
+
+    :param json_path: the path of the file
+    :type json_path: pathlib.Path
+    :param name: the Plugin name
+    :type name: str
+    :param description: the Plugin description
+    :type description: str
+    :param author_name: the Plugin author's name
+    :type author_name: str
+    :param author_email: the Plugin author's email
+    :type author_email: str
+    :param menu_count: the number of menus in the Plugin
+    :type menu_count: int
+
+    """
+    json_path: pathlib.Path
+    name: str
+    description: str
+    author_name: str
+    author_email: str
+    menu_count: int
+
+
+def content_hash(content: Union[str, bytes]) -> str:
+    """
+    Returns the hash used to detect changes to the contents of a Plugin JSON file
+
+    :param content: the file contents
+    :type content: Union[str, bytes]
+    :return: a hex digest of the contents
+    :rtype: str
+
+    """
+    if isinstance(content, str):
+        content = content.encode()
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def decode_plugin_json(json_str: str) -> Any:
+    """
+    Decode the contents of a Plugin JSON file.  Format 2 files hold a single nested JSON document and are decoded in
+    one pass.  Format 1 files hold a JSON string whose value is the encoded Plugin, with the menu and item lists
+    nested as JSON strings, so if the first pass produces a str it is decoded a second time.
+
+    :param json_str: the contents of a Plugin JSON file
+    :type json_str: str
+    :return: the decoded object, normally a Plugin instance
+    :rtype: Any
+
+    """
+    obj = json.loads(json_str, object_hook=plugin_object_hook)
+    if isinstance(obj, str):
+        obj = json.loads(obj, object_hook=plugin_object_hook)
+    return obj
+
+
+def plugin_file_name(plugin: model.Plugin) -> str:
+    """
+    Returns the name of the JSON file a Plugin is saved to, which is based on the Plugin.name and author_name properties
+
+    :param plugin: a Plugin object
+    :type plugin: plugin_manager.model.plugin.Plugin
+    :return: the file name
+    :rtype: str
+
+    """
+    return f'{plugin.author_name.replace(" ", "_")}-{plugin.name.replace(" ","_")}.json'
+
+
+def plugin_files(plugin_path: pathlib.Path) -> list[pathlib.Path]:
+    """
+    Returns the paths of the JSON files in the plugins folder, sorted by path
+
+    :param plugin_path: a Path object pointing to the folder containing the Plugin JSON files
+    :type plugin_path: pathlib.Path
+    :return: a sorted list of JSON file paths
+    :rtype: list[pathlib.Path]
+
+    """
+    return sorted(json_path for json_path in plugin_path.glob('*.json') if json_path.is_file())
+
+
+def read_plugin_contents(json_path: pathlib.Path) -> tuple[str, tuple[str, str, int, int]]:
+    """
+    Read the contents of a Plugin JSON file, along with the file record kept by the Plugin decoded from them.  The
+    file is examined before it is read, so a change made while it is read is seen by the next save.
+
+    :param json_path: a Path object for the file to be read
+    :type json_path: pathlib.Path
+    :return: the contents of the file, and its absolute path, content hash, size and modification time
+    :rtype: tuple[str, tuple[str, str, int, int]]
+
+    """
+    with json_path.open(mode='r') as pj:
+        file_stat: os.stat_result = os.fstat(pj.fileno())
+        json_str: str = pj.read()
+    return json_str, (os.path.abspath(json_path), content_hash(json_str), file_stat.st_size, file_stat.st_mtime_ns)
+
+
+def record_file(plugin: model.Plugin, json_path: pathlib.Path, digest: str) -> None:
+    """
+    Record on a Plugin that it was just written to a JSON file
+
+    :param plugin: the written Plugin
+    :type plugin: plugin_manager.model.plugin.Plugin
+    :param json_path: a Path object for the written file
+    :type json_path: pathlib.Path
+    :param digest: the hash of the written contents, as returned by content_hash
+    :type digest: str
+    :return: None
+
+    """
+    file_stat: os.stat_result = os.stat(json_path)
+    plugin.file_record = (os.path.abspath(json_path), digest, file_stat.st_size, file_stat.st_mtime_ns)
+
+
+def holds_contents(plugin: model.Plugin, json_path: pathlib.Path, digest: str) -> bool:
+    """
+    Returns True if a JSON file still holds the contents with the provided hash: the Plugin was last read from or
+    written to the file with those contents, and the file's size and modification time have not changed since.
+    The file's contents are not read.
+
+    :param plugin: the Plugin being saved
+    :type plugin: plugin_manager.model.plugin.Plugin
+    :param json_path: a Path object for the file
+    :type json_path: pathlib.Path
+    :param digest: the hash of the Plugin's serialized contents, as returned by content_hash
+    :type digest: str
+    :return: True if the file holds the contents
+    :rtype: bool
+
+    """
+    record: Optional[tuple[str, str, int, int]] = plugin.file_record
+    if record is None or record[0] != os.path.abspath(json_path) or record[1] != digest:
+        return False
+    try:
+        file_stat: os.stat_result = os.stat(json_path)
+    except OSError:
+        return False
+    return (file_stat.st_size, file_stat.st_mtime_ns) == record[2:]
+
+
+def read_plugin_file(json_path: pathlib.Path) -> str:
+    """
+    Read the contents of a Plugin JSON file
+
+    :param json_path: a Path object for the file to be read
+    :type json_path: pathlib.Path
+    :return: the contents of the file
+    :rtype: str
+
+    """
+    with json_path.open(mode='r') as pj:
+        return pj.read()
+
+
+def decode_plugin_text(json_str: str) -> Optional[model.Plugin]:
+    """
+    Decode the contents of a Plugin JSON file, returning None if the contents can not be decoded or do not encode a
+    Plugin. This function can be run in a worker process.
+
+    :param json_str: the contents of a Plugin JSON file
+    :type json_str: str
+    :return: the decoded Plugin object or None
+    :rtype: Optional[plugin_manager.model.plugin.Plugin]
+
+    """
+    try:
+        decoded = decode_plugin_json(json_str)
+    except json.JSONDecodeError:
+        return None
+    return decoded if isinstance(decoded, model.Plugin) else None
+
+
+def decode_plugin_file(json_path: pathlib.Path) -> Optional[model.Plugin]:
+    """
+    Read and decode a Plugin JSON file, returning None if the contents can not be decoded.  The decoded Plugin
+    records the file it was read from.
+
+    :param json_path: a Path object for the file to be read
+    :type json_path: pathlib.Path
+    :return: the decoded Plugin object or None
+    :rtype: Optional[plugin_manager.model.plugin.Plugin]
+
+    """
+    json_str, record = read_plugin_contents(json_path)
+    plugin: Optional[model.Plugin] = decode_plugin_text(json_str)
+    if plugin is not None:
+        plugin.file_record = record
+    return plugin
+
+
+def read_plugin_header(json_path: pathlib.Path) -> Optional[PluginHeader]:
     """
-    Deserialize the Plugin objects encoded in JSON file in the plugins folder
+    Read the general info of a Plugin JSON file without decoding its menus.  Format 2 files written with a
+    menu_count field are read incrementally, in HEADER_CHUNK_SIZE pieces, and reading stops at the menus field, so
+    the cost does not depend on the size of the Plugin.  Other files are decoded in full.
+
+    :param json_path: a Path object for the file to be read
+    :type json_path: pathlib.Path
+    :return: the file's header, or None if the file does not contain a Plugin
+    :rtype: Optional[PluginHeader]
+
+    """
+    decoder = json.JSONDecoder()
+    fields: dict[str, Any] = {}
+    with open(json_path, mode='r') as pj:
+        buffer: str = pj.read(HEADER_CHUNK_SIZE)
+        at_end: bool = len(buffer) < HEADER_CHUNK_SIZE
+
+        def skip_space(pos: int) -> int:
+            # move pos to the next non whitespace character, reading more of the file if needed
+            nonlocal buffer, at_end
+            while True:
+                while pos < len(buffer) and buffer[pos].isspace():
+                    pos += 1
+                if pos < len(buffer) or at_end:
+                    return pos
+                chunk: str = pj.read(HEADER_CHUNK_SIZE)
+                at_end = len(chunk) < HEADER_CHUNK_SIZE
+                buffer += chunk
+
+        def decode_at(pos: int) -> tuple[Any, int]:
+            # decode the scalar JSON value at pos, reading more of the file until the value is complete
+            nonlocal buffer, at_end
+            while True:
+                pos = skip_space(pos)
+                if buffer[pos:pos + 1] in ('{', '['):
+                    raise ValueError('Nested values are not read as header fields')
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                    # a number ending with the buffer may continue in the next chunk
+                    if end < len(buffer) or at_end:
+                        return value, end
+                except json.JSONDecodeError:
+                    if at_end:
+                        raise
+                chunk: str = pj.read(HEADER_CHUNK_SIZE)
+                at_end = len(chunk) < HEADER_CHUNK_SIZE
+                buffer += chunk
+
+        try:
+            pos: int = skip_space(0)
+            if buffer[pos] != '{':
+                raise ValueError('Not a JSON object')
+            pos += 1
+            while True:
+                key, pos = decode_at(pos)
+                pos = skip_space(pos)
+                if buffer[pos] != ':':
+                    raise ValueError('Expected a field separator')
+                if key == 'menus':
+                    break
+                value, pos = decode_at(pos + 1)
+                fields[key] = value
+                pos = skip_space(pos)
+                if buffer[pos] != ',':
+                    break
+                pos += 1
+        except (ValueError, IndexError):
+            fields = {}
+    if 'menu_count' not in fields or fields.get('class', model.Plugin.__name__) != model.Plugin.__name__:
+        plugin: Optional[model.Plugin] = decode_plugin_file(json_path)
+        if not isinstance(plugin, model.Plugin):
+            return None
+        return PluginHeader(json_path=pathlib.Path(json_path), name=plugin.name, description=plugin.description,
+                            author_name=plugin.author_name, author_email=plugin.author_email,
+                            menu_count=len(plugin.menus))
+    return PluginHeader(json_path=pathlib.Path(json_path), name=fields.get('name', ''),
+                        description=fields.get('description', ''), author_name=fields.get('author_name', ''),
+                        author_email=fields.get('author_email', ''), menu_count=fields['menu_count'])
+
+
+def read_plugin_headers(plugin_path: pathlib.Path) -> list[PluginHeader]:
+    """
+    Read the headers of the Plugin JSON files in the plugins folder, in sorted path order.  Files that do not
+    contain a Plugin are skipped.
+
+    :param plugin_path: a Path object pointing to the folder containing the Plugin JSON files
+    :type plugin_path: pathlib.Path
+    :return: the headers
+    :rtype: list[PluginHeader]
+
+    """
+    headers: list[PluginHeader] = []
+    for json_path in plugin_files(plugin_path):
+        try:
+            header: Optional[PluginHeader] = read_plugin_header(json_path)
+        except (OSError, ValueError):
+            continue
+        if header is not None:
+            headers.append(header)
+    return headers
+
+
+def iter_plugins(plugin_path: pathlib.Path, sort: bool = False) -> Iterator[model.Plugin]:
+    """
+    Deserialize the Plugin objects encoded in the JSON files in the plugins folder, yielding one Plugin at a time.
+    Unless sort is True the folder is scanned lazily and only one file's contents are held at a time, so peak memory
+    is bounded by the largest single file rather than the size of the folder.  Files that can not be decoded are
+    skipped, as are JSON files that do not encode a Plugin.
+
+    :param plugin_path: a Path object pointing to the folder containing the Plugin JSON files
+    :type: pathlib.Path
+    :param sort: if True, the files are read in sorted path order, otherwise in directory order
+    :type sort: bool
+    :return: an iterator of de-serialized Plugin objects
+    :rtype: Iterator[model.Plugin]
+
+    """
+    if sort:
+        for json_path in plugin_files(plugin_path):
+            plugin: Optional[model.Plugin] = decode_plugin_file(json_path)
+            if isinstance(plugin, model.Plugin):
+                yield plugin
+        return
+    with os.scandir(plugin_path) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.json') or not entry.is_file():
+                continue
+            plugin = decode_plugin_file(pathlib.Path(entry.path))
+            if isinstance(plugin, model.Plugin):
+                yield plugin
+
+
+def retrieve_plugins(plugin_path: pathlib.Path, max_workers: Optional[int] = None,
+                     decode_processes: Optional[int] = None) -> list[model.Plugin]:
+    """
+    Deserialize the Plugin objects encoded in JSON file in the plugins folder.  The Plugins are returned in sorted
+    file path order.  If max_workers is provided, the files are read on a thread pool of that size, so the file I/O
+    overlaps.  If decode_processes is also provided, the JSON decoding is done on a process pool of that size.
 
     :param plugin_path: a Path object pointing to the folder containing the Plugin JSON files
     :type: pathlib.Path
+    :param max_workers: the number of threads used to read the files, or None to read them serially
+    :type max_workers: Optional[int]
+    :param decode_processes: the number of processes used to decode the files, or None to decode them on the reading
+        threads
+    :type decode_processes: Optional[int]
     :return: a list of de-serialized Plugin objects
     :rtype: list[model.PluginMenu]
 
     """
-    plugins: list[model.Plugin] = []
-    for plugin_json in plugin_path.glob('*.json'):
+    if max_workers is None:
+        return list(iter_plugins(plugin_path, sort=True))
+    json_paths: list[pathlib.Path] = plugin_files(plugin_path)
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as thread_pool:
+        if decode_processes is None:
+            decoded = list(thread_pool.map(decode_plugin_file, json_paths))
+        else:
+            chunksize: int = max(1, len(json_paths) // (decode_processes * 4))
+            contents: list[tuple[str, tuple[str, str, int, int]]] = list(thread_pool.map(read_plugin_contents,
+                                                                                          json_paths))
+            with futures.ProcessPoolExecutor(max_workers=decode_processes) as process_pool:
+                decoded = list(process_pool.map(decode_plugin_text, [json_str for json_str, record in contents],
+                                                chunksize=chunksize))
+            for plugin, (json_str, record) in zip(decoded, contents):
+                if plugin is not None:
+                    plugin.file_record = record
+    return [plugin for plugin in decoded if isinstance(plugin, model.Plugin)]
+
+
+def replacement_mode(target_path: Union[pathlib.Path, str]) -> int:
+    """
+    Returns the permission bits for a temporary file that will be renamed over the target file.  The target's mode is
+    kept if it exists, and otherwise a new file gets the mode open would give it under the process umask, since
+    tempfile.mkstemp creates files readable only by their owner.
+
+    :param target_path: the path of the file to be replaced
+    :type target_path: Union[pathlib.Path, str]
+    :return: the permission bits
+    :rtype: int
+
+    """
+    try:
+        return stat.S_IMODE(os.stat(target_path).st_mode)
+    except FileNotFoundError:
+        umask: int = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def write_plugin_files(json_files: dict[pathlib.Path, str]) -> None:
+    """
+    Write the provided contents to Plugin JSON files without leaving a partially written file if the process is
+    interrupted.  Each file is written to a temporary file in the same folder and flushed to disk, then the temporary
+    files are renamed into place and each folder is synced once, after all of its files have been renamed.  A
+    replaced file keeps its permissions.
+
+    :param json_files: the contents to be written, keyed by file path
+    :type json_files: dict[pathlib.Path, str]
+    :return: None
+
+    """
+    by_folder: dict[pathlib.Path, list[tuple[pathlib.Path, str]]] = {}
+    for json_path, json_str in json_files.items():
+        by_folder.setdefault(json_path.parent, []).append((json_path, json_str))
+    for folder, folder_files in by_folder.items():
+        renames: list[tuple[str, pathlib.Path]] = []
         try:
-            with plugin_json.open(mode='r') as pj:
-                json_str = pj.read()
-                plugin: model.Plugin = json.loads(eval(json_str), object_hook=plugin_object_hook)
-                plugins.append(plugin)
-        except json.JSONDecodeError:
-            pass
-    return plugins
+            for json_path, json_str in folder_files:
+                fd, temp_name = tempfile.mkstemp(dir=folder, prefix=f'.{json_path.name}', suffix='.tmp')
+                renames.append((temp_name, json_path))
+                os.chmod(temp_name, replacement_mode(json_path))
+                with os.fdopen(fd, mode='w') as pj:
+                    pj.write(json_str)
+                    pj.flush()
+                    os.fsync(pj.fileno())
+            for temp_name, json_path in renames:
+                os.replace(temp_name, json_path)
+        except BaseException:
+            for temp_name, _ in renames:
+                pathlib.Path(temp_name).unlink(missing_ok=True)
+            raise
+        if hasattr(os, 'O_DIRECTORY'):
+            dir_fd = os.open(folder, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
 
 
-def save_plugins(plugins: list[model.Plugin], plugin_path: pathlib.Path):
+def save_plugins(plugins: list[model.Plugin], plugin_path: pathlib.Path) -> SaveSummary:
     """
-    Serialize a list of Plugin instances to JSON files.  The file names are based on the Plugin.name and author_name properties
+    Serialize a list of Plugin instances to JSON files.  The file names are based on the Plugin.name and author_name
+    properties.  A Plugin is not rewritten if its serialized contents hash the same as the contents of the file it
+    was last read from or written to, and the file's size and modification time have not changed since, so hosts
+    watching the plugin folder only see the files that actually changed.  Only the attributes of the files are read
+    to decide this.  Changed files are written by write_plugin_files, so a crash part way through never leaves a
+    truncated file.
 
     :param plugins: a list of Plugin objects
     :type plugins: list[plugin_manager.model.plugin.Plugin]
     :param plugin_path: a Path object pointing to the plugin folder
     :type plugin_path: pathlib.Path
-    :return: None
+    :return: a summary of the files written and skipped
+    :rtype: SaveSummary
     """
+    summary = SaveSummary()
+    json_files: dict[pathlib.Path, str] = {}
+    written: list[tuple[model.Plugin, pathlib.Path, str]] = []
     for plugin in plugins:
         if isinstance(plugin, model.Plugin):
             json_str = json.dumps(plugin, cls=PluginJSONEncoder)
-            with pathlib.Path(plugin_path,
-                              f'{plugin.author_name.replace(" ", "_")}-{plugin.name.replace(" ","_")}.json').open(mode='w') as pj:
-                pj.write(json_str)
+            json_path = pathlib.Path(plugin_path, plugin_file_name(plugin))
+            digest: str = content_hash(json_str)
+            if holds_contents(plugin, json_path, digest):
+                summary.unchanged.append(json_path)
+            else:
+                json_files[json_path] = json_str
+                written.append((plugin, json_path, digest))
+                summary.written.append(json_path)
         else:
             raise TypeError(f'{plugin.__str__()} is not a valid plugin_manager.model.Plugin object')
+    write_plugin_files(json_files)
+    for plugin, json_path, digest in written:
+        record_file(plugin, json_path, digest)
+    return summary
+
 
+def decode_bool(bool_value: Union[str, bool]) -> bool:
+    if isinstance(bool_value, bool):
+        return bool_value
+    return bool_value in ['true', 'True']
 
-def decode_bool(bool_str: str) -> bool:
-    return bool_str in ['true', 'True']
+
+def decode_list(list_value: Union[str, list]) -> list:
+    """
+    Format 1 files store the PluginMenu items and Plugin menus lists as JSON strings nested inside the parent object,
+    format 2 files store them as plain JSON arrays
+
+    :param list_value: a list, or a JSON string encoding a list
+    :type list_value: Union[str, list]
+    :return: the decoded list
+    :rtype: list
+
+    """
+    if isinstance(list_value, str):
+        return json.loads(list_value, object_hook=plugin_object_hook)
+    return list_value
 
 
 class PluginJSONEncoder(json.JSONEncoder):
     """
-    Implements a custom json.JSONEncoder to encode instances of Plugin, PluginMenu and PluginMenuItem instances
+    Implements a custom json.JSONEncoder to encode instances of Plugin, PluginMenu and PluginMenuItem instances.  Each
+    object is returned as a dict, so the whole Plugin is written as a single nested JSON document (format 2).  The
+    Plugin's general info and menu count are written ahead of its menus, so read_plugin_header can stop reading there.
+
+    """
+    def default(self, obj: Any):
+        """
+        This method is invoked to handle data types that can't be handled by the standard JSONEncoder
+
+        :param obj:
+        :return: Any
+        """
+        match obj.__class__.__name__:
+            case model.PluginMenuItem.__name__:
+                return {'title': obj.title,
+                        'entry_point': obj.entry_point_name,
+                        'select_person': obj.select_person,
+                        'select_date_range': obj.select_date_range,
+                        'select_dp_type': obj.select_dp_type,
+                        'class': model.PluginMenuItem.__name__}
+            case model.PluginMenu.__name__:
+                return {'title': obj.title,
+                        'module': obj.module_name,
+                        'items': obj.items,
+                        'class': obj.__class__.__name__}
+            case model.Plugin.__name__:
+                return {'format': JSON_FORMAT,
+                        'name': obj.name,
+                        'description': obj.description,
+                        'author_name': obj.author_name,
+                        'author_email': obj.author_email,
+                        'menu_count': len(obj.menus),
+                        'menus': obj.menus,
+                        'class': obj.__class__.__name__}
+            #  no match, revert to the standard encoder
+            case _:
+                return json.JSONEncoder.default(self, obj)
+
+
+class PluginJSONEncoderV1(json.JSONEncoder):
+    """
+    The format 1 encoder.  Each level is encoded as a separate JSON string and embedded as a string field in its
+    parent.  It is retained so that files can still be written for older readers.
 
     """
     def default(self, obj: Any):
@@ -73,14 +580,14 @@ class PluginJSONEncoder(json.JSONEncoder):
                                                       'class': model.PluginMenuItem.__name__})
                 return json_str
             case model.PluginMenu.__name__:
-                list_str = f'[{",".join([PluginJSONEncoder().default(item) for item in obj.items])}]'
+                list_str = f'[{",".join([PluginJSONEncoderV1().default(item) for item in obj.items])}]'
                 json_str = json.JSONEncoder().encode({'title': obj.title,
                                                       'module': obj.module_name,
                                                       'items': list_str,
                                                       'class': obj.__class__.__name__})
                 return json_str
             case model.Plugin.__name__:
-                menu_list_str: str = f'[{",".join([PluginJSONEncoder().default(menu) for menu in obj.menus])}]'
+                menu_list_str: str = f'[{",".join([PluginJSONEncoderV1().default(menu) for menu in obj.menus])}]'
                 json_str = json.JSONEncoder().encode({'name': obj.name,
                                                       'description': obj.description,
                                                       'author_name': obj.author_name,
@@ -95,8 +602,8 @@ class PluginJSONEncoder(json.JSONEncoder):
 
 def plugin_object_hook(obj_dict: dict) -> Union[dict, model.Plugin, model.PluginMenu, model.PluginMenuItem]:
     """
-    A custom object hook function to handle the decoding of JSON representations of ConfigInfo, ImportSpecs and
-    ExportSpecs
+    A custom object hook function to handle the decoding of JSON representations of Plugin, PluginMenu and
+    PluginMenuItem.  Both format 1 and format 2 representations are handled.
 
     :param obj_dict: a dict containing JSON names and values
     :type obj_dict: dict[str, str]
@@ -115,21 +622,10 @@ def plugin_object_hook(obj_dict: dict) -> Union[dict, model.Plugin, model.Plugin
                                                 select_date_range=decode_bool(obj_dict['select_date_range']),
                                                 select_dp_type=decode_bool(obj_dict['select_dp_type']))
                 case model.PluginMenu.__name__:
-                    items: list[model.PluginMenuItem] = []
-                    for item in eval(obj_dict['items']):
-                        items.append(plugin_object_hook(item))
-                        """
-                        items.append(model.PluginMenuItem(title=item['title'],
-                                                                  entry_point=item['entry_point'],
-                                                                  select_person=decode_bool(item['select_person']),
-                                                                  select_date_range=decode_bool(item['select_date_range']),
-                                                                  select_dp_type=decode_bool(item['select_dp_type'])))
-                        """
+                    items: list[model.PluginMenuItem] = decode_list(obj_dict['items'])
                     return model.PluginMenu(title=obj_dict['title'], module_name=obj_dict['module'], items=items)
                 case model.Plugin.__name__:
-                    menus: list[model.PluginMenu] = []
-                    for menu in eval(obj_dict['menus']):
-                        menus.append(plugin_object_hook(menu))
+                    menus: list[model.PluginMenu] = decode_list(obj_dict['menus'])
                     return model.Plugin(name=obj_dict['name'],
                                         description=obj_dict['description'],
                                         author_name=obj_dict['author_name'],
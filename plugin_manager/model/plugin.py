@@ -1,6 +1,23 @@
-from dataclasses import dataclass
-from importlib import import_module
-from typing import Callable, Optional
+import bisect
+from collections import Counter
+from dataclasses import dataclass, field
+from importlib import import_module, invalidate_caches
+import sys
+import threading
+import time
+from typing import Any, Callable, Iterable, Optional, SupportsIndex, Union
+
+# incremented whenever the title of an existing PluginMenu or PluginMenuItem is changed, so that the title indexes
+# maintained by TitleIndexedList instances know to rebuild themselves
+title_epoch: list[int] = [0]
+
+# the bits used to pack the PluginMenuItem select properties into PluginMenuItem.select_flags
+SELECT_PERSON: int = 0x01
+SELECT_DATE_RANGE: int = 0x02
+SELECT_DP_TYPE: int = 0x04
+
+# the number of seconds the default_module_cache keeps a failed resolution before the import is tried again
+DEFAULT_FAILURE_TTL: float = 5.0
 
 
 class PluginNotFoundError(ModuleNotFoundError):
@@ -10,7 +27,7 @@ class PluginNotFoundError(ModuleNotFoundError):
 
     """
     def __init__(self, *args, name: Optional[str] = None, path: Optional[str] = None):
-        ModuleNotFoundError.__init__(self, args, name, path)
+        ModuleNotFoundError.__init__(self, *args, name=name, path=path)
 
 
 class PluginImportError(ImportError):
@@ -20,14 +37,386 @@ class PluginImportError(ImportError):
 
     """
     def __init__(self, *args, name: Optional[str] = None, path: Optional[str] = None):
-        ImportError.__init__(self, args, name, path)
+        ImportError.__init__(self, *args, name=name, path=path)
+
+
+class ModuleCache:
+    """
+    Resolves plugin modules on behalf of PluginMenu.create_menu, importing each module once and recording its
+    namespace, so the entry points of every item in every menu that shares the module are looked up in the same dict.
+    A module that can not be found or imported is cached as a failure, and later lookups raise a new
+    PluginNotFoundError or PluginImportError without retrying the import.  Namespaces are kept until invalidate is
+    called.  Failures are kept for failure_ttl seconds, after which the import is tried again with the import
+    system's finder caches invalidated, so a module installed or fixed later is found, or until invalidate is called
+    if failure_ttl is None.  ModuleCache instances are thread safe, and concurrent resolutions of the same module
+    import it only once.
+
+    """
+    def __init__(self, failure_ttl: Optional[float] = None):
+        """
+        Creates an empty ModuleCache
+
+        :param failure_ttl: the number of seconds a failed resolution is kept, or None to keep it until invalidated
+        :type failure_ttl: Optional[float]
+
+        """
+        self.failure_ttl: Optional[float] = failure_ttl
+        self.lock = threading.Lock()
+        self.name_locks: dict[str, threading.Lock] = {}
+        self.namespaces: dict[str, dict[str, Any]] = {}
+        self.failures: dict[str, tuple[type, str, str, Optional[float]]] = {}
+
+    def cached(self, module_name: str) -> Optional[dict[str, Any]]:
+        """
+        Returns the namespace of a module that has already been resolved, raising the cached exception if its
+        resolution failed.  None is returned if the module has not been resolved, or its failure has expired.
+
+        :param module_name: the name of the plugin module
+        :type module_name: str
+        :return: the module's namespace or None
+        :rtype: Optional[dict[str, Any]]
+
+        """
+        namespace: Optional[dict[str, Any]] = self.namespaces.get(module_name)
+        if namespace is None:
+            failure: Optional[tuple[type, str, str, Optional[float]]] = self.failures.get(module_name)
+            if failure is not None:
+                error_class, message, name, expires = failure
+                if expires is None or time.monotonic() < expires:
+                    raise error_class(message, name=name)
+        return namespace
+
+    def resolve(self, module_name: str) -> dict[str, Any]:
+        """
+        Returns the namespace of the named module, importing the module if it has not been resolved.  A
+        PluginNotFoundError is raised if the module can not be found, and a PluginImportError is raised if the module
+        can not be imported.
+
+        :param module_name: the name of the plugin module
+        :type module_name: str
+        :return: the module's namespace
+        :rtype: dict[str, Any]
+
+        """
+        namespace: Optional[dict[str, Any]] = self.cached(module_name)
+        if namespace is not None:
+            return namespace
+        with self.lock:
+            name_lock: threading.Lock = self.name_locks.setdefault(module_name, threading.Lock())
+        with name_lock:
+            namespace = self.cached(module_name)
+            if namespace is not None:
+                return namespace
+            if module_name in self.failures:
+                invalidate_caches()
+            try:
+                namespace = import_module(module_name).__dict__
+            except ModuleNotFoundError:
+                error_class, message = PluginNotFoundError, f'Module {module_name} not found'
+            except ImportError:
+                error_class, message = PluginImportError, f'Module {module_name} could not be imported.'
+            else:
+                self.failures.pop(module_name, None)
+                self.namespaces[module_name] = namespace
+                return namespace
+            expires: Optional[float] = None if self.failure_ttl is None else time.monotonic() + self.failure_ttl
+            self.failures[module_name] = (error_class, message, module_name, expires)
+            raise error_class(message, name=module_name)
+
+    def invalidate(self, module_name: Optional[str] = None) -> None:
+        """
+        Discard the cached resolution of the named module, or of every module if no name is provided, so the next
+        lookup imports it again.  Modules that imported successfully remain in sys.modules, so a module whose source
+        has changed must also be reloaded before its new entry points are seen.
+
+        :param module_name: the name of the plugin module, or None to discard every cached module
+        :type module_name: Optional[str]
+        :return: None
+
+        """
+        with self.lock:
+            if module_name is None:
+                self.namespaces.clear()
+                self.failures.clear()
+            else:
+                self.namespaces.pop(module_name, None)
+                self.failures.pop(module_name, None)
+
+
+# the ModuleCache used by PluginMenu.create_menu when one is not provided.  Its failures expire, so a plugin module
+# installed or fixed while the application runs is found without restarting it.
+default_module_cache: ModuleCache = ModuleCache(failure_ttl=DEFAULT_FAILURE_TTL)
+
+
+class TitleIndexedList(list):
+    """
+    A list of PluginMenu or PluginMenuItem objects that maintains an index of title to list position, so that objects
+    can be found and removed by title in constant time.  As with list.index, a title maps to the position of its
+    first occurrence.
+
+    Appends update the index in place.  Removals record the removed position, and lookups adjust the indexed position
+    by the number of removals before it, so the index is only rebuilt once enough removals have accumulated.  Any
+    other change to the list, or a change to the title of any PluginMenu or PluginMenuItem, causes the index to be
+    rebuilt on the next lookup.
+
+    """
+    __slots__ = ('positions', 'removed', 'duplicates', 'epoch')
+
+    def __init__(self, iterable: Iterable = ()):
+        list.__init__(self, iterable)
+        self.positions: Optional[dict[str, int]] = None
+        self.removed: list[int] = []
+        self.duplicates: set[str] = set()
+        self.epoch: int = title_epoch[0]
+
+    @staticmethod
+    def title_of(value: Any) -> str:
+        return value if isinstance(value, str) else value.title
+
+    def invalidate(self) -> None:
+        """
+        Discard the title index, so it will be rebuilt on the next lookup
+
+        :return: None
+
+        """
+        self.positions = None
+
+    def build_index(self) -> dict[str, int]:
+        """
+        Rebuild the title index from the current contents of the list
+
+        :return: the title index
+        :rtype: dict[str, int]
+
+        """
+        titles: list[str] = [value.title for value in self]
+        # later entries overwrite earlier ones, so walking the titles in reverse leaves each title's first position
+        self.positions = dict(zip(reversed(titles), range(len(titles) - 1, -1, -1)))
+        self.duplicates = set() if len(self.positions) == len(titles) else \
+            {title for title, count in Counter(titles).items() if count > 1}
+        self.removed = []
+        self.epoch = title_epoch[0]
+        return self.positions
+
+    def position(self, match_title: str) -> Optional[int]:
+        """
+        Returns the position of the first object with the provided title
+
+        :param match_title: the title to be matched
+        :type match_title: str
+        :return: the position of the object, or None if no object has the title
+        :rtype: Optional[int]
+
+        """
+        positions: Optional[dict[str, int]] = self.positions
+        if positions is None or self.epoch != title_epoch[0]:
+            positions = self.build_index()
+        indexed: Optional[int] = positions.get(match_title)
+        if indexed is None or not self.removed:
+            return indexed
+        return indexed - bisect.bisect_left(self.removed, indexed)
+
+    def get(self, match_title: str) -> Optional[Any]:
+        """
+        Returns the first object with the provided title
+
+        :param match_title: the title to be matched
+        :type match_title: str
+        :return: the object, or None if no object has the title
+        :rtype: Optional[Union[PluginMenu, PluginMenuItem]]
+
+        """
+        idx: Optional[int] = self.position(match_title)
+        return None if idx is None else list.__getitem__(self, idx)
+
+    def index_appended(self, value: Any) -> None:
+        if self.positions is not None:
+            title: str = value.title
+            if title in self.positions:
+                self.duplicates.add(title)
+            else:
+                self.positions[title] = len(self) - 1 + len(self.removed)
+
+    def append(self, value: Any) -> None:
+        list.append(self, value)
+        self.index_appended(value)
+
+    def extend(self, iterable: Iterable) -> None:
+        if self.positions is None:
+            list.extend(self, iterable)
+            return
+        for value in iterable:
+            self.append(value)
+
+    def __iadd__(self, iterable: Iterable) -> 'TitleIndexedList':
+        self.extend(iterable)
+        return self
+
+    def insert(self, idx: SupportsIndex, value: Any) -> None:
+        list.insert(self, idx, value)
+        if idx >= len(self) - 1:
+            self.index_appended(value)
+        else:
+            self.invalidate()
+
+    def __delitem__(self, idx: Union[SupportsIndex, slice]) -> None:
+        if isinstance(idx, slice) or self.positions is None or self.epoch != title_epoch[0]:
+            list.__delitem__(self, idx)
+            self.invalidate()
+            return
+        idx = range(len(self))[idx]
+        title: str = list.__getitem__(self, idx).title
+        list.__delitem__(self, idx)
+        if title in self.duplicates or self.position(title) != idx:
+            self.invalidate()
+            return
+        indexed: int = self.positions.pop(title)
+        bisect.insort(self.removed, indexed)
+        if len(self.removed) > max(64, len(self) // 8):
+            self.invalidate()
+
+    def pop(self, idx: SupportsIndex = -1) -> Any:
+        value = list.__getitem__(self, idx)
+        del self[idx]
+        return value
+
+    def remove(self, value: Any) -> None:
+        idx: Optional[int] = self.position(self.title_of(value))
+        if idx is None:
+            raise ValueError(f'{self.title_of(value)} is not in list')
+        del self[idx]
+
+    def index(self, value: Any, start: SupportsIndex = 0, stop: SupportsIndex = sys.maxsize) -> int:
+        first: Optional[int] = self.position(self.title_of(value))
+        start, stop, _ = slice(start, stop).indices(len(self))
+        # the first object with the title is found, unless it lies before start, without scanning the list
+        if first is not None and first < stop:
+            if first >= start:
+                return first
+            for idx in range(start, stop):
+                if list.__getitem__(self, idx).title == self.title_of(value):
+                    return idx
+        raise ValueError(f'{self.title_of(value)} is not in list')
+
+    def __contains__(self, value: Any) -> bool:
+        return self.position(self.title_of(value)) is not None
+
+    def __setitem__(self, idx: Union[SupportsIndex, slice], value: Any) -> None:
+        list.__setitem__(self, idx, value)
+        self.invalidate()
+
+    def __imul__(self, count: SupportsIndex) -> 'TitleIndexedList':
+        list.__imul__(self, count)
+        self.invalidate()
+        return self
+
+    def clear(self) -> None:
+        list.clear(self)
+        self.invalidate()
+
+    def sort(self, *args, **kwargs) -> None:
+        list.sort(self, *args, **kwargs)
+        self.invalidate()
+
+    def reverse(self) -> None:
+        list.reverse(self)
+        self.invalidate()
+
+    def __reduce_ex__(self, protocol: SupportsIndex):
+        return self.__class__, (list(self),)
+
+
+class LazyEntryPoint:
+    """
+    A callable that stands in for a menu item's entry point when PluginMenu.create_menu is invoked in lazy mode.
+    The module is not imported until the proxy is first called, at which point the entry point is resolved and
+    cached.  If the module can not be imported, or the entry point does not exist, the not found action is invoked
+    with a message describing the problem.  If a selection action was provided, it is invoked with the menu item's
+    select properties and the resolved entry point, as it is for menus built eagerly.
+
+    """
+    __slots__ = ('module_name', 'item', 'not_found_action', 'selection_action', 'module_cache', 'wrap_entry_point',
+                 'entry_point')
+
+    def __init__(self, module_name: str, item: 'PluginMenuItem', not_found_action: Callable,
+                 selection_action: Optional[Callable] = None, module_cache: Optional[ModuleCache] = None,
+                 wrap_entry_point: Optional[Callable] = None):
+        """
+        Creates an instance of LazyEntryPoint
+
+        :param module_name: the name of the plugin module containing the entry point
+        :type module_name: str
+        :param item: the menu item whose entry point is to be resolved
+        :type item: plugin_manager.model.plugin.PluginMenuItem
+        :param not_found_action: the callback to be used when the module or entry point can not be found
+        :type not_found_action: Callable
+        :param selection_action: the callback to be used for Person, date range and DataPointType selections
+        :type selection_action: Optional[Callable]
+        :param module_cache: the ModuleCache used to resolve the module, by default the shared default_module_cache
+        :type module_cache: Optional[plugin_manager.model.plugin.ModuleCache]
+        :param wrap_entry_point: a Callable that receives the menu item, its resolved entry point and the module name,
+            and returns the Callable to be invoked in place of the entry point
+        :type wrap_entry_point: Optional[Callable]
+
+        """
+        self.module_name: str = module_name
+        self.item: PluginMenuItem = item
+        self.not_found_action: Callable = not_found_action
+        self.selection_action: Optional[Callable] = selection_action
+        self.module_cache: ModuleCache = module_cache if module_cache is not None else default_module_cache
+        self.wrap_entry_point: Optional[Callable] = wrap_entry_point
+        self.entry_point: Optional[Callable] = None
+
+    @property
+    def resolved(self) -> bool:
+        return self.entry_point is not None
+
+    def resolve(self) -> tuple[bool, Callable]:
+        """
+        Resolve the entry point, importing the module if necessary.  Only a successful resolution is cached, so a
+        module that could not be imported is retried once its ModuleCache entry has been invalidated.
+
+        :return: True and the entry point if it was found, otherwise False and a Callable that invokes the not
+            found action
+        :rtype: tuple[bool, Callable]
+
+        """
+        if self.entry_point is not None:
+            return True, self.entry_point
+        try:
+            found, entry_point = self.item.import_entry_point(self.module_name, self.not_found_action,
+                                                              self.module_cache)
+        except PluginNotFoundError:
+            return False, lambda msg=f'Module {self.module_name} not found': self.not_found_action(msg)
+        except PluginImportError:
+            return False, lambda msg=f'Module {self.module_name} could not be imported.': self.not_found_action(msg)
+        if found:
+            if self.wrap_entry_point is not None:
+                entry_point = self.wrap_entry_point(self.item, entry_point, self.module_name)
+            self.entry_point = entry_point
+        return found, entry_point
+
+    def __call__(self, *args, **kwargs) -> Any:
+        found, entry_point = self.resolve()
+        if found and self.selection_action:
+            return self.selection_action(self.item.select_person, self.item.select_date_range,
+                                         self.item.select_dp_type, entry_point)
+        elif found:
+            return entry_point(*args, **kwargs)
+        else:
+            return entry_point()
+
+    def __repr__(self):
+        return f'LazyEntryPoint(module_name="{self.module_name}", entry_point_name="{self.item.entry_point_name}")'
 
 
-@dataclass
 class PluginMenuItem:
     """
-    A data class that holds the information necessary to create a menu item for a plugin entry point. The module
-    name to be imported is supplied by the parent PluginMenu instance.
+    Holds the information necessary to create a menu item for a plugin entry point. The module name to be imported
+    is supplied by the parent PluginMenu instance.  The class uses __slots__ rather than a per-instance __dict__, and
+    the three select properties are stored as bits of the single select_flags int.  The entry point name is interned,
+    since the same name is typically repeated across many items.
 
     :param title: the title for the menu item
     :type title: str
@@ -41,11 +430,69 @@ class PluginMenuItem:
     :type select_dp_type: bool
 
     """
-    title: str
-    entry_point_name: str
-    select_person: bool
-    select_date_range: bool
-    select_dp_type: bool
+    __slots__ = ('title', 'entry_point_name', 'select_flags')
+    __hash__ = None
+
+    def __init__(self, title: str, entry_point_name: str, select_person: bool, select_date_range: bool,
+                 select_dp_type: bool):
+        self.title: str = title
+        self.entry_point_name: str = entry_point_name
+        self.select_flags: int = (SELECT_PERSON if select_person else 0) | \
+                                 (SELECT_DATE_RANGE if select_date_range else 0) | \
+                                 (SELECT_DP_TYPE if select_dp_type else 0)
+
+    @classmethod
+    def from_flags(cls, title: str, entry_point_name: str, select_flags: int) -> 'PluginMenuItem':
+        """
+        Creates a PluginMenuItem from a packed select_flags value
+
+        :param title: the title for the menu item
+        :type title: str
+        :param entry_point_name: the name of the callback for the menu item
+        :type entry_point_name: str
+        :param select_flags: the select properties packed as SELECT_PERSON, SELECT_DATE_RANGE and SELECT_DP_TYPE bits
+        :type select_flags: int
+        :return: a PluginMenuItem object
+        :rtype: plugin_manager.model.plugin.PluginMenuItem
+
+        """
+        item = cls(title=title, entry_point_name=entry_point_name, select_person=False, select_date_range=False,
+                   select_dp_type=False)
+        item.select_flags = select_flags
+        return item
+
+    def get_flag(self, flag: int) -> bool:
+        return self.select_flags & flag != 0
+
+    def set_flag(self, flag: int, value: bool) -> None:
+        if value:
+            self.select_flags |= flag
+        else:
+            self.select_flags &= ~flag
+
+    @property
+    def select_person(self) -> bool:
+        return self.get_flag(SELECT_PERSON)
+
+    @select_person.setter
+    def select_person(self, value: bool) -> None:
+        self.set_flag(SELECT_PERSON, value)
+
+    @property
+    def select_date_range(self) -> bool:
+        return self.get_flag(SELECT_DATE_RANGE)
+
+    @select_date_range.setter
+    def select_date_range(self, value: bool) -> None:
+        self.set_flag(SELECT_DATE_RANGE, value)
+
+    @property
+    def select_dp_type(self) -> bool:
+        return self.get_flag(SELECT_DP_TYPE)
+
+    @select_dp_type.setter
+    def select_dp_type(self, value: bool) -> None:
+        self.set_flag(SELECT_DP_TYPE, value)
 
     def __eq__(self, other) -> bool:
         """
@@ -62,7 +509,21 @@ class PluginMenuItem:
         else:
             return False
 
-    def import_entry_point(self, module_name: str, not_found_action: Callable) -> tuple[bool, Callable]:
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == 'title' and hasattr(self, 'title'):
+            title_epoch[0] += 1
+        elif name == 'entry_point_name' and type(value) is str:
+            value = sys.intern(value)
+        object.__setattr__(self, name, value)
+
+    def __getstate__(self) -> tuple[str, str, int]:
+        return self.title, self.entry_point_name, self.select_flags
+
+    def __setstate__(self, state: tuple[str, str, int]) -> None:
+        self.title, self.entry_point_name, self.select_flags = state
+
+    def import_entry_point(self, module_name: str, not_found_action: Callable,
+                           module_cache: Optional[ModuleCache] = None) -> tuple[bool, Callable]:
         """
         Imports the module specified in a PluginMenu instance, then checks for the existence of the entry point
         specified in the PluginMenuItem instance.  If the module can not be loaded, a custom exception is raised
@@ -73,23 +534,28 @@ class PluginMenuItem:
         :type module_name: str
         :param not_found_action: a Callable to be used as the menu item callback if the entry_point doesnt exist
         :type not_found_action: Callable
+        :param module_cache: a ModuleCache used to resolve the module, if None the module is imported directly
+        :type module_cache: Optional[plugin_manager.model.plugin.ModuleCache]
         :return: a Callable to be used as a callback for the menu item
         :rtype: Callable
 
         """
-        try:
-            module = import_module(module_name)
-            if self.entry_point_name in module.__dict__ and isinstance(module.__dict__[self.entry_point_name], Callable):
-                return True, module.__dict__[self.entry_point_name]
-            else:
-                return False, \
-                       lambda msg=f'Entry Point {self.entry_point_name} not found in module {module}': not_found_action(msg)
-        except ModuleNotFoundError:
-            raise PluginNotFoundError(f'Module {module_name} not found', name=module_name)
-            # return lambda msg=f'Module {module} not found': not_found_action(msg)
-        except ImportError:
-            raise PluginImportError('Module {module} could not be imported.', name=module_name)
-            # return lambda msg=f'Module {module} could not be imported.': not_found_action(msg)
+        if module_cache is not None:
+            namespace: dict[str, Any] = module_cache.resolve(module_name)
+        else:
+            try:
+                namespace = import_module(module_name).__dict__
+            except ModuleNotFoundError:
+                raise PluginNotFoundError(f'Module {module_name} not found', name=module_name)
+            except ImportError:
+                raise PluginImportError(f'Module {module_name} could not be imported.', name=module_name)
+        entry_point: Any = namespace.get(self.entry_point_name)
+        if entry_point is not None and isinstance(entry_point, Callable):
+            return True, entry_point
+        else:
+            return False, \
+                lambda msg=f'Entry Point {self.entry_point_name} not found in module {module_name}': \
+                not_found_action(msg)
 
     def __str__(self) -> str:
         sel_person, sel_dates, sel_dp_type = ' ', ' ', ' '
@@ -113,12 +579,13 @@ class PluginMenuItem:
                f'select_dp_type={str(self.select_dp_type)})'
 
 
-@dataclass
+@dataclass(slots=True)
 class PluginMenu:
     """
     A dataclass that hold the information necessary to specify an application menu.  This class is GUI framework
-    agnostic.  An example of an tkinter based implementation which used composition to access the functionality
-    of this class can be found in the biometrics_tracker.gui.widgets module.
+    agnostic.  The module name is interned, since many menus typically share a module.  An example of an tkinter
+    based implementation which used composition to access the functionality of this class can be found in the
+    biometrics_tracker.gui.widgets module.
 
     """
     title: str
@@ -140,6 +607,15 @@ class PluginMenu:
         else:
             return False
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == 'title' and hasattr(self, 'title'):
+            title_epoch[0] += 1
+        elif name == 'items' and not isinstance(value, TitleIndexedList):
+            value = TitleIndexedList(value)
+        elif name == 'module_name' and type(value) is str:
+            value = sys.intern(value)
+        object.__setattr__(self, name, value)
+
     def add_item(self, item: PluginMenuItem):
         """
         Add a PluginMenuItem instance to the list maintained by this instance
@@ -152,27 +628,41 @@ class PluginMenu:
 
     def get_menu_item(self, match_title: str) -> Optional[PluginMenuItem]:
         """
-        Retrieve a PluginMenuItem object that matches the provided title
+        Retrieve a PluginMenuItem object that matches the provided title.  The lookup uses the title index
+        maintained by the items list, so it takes constant time.
+
         :param match_title: the title of the PluginMenuItem to be retrieved
         :type match_title: str
-        :return: Optional[plugin_manager.model.PluginMenuItem
+        :return: the PluginMenuItem object or None
+        :rtype: Optional[plugin_manager.model.PluginMenuItem]
 
         """
-        idx = self.items.index(match_title)
-        if idx < 0:
-            return None
-        else:
-            return self.items[idx]
+        return self.items.get(match_title)
 
     def remove_menu_item(self, match_title: str):
-        if self.items.index(match_title):
-            self.items.remove(match_title)
+        """
+        Remove the first PluginMenuItem that matches the provided title from the items list, if there is one
+
+        :param match_title: the title of the PluginMenuItem to be removed
+        :type match_title: str
+        :return: None
+
+        """
+        idx: Optional[int] = self.items.position(match_title)
+        if idx is not None:
+            del self.items[idx]
 
     def create_menu(self, not_found_action: Callable, selection_action: Callable, add_menu_item: Callable,
-                    add_menu: Callable):
+                    add_menu: Callable, module_cache: Optional[ModuleCache] = None, lazy: bool = False,
+                    wrap_entry_point: Optional[Callable] = None):
         """
         Create a menu from a PluginMenu instance, and it's PluginMenuItem children, using callbacks provided the
-        GUI implementation to create the menus and menu items.
+        GUI implementation to create the menus and menu items.  The menu's module is resolved through a ModuleCache,
+        so it is imported at most once no matter how many items and menus refer to it.  In lazy mode the module is not
+        imported while the menu is built.  Each menu item's action is a LazyEntryPoint, which imports the module
+        and resolves the entry point when the item is first selected.  If wrap_entry_point is provided, it is invoked
+        with each menu item, its resolved entry point and the menu's module name, and the Callable it returns is used in place of the entry
+        point, allowing a host to control how entry points are run.
 
         :param not_found_action: the callback to be used when an entry point can not be found
         :type not_found_action: Callable
@@ -182,12 +672,30 @@ class PluginMenu:
         :type add_menu_item: Callable
         :param add_menu: the callback to be used to associate the menu created with a parent menu
         :type add_menu: Callable
+        :param module_cache: the ModuleCache used to resolve the module, by default the shared default_module_cache
+        :type module_cache: Optional[plugin_manager.model.plugin.ModuleCache]
+        :param lazy: if True, defer importing the module until a menu item is selected
+        :type lazy: bool
+        :param wrap_entry_point: a Callable that receives a PluginMenuItem, its entry point and the menu's module
+            name, and returns the Callable to be invoked in place of the entry point
+        :type wrap_entry_point: Optional[Callable]
         :return: None
 
         """
+        if module_cache is None:
+            module_cache = default_module_cache
+        if lazy:
+            for item in self.items:
+                add_menu_item(label=item.title, action=LazyEntryPoint(self.module_name, item, not_found_action,
+                                                                      selection_action, module_cache,
+                                                                      wrap_entry_point))
+            add_menu(label=self.title)
+            return
         for item in self.items:
             try:
-                found, entry_point = item.import_entry_point(self.module_name, not_found_action)
+                found, entry_point = item.import_entry_point(self.module_name, not_found_action, module_cache)
+                if found and wrap_entry_point is not None:
+                    entry_point = wrap_entry_point(item, entry_point, self.module_name)
                 if found and selection_action:
                     sel_lambda: Callable = \
                         lambda sp=item.select_person, sd=item.select_date_range, st=item.select_dp_type, \
@@ -208,10 +716,12 @@ class PluginMenu:
         return f'model.PluginMenu(title="{self.title}", module_name="{self.module_name}", items=[])'
 
 
-@dataclass
+@dataclass(slots=True)
 class Plugin:
     """
-    Holds general info and menu specs for a plugin
+    Holds general info and menu specs for a plugin.  file_record holds the absolute path, content hash, size and
+    modification time of the JSON file the Plugin was last read from or written to, so a save can tell whether the
+    file already holds the Plugin without reading it.  It is not compared.
 
     """
     name: str
@@ -219,6 +729,12 @@ class Plugin:
     author_name: str
     author_email: str
     menus: list[PluginMenu]
+    file_record: Optional[tuple[str, str, int, int]] = field(default=None, compare=False, repr=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == 'menus' and value is not None and not isinstance(value, TitleIndexedList):
+            value = TitleIndexedList(value)
+        object.__setattr__(self, name, value)
 
     def __post_init__(self):
         """
@@ -243,7 +759,8 @@ class Plugin:
 
     def get_menu(self, match_title: str) -> Optional[PluginMenu]:
         """
-        Retrieve a menu that matches the provided title
+        Retrieve a menu that matches the provided title.  The lookup uses the title index maintained by the menus
+        list, so it takes constant time.
 
         :param match_title: the title to be match
         :type match_title: str
@@ -251,11 +768,7 @@ class Plugin:
         :rttype: Optional[plugin_manager.model.PluginMenu
 
         """
-        idx = self.menus.index(match_title)
-        if idx < 0:
-            return None
-        else:
-            return self.menus[idx]
+        return self.menus.get(match_title)
 
     def remove_menu(self, match_title: str):
         """
@@ -265,5 +778,6 @@ class Plugin:
         :type match_title: str`
         :return: None
         """
-        if self.menus.index(match_title):
-            self.menus.remove(match_title)
+        idx: Optional[int] = self.menus.position(match_title)
+        if idx is not None:
+            del self.menus[idx]
@@ -0,0 +1,171 @@
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+import time
+from typing import Iterable, Optional
+
+import plugin_manager.model.plugin as model
+
+
+@dataclass
+class ModuleTiming:
+    """
+    Records the outcome of importing a single plugin module
+
+    :param module_name: the name of the plugin module
+    :type module_name: str
+    :param seconds: the time taken to resolve the module
+    :type seconds: float
+    :param error: a description of the exception raised if the module could not be imported, otherwise None
+    :type error: Optional[str]
+
+    """
+    module_name: str
+    seconds: float
+    error: Optional[str] = None
+
+
+@dataclass
+class PrewarmReport:
+    """
+    Reports the outcome of a pre-warm stage
+
+    :param timings: the timing of each module that finished importing, in the order the modules were submitted
+    :type timings: list[ModuleTiming]
+    :param pending: the names of the modules that had not finished importing when the report was created
+    :type pending: list[str]
+    :param seconds: the elapsed time of the pre-warm stage
+    :type seconds: float
+
+    """
+    timings: list[ModuleTiming] = field(default_factory=list)
+    pending: list[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def imported(self) -> list[str]:
+        return [timing.module_name for timing in self.timings if timing.error is None]
+
+    @property
+    def failures(self) -> list[ModuleTiming]:
+        return [timing for timing in self.timings if timing.error is not None]
+
+
+def plugin_module_names(plugins: Iterable[model.Plugin]) -> list[str]:
+    """
+    Collect the distinct module names referred to by the menus of a catalog of Plugins
+
+    :param plugins: the Plugins, such as the list returned by plugin_manager.model.json_handler.retrieve_plugins
+    :type plugins: Iterable[plugin_manager.model.plugin.Plugin]
+    :return: the module names in the order they are first referred to
+    :rtype: list[str]
+
+    """
+    module_names: dict[str, None] = {}
+    for plugin in plugins:
+        for menu in plugin.menus:
+            if len(menu.module_name) > 0:
+                module_names[menu.module_name] = None
+    return list(module_names)
+
+
+class ModulePrewarmer:
+    """
+    Imports the plugin modules referred to by a catalog of Plugins on a bounded pool of background threads, so that
+    PluginMenu.create_menu resolves against modules that are already loaded.  Modules are resolved through a
+    ModuleCache, whose per module locks, along with the import system's own module locks, ensure a module that
+    create_menu asks for while it is being pre-warmed is imported only once.
+
+    """
+    def __init__(self, plugins: Iterable[model.Plugin], max_workers: int = 4,
+                 module_cache: Optional[model.ModuleCache] = None):
+        """
+        Creates an instance of ModulePrewarmer
+
+        :param plugins: the Plugins, such as the list returned by plugin_manager.model.json_handler.retrieve_plugins
+        :type plugins: Iterable[plugin_manager.model.plugin.Plugin]
+        :param max_workers: the maximum number of modules imported at once
+        :type max_workers: int
+        :param module_cache: the ModuleCache the modules are resolved into, by default the shared default_module_cache
+        :type module_cache: Optional[plugin_manager.model.plugin.ModuleCache]
+
+        """
+        self.module_names: list[str] = plugin_module_names(plugins)
+        self.max_workers: int = max_workers
+        self.module_cache: model.ModuleCache = module_cache if module_cache is not None else \
+            model.default_module_cache
+        self.futures: list[Future] = []
+        self.start_time: float = 0.0
+
+    def resolve(self, module_name: str) -> ModuleTiming:
+        """
+        Resolve a single module, recording the time taken and any exception raised
+
+        :param module_name: the name of the plugin module
+        :type module_name: str
+        :return: the module's timing
+        :rtype: ModuleTiming
+
+        """
+        start: float = time.perf_counter()
+        try:
+            self.module_cache.resolve(module_name)
+            error: Optional[str] = None
+        except Exception as exc:
+            error = f'{exc.__class__.__name__}: {exc}'
+        return ModuleTiming(module_name=module_name, seconds=time.perf_counter() - start, error=error)
+
+    def start(self) -> 'ModulePrewarmer':
+        """
+        Submit the modules to the thread pool and return without waiting for them to be imported
+
+        :return: this ModulePrewarmer
+        :rtype: plugin_manager.model.prewarm.ModulePrewarmer
+
+        """
+        self.start_time = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='plugin-prewarm')
+        self.futures = [executor.submit(self.resolve, module_name) for module_name in self.module_names]
+        executor.shutdown(wait=False)
+        return self
+
+    def done(self) -> bool:
+        return all(future.done() for future in self.futures)
+
+    def report(self, timeout: Optional[float] = None) -> PrewarmReport:
+        """
+        Wait for the modules to be imported, then report their timings.  If the timeout expires first, the modules
+        that are still being imported are listed as pending.
+
+        :param timeout: the maximum number of seconds to wait, or None to wait until every module is imported
+        :type timeout: Optional[float]
+        :return: the pre-warm report
+        :rtype: plugin_manager.model.prewarm.PrewarmReport
+
+        """
+        wait(self.futures, timeout=timeout)
+        report = PrewarmReport(seconds=time.perf_counter() - self.start_time)
+        for module_name, future in zip(self.module_names, self.futures):
+            if future.done():
+                report.timings.append(future.result())
+            else:
+                report.pending.append(module_name)
+        return report
+
+
+def prewarm_modules(plugins: Iterable[model.Plugin], max_workers: int = 4,
+                    module_cache: Optional[model.ModuleCache] = None) -> PrewarmReport:
+    """
+    Import the plugin modules referred to by a catalog of Plugins on a bounded thread pool, and wait for the imports
+    to finish
+
+    :param plugins: the Plugins, such as the list returned by plugin_manager.model.json_handler.retrieve_plugins
+    :type plugins: Iterable[plugin_manager.model.plugin.Plugin]
+    :param max_workers: the maximum number of modules imported at once
+    :type max_workers: int
+    :param module_cache: the ModuleCache the modules are resolved into, by default the shared default_module_cache
+    :type module_cache: Optional[plugin_manager.model.plugin.ModuleCache]
+    :return: the pre-warm report
+    :rtype: plugin_manager.model.prewarm.PrewarmReport
+
+    """
+    return ModulePrewarmer(plugins, max_workers, module_cache).start().report()
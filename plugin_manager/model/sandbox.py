@@ -0,0 +1,357 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+import sys
+import threading
+from typing import Any, Callable, Iterable, Optional
+
+import plugin_manager.model.entry_points as entry_points
+import plugin_manager.model.plugin as model
+
+# ProcessPoolExecutor replaces workers after max_tasks_per_child calls from Python 3.11.  Before that, the whole pool
+# is replaced once it has run max_calls_per_worker calls for each worker.
+POOL_RECYCLES_WORKERS: bool = sys.version_info >= (3, 11)
+
+
+def preload_modules(module_names: tuple[str, ...]) -> None:
+    """
+    The initializer of each sandbox worker process.  Resolves the provided plugin modules into the worker's
+    default_module_cache, so the first call of an entry point in a new worker does not pay for the import.  Modules
+    that can not be imported are left for the call to report.
+
+    :param module_names: the names of the plugin modules to be imported
+    :type module_names: tuple[str, ...]
+    :return: None
+
+    """
+    for module_name in module_names:
+        try:
+            model.default_module_cache.resolve(module_name)
+        except (model.PluginNotFoundError, model.PluginImportError):
+            pass
+
+
+def run_entry_point(module_name: str, entry_point_name: str, args: tuple, kwargs: dict) -> Any:
+    """
+    Runs a plugin entry point in a sandbox worker process, resolving its module through the worker's
+    default_module_cache.  A PluginNotFoundError or PluginImportError is raised if the module can not be imported,
+    and an AttributeError if the entry point does not exist.
+
+    :param module_name: the name of the plugin module
+    :type module_name: str
+    :param entry_point_name: the name of the entry point
+    :type entry_point_name: str
+    :param args: the positional arguments for the entry point
+    :type args: tuple
+    :param kwargs: the keyword arguments for the entry point
+    :type kwargs: dict
+    :return: the entry point's result, which must be picklable
+    :rtype: Any
+
+    """
+    entry_point: Any = model.default_module_cache.resolve(module_name).get(entry_point_name)
+    if entry_point is None or not callable(entry_point):
+        raise AttributeError(f'Entry Point {entry_point_name} not found in module {module_name}')
+    return entry_point(*args, **kwargs)
+
+
+def worker_pid() -> int:
+    return os.getpid()
+
+
+class SandboxExecutor:
+    """
+    Runs plugin entry points, by module name and entry point name, in a persistent pool of worker processes, so
+    CPU bound entry points do not compete with the host for the GIL and a crashing entry point does not take the host
+    down.  Each worker imports the preload modules when it starts.  Workers are replaced after max_calls_per_worker
+    calls, and if a worker dies the pool is recreated and the calls that were running fail with BrokenProcessPool.
+    Arguments and results are passed between processes with pickle.  Passing module_cache to
+    plugin_manager.model.plugin.PluginMenu.create_menu builds menus whose items run in the pool, without importing
+    the plugin modules in the host.
+
+    """
+    def __init__(self, preload: Iterable[str] = (), max_workers: Optional[int] = None,
+                 max_calls_per_worker: Optional[int] = None, mp_context: Optional[Any] = None,
+                 discovery: Optional[entry_points.EntryPointDiscovery] = None):
+        """
+        Creates an instance of SandboxExecutor.  The worker processes are started by the first call.
+
+        :param preload: the names of the plugin modules each worker imports when it starts
+        :type preload: Iterable[str]
+        :param max_workers: the number of worker processes, by default the number of processors
+        :type max_workers: Optional[int]
+        :param max_calls_per_worker: the number of calls after which a worker is replaced, or None to keep workers
+        :type max_calls_per_worker: Optional[int]
+        :param mp_context: the multiprocessing context used to start workers, by default the spawn context, since
+            forking a process that runs a GUI or other threads is unsafe
+        :type mp_context: Optional[multiprocessing.context.BaseContext]
+        :param discovery: finds the entry points of the modules resolved by module_cache, by default the shared
+            default_discovery
+        :type discovery: Optional[plugin_manager.model.entry_points.EntryPointDiscovery]
+
+        """
+        self.preload: tuple[str, ...] = tuple(dict.fromkeys(preload))
+        self.max_workers: Optional[int] = max_workers
+        self.max_calls_per_worker: Optional[int] = max_calls_per_worker
+        self.mp_context = mp_context if mp_context is not None else multiprocessing.get_context('spawn')
+        self.lock = threading.Lock()
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.pool_calls: int = 0
+        self.restarts: int = 0
+        self.module_cache: SandboxModuleCache = SandboxModuleCache(self, discovery)
+
+    def get_pool(self) -> ProcessPoolExecutor:
+        """
+        Returns the process pool, creating it if it has not been created or was replaced.  Each call counts as a call
+        submitted to the pool, so that before Python 3.11 the pool can be replaced after max_calls_per_worker calls
+        for each worker.  A replaced pool finishes the calls already submitted to it.
+
+        :return: the process pool
+        :rtype: concurrent.futures.ProcessPoolExecutor
+
+        """
+        with self.lock:
+            if self.pool is not None and not POOL_RECYCLES_WORKERS and self.max_calls_per_worker is not None and \
+                    self.pool_calls >= self.max_calls_per_worker * self.worker_count():
+                retired, self.pool = self.pool, None
+                retired.shutdown(wait=False)
+            if self.pool is None:
+                recycle_args: dict[str, Any] = {'max_tasks_per_child': self.max_calls_per_worker} \
+                    if POOL_RECYCLES_WORKERS else {}
+                self.pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self.mp_context,
+                                                initializer=preload_modules, initargs=(self.preload,), **recycle_args)
+                self.pool_calls = 0
+            self.pool_calls += 1
+            return self.pool
+
+    def worker_count(self) -> int:
+        """
+        Returns the number of worker processes in the pool
+
+        :return: the number of workers
+        :rtype: int
+
+        """
+        return self.max_workers if self.max_workers is not None else os.cpu_count() or 1
+
+    def replace_pool(self, broken_pool: ProcessPoolExecutor) -> None:
+        """
+        Discard a broken pool, so the next call starts a new one.  Has no effect if the pool was already replaced.
+
+        :param broken_pool: the pool that broke
+        :type broken_pool: concurrent.futures.ProcessPoolExecutor
+        :return: None
+
+        """
+        with self.lock:
+            if self.pool is not broken_pool:
+                return
+            self.pool = None
+            self.restarts += 1
+        broken_pool.shutdown(wait=False, cancel_futures=True)
+
+    def watch(self, pool: ProcessPoolExecutor, future: Future) -> Future:
+        """
+        Arrange for the pool to be replaced if the call fails because a worker process died
+
+        :param pool: the pool the call was submitted to
+        :type pool: concurrent.futures.ProcessPoolExecutor
+        :param future: the call's Future
+        :type future: concurrent.futures.Future
+        :return: the call's Future
+        :rtype: concurrent.futures.Future
+
+        """
+        def replace_if_broken(done: Future) -> None:
+            if not done.cancelled() and isinstance(done.exception(), BrokenProcessPool):
+                self.replace_pool(pool)
+        future.add_done_callback(replace_if_broken)
+        return future
+
+    def submit(self, module_name: str, entry_point_name: str, *args, **kwargs) -> Future:
+        """
+        Run an entry point in a worker process
+
+        :param module_name: the name of the plugin module
+        :type module_name: str
+        :param entry_point_name: the name of the entry point
+        :type entry_point_name: str
+        :param args: the positional arguments for the entry point, which must be picklable
+        :param kwargs: the keyword arguments for the entry point, which must be picklable
+        :return: a Future holding the entry point's result
+        :rtype: concurrent.futures.Future
+
+        """
+        pool: ProcessPoolExecutor = self.get_pool()
+        try:
+            return self.watch(pool, pool.submit(run_entry_point, module_name, entry_point_name, args, kwargs))
+        except BrokenProcessPool:
+            self.replace_pool(pool)
+            pool = self.get_pool()
+            return self.watch(pool, pool.submit(run_entry_point, module_name, entry_point_name, args, kwargs))
+
+    def call(self, module_name: str, entry_point_name: str, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run an entry point in a worker process and wait for its result
+
+        :param module_name: the name of the plugin module
+        :type module_name: str
+        :param entry_point_name: the name of the entry point
+        :type entry_point_name: str
+        :param args: the positional arguments for the entry point, which must be picklable
+        :param timeout: the maximum number of seconds to wait, or None to wait until the call finishes
+        :type timeout: Optional[float]
+        :param kwargs: the keyword arguments for the entry point, which must be picklable
+        :return: the entry point's result
+        :rtype: Any
+
+        """
+        return self.submit(module_name, entry_point_name, *args, **kwargs).result(timeout=timeout)
+
+    def warm_up(self) -> list[int]:
+        """
+        Start the worker processes and wait until each has imported the preload modules
+
+        :return: the process ids of the workers that answered
+        :rtype: list[int]
+
+        """
+        pool: ProcessPoolExecutor = self.get_pool()
+        futures: list[Future] = [pool.submit(worker_pid) for worker_idx in range(0, self.worker_count())]
+        return sorted(set(future.result() for future in futures))
+
+    def entry_point(self, module_name: str, entry_point_name: str) -> 'SandboxEntryPoint':
+        """
+        Returns a Callable that runs the named entry point in a worker process
+
+        :param module_name: the name of the plugin module
+        :type module_name: str
+        :param entry_point_name: the name of the entry point
+        :type entry_point_name: str
+        :return: a SandboxEntryPoint
+        :rtype: plugin_manager.model.sandbox.SandboxEntryPoint
+
+        """
+        return SandboxEntryPoint(self, module_name, entry_point_name)
+
+    def wrap_entry_point(self, item: model.PluginMenuItem, entry_point: Callable,
+                         module_name: str) -> 'SandboxEntryPoint':
+        """
+        A wrap_entry_point hook for plugin_manager.model.plugin.PluginMenu.create_menu.  The entry point is run in a
+        worker process, by the menu's module name and the menu item's entry point name, after the selection action
+        has collected its arguments.  The module the entry point was defined in is not used, so re-exported and
+        aliased entry points are resolved the way the menu names them.  create_menu imports the module in the host to
+        resolve the entry point, so module_cache should be used instead unless the host imports the module anyway.
+
+        :param item: the menu item
+        :type item: plugin_manager.model.plugin.PluginMenuItem
+        :param entry_point: the menu item's resolved entry point
+        :type entry_point: Callable
+        :param module_name: the name of the menu's plugin module
+        :type module_name: str
+        :return: a SandboxEntryPoint
+        :rtype: plugin_manager.model.sandbox.SandboxEntryPoint
+
+        """
+        return SandboxEntryPoint(self, module_name, item.entry_point_name)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the worker processes
+
+        :param wait: wait for the calls in flight to finish
+        :type wait: bool
+        :return: None
+
+        """
+        with self.lock:
+            pool, self.pool = self.pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+    def __enter__(self) -> 'SandboxExecutor':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.shutdown()
+
+
+class SandboxEntryPoint:
+    """
+    A Callable that runs a plugin entry point in a SandboxExecutor worker process.  Calling it returns a
+    concurrent.futures.Future holding the entry point's result.
+
+    """
+    __slots__ = ('executor', 'module_name', 'entry_point_name')
+
+    def __init__(self, executor: SandboxExecutor, module_name: str, entry_point_name: str):
+        """
+        Creates an instance of SandboxEntryPoint
+
+        :param executor: the SandboxExecutor the entry point is run on
+        :type executor: plugin_manager.model.sandbox.SandboxExecutor
+        :param module_name: the name of the plugin module
+        :type module_name: str
+        :param entry_point_name: the name of the entry point
+        :type entry_point_name: str
+
+        """
+        self.executor: SandboxExecutor = executor
+        self.module_name: str = module_name
+        self.entry_point_name: str = entry_point_name
+
+    def __call__(self, *args, **kwargs) -> Future:
+        return self.executor.submit(self.module_name, self.entry_point_name, *args, **kwargs)
+
+    def __repr__(self):
+        return f'SandboxEntryPoint(module_name="{self.module_name}", entry_point_name="{self.entry_point_name}")'
+
+
+class SandboxModuleCache(model.ModuleCache):
+    """
+    A ModuleCache that resolves a plugin module to a namespace of SandboxEntryPoints, one for each candidate entry
+    point an EntryPointDiscovery finds in the module's source, without importing the module.  PluginMenu.create_menu
+    checks each item's entry point name against the namespace, and the item's action runs the entry point in the
+    SandboxExecutor's worker processes, so plugin code only ever runs in a worker.
+
+    """
+    def __init__(self, executor: SandboxExecutor, discovery: Optional[entry_points.EntryPointDiscovery] = None):
+        """
+        Creates an instance of SandboxModuleCache
+
+        :param executor: the SandboxExecutor the entry points are run on
+        :type executor: plugin_manager.model.sandbox.SandboxExecutor
+        :param discovery: finds the entry points of a module, by default the shared default_discovery
+        :type discovery: Optional[plugin_manager.model.entry_points.EntryPointDiscovery]
+
+        """
+        model.ModuleCache.__init__(self)
+        self.executor: SandboxExecutor = executor
+        self.discovery: entry_points.EntryPointDiscovery = discovery if discovery is not None \
+            else entry_points.default_discovery
+
+    def resolve(self, module_name: str) -> dict[str, Any]:
+        """
+        Returns a namespace holding a SandboxEntryPoint for each candidate entry point of the named module.  A
+        PluginNotFoundError is raised if the module's source can not be found, and a PluginImportError is raised if
+        it can not be parsed.
+
+        :param module_name: the name of the plugin module
+        :type module_name: str
+        :return: the module's entry points, keyed by name
+        :rtype: dict[str, Any]
+
+        """
+        namespace: Optional[dict[str, Any]] = self.cached(module_name)
+        if namespace is not None:
+            return namespace
+        names: Optional[list[str]] = self.discovery.entry_points(module_name)
+        if names is None:
+            if module_name in self.discovery.module_sources:
+                raise model.PluginImportError(f'Module {module_name} could not be imported.', name=module_name)
+            raise model.PluginNotFoundError(f'Module {module_name} not found', name=module_name)
+        namespace = {name: SandboxEntryPoint(self.executor, module_name, name) for name in names}
+        with self.lock:
+            self.namespaces[module_name] = namespace
+        return namespace
@@ -0,0 +1,293 @@
+from collections.abc import Sequence
+import mmap
+import os
+import pathlib
+import struct
+import tempfile
+from typing import Iterator, Optional, Union
+
+import plugin_manager.model.json_handler as jh
+import plugin_manager.model.plugin as model
+
+SNAPSHOT_MAGIC: bytes = b'PMCS'
+SNAPSHOT_VERSION: int = 1
+
+# magic, version, string count, plugin count, menu count, item count and the offsets of the string index, string data,
+# plugin records, menu records and item records
+HEADER = struct.Struct('<4sHxxIIIIIIIII')
+# offset and length of a string within the string data
+STRING_INDEX = struct.Struct('<II')
+# name, description, author name and author email string ids, first menu record, menu count
+PLUGIN_RECORD = struct.Struct('<IIIIII')
+# title and module name string ids, first item record, item count
+MENU_RECORD = struct.Struct('<IIII')
+# title and entry point name string ids, select flags
+ITEM_RECORD = struct.Struct('<IIB3x')
+
+
+class StringTable:
+    """
+    Assigns an id to each distinct string written to a snapshot, so repeated values such as module names are stored
+    once
+
+    """
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+        self.index = bytearray()
+        self.data = bytearray()
+
+    def add(self, value: str) -> int:
+        """
+        Returns the id of the provided string, adding it to the table if it is not already present
+
+        :param value: the string to be added
+        :type value: str
+        :return: the string's id
+        :rtype: int
+
+        """
+        string_id: Optional[int] = self.ids.get(value)
+        if string_id is None:
+            encoded: bytes = value.encode()
+            string_id = len(self.ids)
+            self.ids[value] = string_id
+            self.index += STRING_INDEX.pack(len(self.data), len(encoded))
+            self.data += encoded
+        return string_id
+
+
+def export_snapshot(plugins: Union[pathlib.Path, list[model.Plugin]], snapshot_path: pathlib.Path) -> int:
+    """
+    Compile a plugin folder, or a list of Plugins, into a single binary snapshot file.  The file holds a header, a
+    string table and fixed width records for the Plugin, PluginMenu and PluginMenuItem objects, with the three select
+    properties of each PluginMenuItem stored as its packed select_flags byte.  The file is written to a temporary file
+    which is renamed over snapshot_path.
+
+    :param plugins: a Path object pointing to the folder containing the Plugin JSON files, or a list of Plugins
+    :type plugins: Union[pathlib.Path, list[plugin_manager.model.plugin.Plugin]]
+    :param snapshot_path: the path of the snapshot file to be written
+    :type snapshot_path: pathlib.Path
+    :return: the number of Plugins written to the snapshot
+    :rtype: int
+
+    """
+    if isinstance(plugins, pathlib.Path):
+        plugins = jh.retrieve_plugins(plugins)
+    strings = StringTable()
+    plugin_records = bytearray()
+    menu_records = bytearray()
+    item_records = bytearray()
+    menu_count: int = 0
+    item_count: int = 0
+    for plugin in plugins:
+        plugin_records += PLUGIN_RECORD.pack(strings.add(plugin.name), strings.add(plugin.description),
+                                             strings.add(plugin.author_name), strings.add(plugin.author_email),
+                                             menu_count, len(plugin.menus))
+        for menu in plugin.menus:
+            menu_records += MENU_RECORD.pack(strings.add(menu.title), strings.add(menu.module_name), item_count,
+                                             len(menu.items))
+            menu_count += 1
+            for item in menu.items:
+                item_records += ITEM_RECORD.pack(strings.add(item.title), strings.add(item.entry_point_name),
+                                                 item.select_flags)
+                item_count += 1
+    string_index_offset: int = HEADER.size
+    string_data_offset: int = string_index_offset + len(strings.index)
+    plugin_offset: int = string_data_offset + len(strings.data)
+    menu_offset: int = plugin_offset + len(plugin_records)
+    item_offset: int = menu_offset + len(menu_records)
+    header: bytes = HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(strings.ids), len(plugins), menu_count,
+                                item_count, string_index_offset, string_data_offset, plugin_offset, menu_offset,
+                                item_offset)
+    fd, temp_name = tempfile.mkstemp(dir=snapshot_path.parent, prefix=snapshot_path.name, suffix='.tmp')
+    try:
+        os.chmod(temp_name, jh.replacement_mode(snapshot_path))
+        with os.fdopen(fd, mode='wb') as snapshot_file:
+            for section in (header, strings.index, strings.data, plugin_records, menu_records, item_records):
+                snapshot_file.write(section)
+        os.replace(temp_name, snapshot_path)
+    except BaseException:
+        pathlib.Path(temp_name).unlink(missing_ok=True)
+        raise
+    return len(plugins)
+
+
+class SnapshotCatalog(Sequence):
+    """
+    A read only sequence of the Plugins held in a snapshot file created by export_snapshot.  The file is memory
+    mapped and model objects are built only when they are accessed, so a host that only needs a few Plugins or menus
+    does not pay to decode the rest.  Built Plugins and PluginMenus are cached by their record index, so a menu
+    fetched with get_menu is the same object as the one in its Plugin's menus list.  A SnapshotCatalog can be used wherever the list returned by
+    plugin_manager.model.json_handler.retrieve_plugins is used.
+
+    """
+    def __init__(self, snapshot_path: pathlib.Path):
+        """
+        Creates an instance of SnapshotCatalog.  A ValueError is raised if the file is not a snapshot file, or was
+        written by a different snapshot version.
+
+        :param snapshot_path: the path of the snapshot file
+        :type snapshot_path: pathlib.Path
+
+        """
+        self.snapshot_path: pathlib.Path = snapshot_path
+        with snapshot_path.open(mode='rb') as snapshot_file:
+            self.buffer: Optional[mmap.mmap] = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.buffer) < HEADER.size:
+            self.close()
+            raise ValueError(f'{snapshot_path.__str__()} is not a plugin snapshot file')
+        magic, version, string_count, self.plugin_count, self.menu_count, self.item_count, \
+            self.string_index_offset, self.string_data_offset, self.plugin_offset, self.menu_offset, \
+            self.item_offset = HEADER.unpack_from(self.buffer, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            self.close()
+            raise ValueError(f'{snapshot_path.__str__()} is not a version {SNAPSHOT_VERSION} plugin snapshot file')
+        self.strings: list[Optional[str]] = [None] * string_count
+        self.plugins: list[Optional[model.Plugin]] = [None] * self.plugin_count
+        self.menus: list[Optional[model.PluginMenu]] = [None] * self.menu_count
+
+    def __enter__(self) -> 'SnapshotCatalog':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Release the memory map.  Plugins that were already built remain usable.
+
+        :return: None
+
+        """
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer = None
+
+    def __len__(self) -> int:
+        return self.plugin_count
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[model.Plugin, list[model.Plugin]]:
+        if isinstance(idx, slice):
+            return [self[plugin_idx] for plugin_idx in range(*idx.indices(self.plugin_count))]
+        if idx < 0:
+            idx += self.plugin_count
+        if not 0 <= idx < self.plugin_count:
+            raise IndexError('snapshot plugin index out of range')
+        plugin: Optional[model.Plugin] = self.plugins[idx]
+        if plugin is None:
+            name, description, author_name, author_email, first_menu, menu_count = self.plugin_record(idx)
+            plugin = model.Plugin(name=self.string(name), description=self.string(description),
+                                  author_name=self.string(author_name), author_email=self.string(author_email),
+                                  menus=[self.menu(menu_idx)
+                                         for menu_idx in range(first_menu, first_menu + menu_count)])
+            self.plugins[idx] = plugin
+        return plugin
+
+    def __iter__(self) -> Iterator[model.Plugin]:
+        for idx in range(0, self.plugin_count):
+            yield self[idx]
+
+    def string(self, string_id: int) -> str:
+        """
+        Returns the string with the provided id from the string table
+
+        :param string_id: the id of the string
+        :type string_id: int
+        :return: the string
+        :rtype: str
+
+        """
+        value: Optional[str] = self.strings[string_id]
+        if value is None:
+            offset, length = STRING_INDEX.unpack_from(self.buffer, self.string_index_offset +
+                                                      string_id * STRING_INDEX.size)
+            start: int = self.string_data_offset + offset
+            value = self.buffer[start:start + length].decode()
+            self.strings[string_id] = value
+        return value
+
+    def plugin_record(self, idx: int) -> tuple[int, int, int, int, int, int]:
+        """
+        Returns the unpacked record for the Plugin at the provided index
+
+        :param idx: the index of the Plugin
+        :type idx: int
+        :return: the name, description, author name and author email string ids, first menu record and menu count
+        :rtype: tuple[int, int, int, int, int, int]
+
+        """
+        return PLUGIN_RECORD.unpack_from(self.buffer, self.plugin_offset + idx * PLUGIN_RECORD.size)
+
+    def menu(self, menu_idx: int) -> model.PluginMenu:
+        """
+        Builds the PluginMenu, and its PluginMenuItems, from the menu record at the provided index, unless it has
+        already been built
+
+        :param menu_idx: the index of the menu record
+        :type menu_idx: int
+        :return: a PluginMenu object
+        :rtype: plugin_manager.model.plugin.PluginMenu
+
+        """
+        menu: Optional[model.PluginMenu] = self.menus[menu_idx]
+        if menu is not None:
+            return menu
+        title, module_name, first_item, item_count = MENU_RECORD.unpack_from(self.buffer, self.menu_offset +
+                                                                            menu_idx * MENU_RECORD.size)
+        items: list[model.PluginMenuItem] = []
+        for item_title, entry_point_name, flags in ITEM_RECORD.iter_unpack(
+                self.buffer[self.item_offset + first_item * ITEM_RECORD.size:
+                            self.item_offset + (first_item + item_count) * ITEM_RECORD.size]):
+            items.append(model.PluginMenuItem.from_flags(title=self.string(item_title),
+                                                         entry_point_name=self.string(entry_point_name),
+                                                         select_flags=flags))
+        menu = model.PluginMenu(title=self.string(title), module_name=self.string(module_name), items=items)
+        self.menus[menu_idx] = menu
+        return menu
+
+    def menu_titles(self, idx: int) -> list[str]:
+        """
+        Returns the titles of the menus of the Plugin at the provided index, without building the menus
+
+        :param idx: the index of the Plugin
+        :type idx: int
+        :return: a list of menu titles
+        :rtype: list[str]
+
+        """
+        first_menu, menu_count = self.plugin_record(idx)[4:]
+        return [self.string(MENU_RECORD.unpack_from(self.buffer, self.menu_offset + menu_idx * MENU_RECORD.size)[0])
+                for menu_idx in range(first_menu, first_menu + menu_count)]
+
+    def get_menu(self, idx: int, match_title: str) -> Optional[model.PluginMenu]:
+        """
+        Builds only the menu with the provided title from the Plugin at the provided index.  If the menu has already
+        been built, by an earlier call or with its Plugin, the cached PluginMenu object is returned.
+
+        :param idx: the index of the Plugin
+        :type idx: int
+        :param match_title: the title of the menu
+        :type match_title: str
+        :return: the PluginMenu object, or None if the Plugin has no menu with that title
+        :rtype: Optional[plugin_manager.model.plugin.PluginMenu]
+
+        """
+        first_menu, menu_count = self.plugin_record(idx)[4:]
+        for menu_idx in range(first_menu, first_menu + menu_count):
+            title: int = MENU_RECORD.unpack_from(self.buffer, self.menu_offset + menu_idx * MENU_RECORD.size)[0]
+            if self.string(title) == match_title:
+                return self.menu(menu_idx)
+        return None
+
+
+def load_snapshot(snapshot_path: pathlib.Path) -> SnapshotCatalog:
+    """
+    Open a snapshot file created by export_snapshot
+
+    :param snapshot_path: the path of the snapshot file
+    :type snapshot_path: pathlib.Path
+    :return: a lazily decoded sequence of the Plugins in the snapshot
+    :rtype: SnapshotCatalog
+
+    """
+    return SnapshotCatalog(snapshot_path)
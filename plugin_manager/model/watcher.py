@@ -0,0 +1,348 @@
+from dataclasses import dataclass, field
+import importlib
+import os
+import pathlib
+import sys
+import threading
+from typing import Callable, Optional, Union
+
+import plugin_manager.model.entry_points as entry_points
+import plugin_manager.model.json_handler as jh
+import plugin_manager.model.plugin as model
+
+# the modification time and size of a watched file
+FileState = tuple[int, int]
+
+
+@dataclass
+class PluginChange:
+    """
+    Describes a Plugin JSON file that was added, changed or removed
+
+    :param file_name: the name of the JSON file
+    :type file_name: str
+    :param kind: 'added', 'changed' or 'removed'
+    :type kind: str
+    :param plugin: the decoded Plugin, or None if the file was removed or could not be decoded
+    :type plugin: Optional[plugin_manager.model.plugin.Plugin]
+    :param previous: the Plugin decoded from the file before the change, or None
+    :type previous: Optional[plugin_manager.model.plugin.Plugin]
+
+    """
+    file_name: str
+    kind: str
+    plugin: Optional[model.Plugin]
+    previous: Optional[model.Plugin] = None
+
+
+@dataclass
+class ModuleChange:
+    """
+    Describes a plugin module whose source changed and was reloaded
+
+    :param module_name: the name of the module
+    :type module_name: str
+    :param source_path: the path of the module's source file
+    :type source_path: pathlib.Path
+    :param plugins: the Plugins with menus that refer to the module
+    :type plugins: list[plugin_manager.model.plugin.Plugin]
+    :param error: a description of the exception raised by the reload, or None if the reload succeeded
+    :type error: Optional[str]
+
+    """
+    module_name: str
+    source_path: pathlib.Path
+    plugins: list[model.Plugin] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def scan_folder(folder: str, names: Optional[set[str]], suffix: str = '.json') -> dict[str, FileState]:
+    """
+    Read the state of the watched files in a folder with a single directory scan
+
+    :param folder: the folder to be scanned
+    :type folder: str
+    :param names: the names of the watched files, or None to watch every file with the provided suffix
+    :type names: Optional[set[str]]
+    :param suffix: the suffix of the watched files, used if names is None
+    :type suffix: str
+    :return: the modification time and size of each watched file that exists, keyed by file name
+    :rtype: dict[str, FileState]
+
+    """
+    states: dict[str, FileState] = {}
+    try:
+        with os.scandir(folder) as dir_entries:
+            for dir_entry in dir_entries:
+                if (dir_entry.name in names) if names is not None else dir_entry.name.endswith(suffix):
+                    try:
+                        stat: os.stat_result = dir_entry.stat()
+                    except OSError:
+                        continue
+                    states[dir_entry.name] = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        pass
+    return states
+
+
+class PluginWatcher:
+    """
+    Polls a plugin folder, and the source files of the imported plugin modules its Plugins refer to, and reloads
+    what changed.  The watched modules are refreshed on each poll, so a module imported after start is watched from
+    the next poll on.  Changed JSON files are decoded again, and changed modules are reloaded with importlib.reload, their
+    ModuleCache entries are invalidated and their discovered entry points discarded.  Callbacks report each change, so
+    a host can rebuild only the affected menus.
+
+    Changes are detected by modification time and size.  Watched files are grouped by folder, and each folder is read
+    with one directory scan.  If a stat budget is provided, each poll scans folders in turn until the budget is used,
+    so the cost of a poll stays bounded however many files are watched, at the price of detecting some changes a few
+    polls later.
+
+    """
+    def __init__(self, plugin_path: pathlib.Path, on_plugin_change: Optional[Callable] = None,
+                 on_module_change: Optional[Callable] = None, module_cache: Optional[model.ModuleCache] = None,
+                 discovery: Optional[entry_points.EntryPointDiscovery] = None, stat_budget: Optional[int] = None):
+        """
+        Creates an instance of PluginWatcher
+
+        :param plugin_path: a Path object pointing to the folder containing the Plugin JSON files
+        :type plugin_path: pathlib.Path
+        :param on_plugin_change: invoked with a PluginChange for each JSON file that was added, changed or removed
+        :type on_plugin_change: Optional[Callable]
+        :param on_module_change: invoked with a ModuleChange for each plugin module that was reloaded
+        :type on_module_change: Optional[Callable]
+        :param module_cache: the ModuleCache to be invalidated when a module is reloaded, by default the shared
+            default_module_cache
+        :type module_cache: Optional[plugin_manager.model.plugin.ModuleCache]
+        :param discovery: the EntryPointDiscovery to be invalidated when a module is reloaded, by default the shared
+            default_discovery
+        :type discovery: Optional[plugin_manager.model.entry_points.EntryPointDiscovery]
+        :param stat_budget: the approximate number of files examined by each poll, or None to examine every file
+        :type stat_budget: Optional[int]
+
+        """
+        self.plugin_folder: str = os.path.abspath(plugin_path)
+        self.on_plugin_change: Optional[Callable] = on_plugin_change
+        self.on_module_change: Optional[Callable] = on_module_change
+        self.module_cache: model.ModuleCache = module_cache if module_cache is not None else \
+            model.default_module_cache
+        self.discovery: entry_points.EntryPointDiscovery = discovery if discovery is not None else \
+            entry_points.default_discovery
+        self.stat_budget: Optional[int] = stat_budget
+        self.plugins: dict[str, model.Plugin] = {}
+        # the names of the modules the Plugins' menus refer to
+        self.referenced_modules: set[str] = set()
+        self.states: dict[str, dict[str, FileState]] = {}
+        # the names of the watched module source files, keyed by folder, and the module name of each source file
+        self.module_files: dict[str, set[str]] = {}
+        self.module_names: dict[str, str] = {}
+        self.next_folder: int = 0
+        self.last_poll_files: int = 0
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> list[model.Plugin]:
+        """
+        Decode the Plugins in the plugin folder and record the state of the watched files, without reporting changes
+
+        :return: the Plugins in sorted file name order
+        :rtype: list[plugin_manager.model.plugin.Plugin]
+
+        """
+        states: dict[str, FileState] = scan_folder(self.plugin_folder, None)
+        self.plugins = {}
+        for file_name in sorted(states):
+            plugin: Optional[model.Plugin] = self.decode(file_name)
+            if plugin is not None:
+                self.plugins[file_name] = plugin
+        self.states = {self.plugin_folder: states}
+        self.update_referenced_modules()
+        self.update_modules()
+        for folder, names in self.module_files.items():
+            self.states[folder] = scan_folder(folder, names)
+        return list(self.plugins.values())
+
+    def decode(self, file_name: str) -> Optional[model.Plugin]:
+        """
+        Decode a JSON file of the plugin folder.  A file that can not be read or decoded, or that does not encode a
+        Plugin, such as a stray settings file, is treated as holding no Plugin.
+
+        :param file_name: the name of the JSON file
+        :type file_name: str
+        :return: the decoded Plugin, or None
+        :rtype: Optional[plugin_manager.model.plugin.Plugin]
+
+        """
+        try:
+            plugin = jh.decode_plugin_file(pathlib.Path(self.plugin_folder, file_name))
+        except (OSError, ValueError):
+            return None
+        return plugin if isinstance(plugin, model.Plugin) else None
+
+    def update_referenced_modules(self) -> None:
+        """
+        Collect the names of the modules the Plugins' menus refer to
+
+        :return: None
+
+        """
+        self.referenced_modules = {menu.module_name for plugin in self.plugins.values() for menu in plugin.menus}
+
+    def update_modules(self) -> None:
+        """
+        Update the set of watched module source files from the modules the Plugins refer to.  Only modules that have
+        been imported are watched, and this is called by every poll, so a module is watched from the first poll after
+        it is imported.  The state of a newly watched file is recorded by the next scan of its folder.
+
+        :return: None
+
+        """
+        module_files: dict[str, set[str]] = {}
+        module_names: dict[str, str] = {}
+        for module_name in self.referenced_modules:
+            module = sys.modules.get(module_name)
+            source: Optional[str] = getattr(module, '__file__', None) if module is not None else None
+            if source is None or not source.endswith('.py'):
+                continue
+            folder, file_name = os.path.split(os.path.abspath(source))
+            module_files.setdefault(folder, set()).add(file_name)
+            module_names[os.path.join(folder, file_name)] = module_name
+        self.module_files = module_files
+        self.module_names = module_names
+
+    def folders(self) -> list[str]:
+        return [self.plugin_folder] + sorted(self.module_files)
+
+    def poll(self) -> list[Union[PluginChange, ModuleChange]]:
+        """
+        Scan the watched folders, reload what changed, and invoke the callbacks
+
+        :return: the changes detected, in the order their callbacks were invoked
+        :rtype: list[Union[PluginChange, ModuleChange]]
+
+        """
+        changes: list[Union[PluginChange, ModuleChange]] = []
+        self.update_modules()
+        folders: list[str] = self.folders()
+        if self.stat_budget is None:
+            selected: list[str] = folders
+        else:
+            selected = []
+            budget: int = self.stat_budget
+            start: int = self.next_folder % len(folders)
+            for folder_idx in range(0, len(folders)):
+                folder: str = folders[(start + folder_idx) % len(folders)]
+                if budget <= 0:
+                    break
+                selected.append(folder)
+                budget -= max(1, len(self.states.get(folder, {})))
+                self.next_folder = (start + folder_idx + 1) % len(folders)
+        self.last_poll_files = 0
+        changed_modules: list[str] = []
+        for folder in selected:
+            names: Optional[set[str]] = None if folder == self.plugin_folder else self.module_files.get(folder)
+            states: dict[str, FileState] = scan_folder(folder, names)
+            self.last_poll_files += len(states)
+            previous: Optional[dict[str, FileState]] = self.states.get(folder)
+            self.states[folder] = states
+            if folder == self.plugin_folder:
+                changes.extend(self.plugin_changes(previous or {}, states))
+            elif previous is not None:
+                for file_name, state in states.items():
+                    if file_name in previous and previous[file_name] != state:
+                        changed_modules.append(os.path.join(folder, file_name))
+        if any(isinstance(change, PluginChange) for change in changes):
+            self.update_referenced_modules()
+            self.update_modules()
+        for source_path in changed_modules:
+            module_name: Optional[str] = self.module_names.get(source_path)
+            if module_name is not None:
+                changes.append(self.reload_module(module_name, pathlib.Path(source_path)))
+        for change in changes:
+            if isinstance(change, PluginChange) and self.on_plugin_change is not None:
+                self.on_plugin_change(change)
+            elif isinstance(change, ModuleChange) and self.on_module_change is not None:
+                self.on_module_change(change)
+        return changes
+
+    def plugin_changes(self, previous: dict[str, FileState], states: dict[str, FileState]) -> list[PluginChange]:
+        """
+        Decode the JSON files that were added or changed, and drop the Plugins of the files that were removed
+
+        :param previous: the state of the JSON files at the last scan
+        :type previous: dict[str, FileState]
+        :param states: the state of the JSON files now
+        :type states: dict[str, FileState]
+        :return: the changes, in sorted file name order
+        :rtype: list[plugin_manager.model.watcher.PluginChange]
+
+        """
+        changes: list[PluginChange] = []
+        for file_name in sorted(previous.keys() | states.keys()):
+            if file_name not in states:
+                changes.append(PluginChange(file_name=file_name, kind='removed', plugin=None,
+                                            previous=self.plugins.pop(file_name, None)))
+            elif file_name not in previous or previous[file_name] != states[file_name]:
+                plugin: Optional[model.Plugin] = self.decode(file_name)
+                old_plugin: Optional[model.Plugin] = self.plugins.pop(file_name, None)
+                if plugin is not None:
+                    self.plugins[file_name] = plugin
+                changes.append(PluginChange(file_name=file_name, kind='added' if file_name not in previous else
+                                            'changed', plugin=plugin, previous=old_plugin))
+        return changes
+
+    def reload_module(self, module_name: str, source_path: pathlib.Path) -> ModuleChange:
+        """
+        Reload a plugin module whose source changed, and discard the cached resolution and entry points of the module
+
+        :param module_name: the name of the module
+        :type module_name: str
+        :param source_path: the path of the module's source file
+        :type source_path: pathlib.Path
+        :return: the change, listing the Plugins that refer to the module
+        :rtype: plugin_manager.model.watcher.ModuleChange
+
+        """
+        change = ModuleChange(module_name=module_name, source_path=source_path,
+                              plugins=[plugin for plugin in self.plugins.values()
+                                       if any(menu.module_name == module_name for menu in plugin.menus)])
+        self.module_cache.invalidate(module_name)
+        self.discovery.invalidate(source_path)
+        module = sys.modules.get(module_name)
+        if module is not None:
+            try:
+                importlib.reload(module)
+            except Exception as exc:
+                change.error = f'{exc.__class__.__name__}: {exc}'
+        return change
+
+    def run(self, interval: float = 1.0) -> threading.Thread:
+        """
+        Poll on a daemon thread until stop is called.  The callbacks are invoked on that thread, so a GUI host should
+        instead call poll from its own event loop, for example with Tk's after method.
+
+        :param interval: the number of seconds between polls
+        :type interval: float
+        :return: the polling thread
+        :rtype: threading.Thread
+
+        """
+        def poll_loop():
+            while not self.stop_event.wait(interval):
+                self.poll()
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=poll_loop, name='plugin-watcher', daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def stop(self) -> None:
+        """
+        Stop the polling thread started by run
+
+        :return: None
+
+        """
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
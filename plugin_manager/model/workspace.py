@@ -0,0 +1,213 @@
+from collections import OrderedDict
+import pathlib
+from typing import Any, Callable, Hashable, Optional
+
+import plugin_manager.model.json_handler as jh
+import plugin_manager.model.plugin as model
+
+
+class LRUCache:
+    """
+    A mapping holding at most capacity values, which evicts the least recently used value when a new value is added
+    to a full cache.  An optional callback is invoked with each evicted key and value, so the owner can release what
+    the value holds.
+
+    """
+    def __init__(self, capacity: int, on_evict: Optional[Callable] = None):
+        """
+        Creates an empty LRUCache
+
+        :param capacity: the maximum number of values held
+        :type capacity: int
+        :param on_evict: invoked with the key and value of each evicted value
+        :type on_evict: Optional[Callable]
+
+        """
+        if capacity < 1:
+            raise ValueError(f'LRUCache capacity must be at least 1, not {capacity}')
+        self.capacity: int = capacity
+        self.on_evict: Optional[Callable] = on_evict
+        self.entries: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def keys(self) -> list[Hashable]:
+        """
+        List the keys, from the least to the most recently used
+
+        :return: the keys
+        :rtype: list[Hashable]
+
+        """
+        return list(self.entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the value for the key, and marks it as the most recently used
+
+        :param key: the key
+        :type key: Hashable
+        :param default: returned if the key is not in the cache
+        :type default: Any
+        :return: the value, or the default
+        :rtype: Any
+
+        """
+        if key not in self.entries:
+            return default
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Add or replace the value for the key, evicting the least recently used values if the cache is full
+
+        :param key: the key
+        :type key: Hashable
+        :param value: the value
+        :type value: Any
+        :return: None
+
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            evicted_key, evicted_value = self.entries.popitem(last=False)
+            if self.on_evict is not None:
+                self.on_evict(evicted_key, evicted_value)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Remove the value for the key, without invoking the eviction callback
+
+        :param key: the key
+        :type key: Hashable
+        :param default: returned if the key is not in the cache
+        :type default: Any
+        :return: the value, or the default
+        :rtype: Any
+
+        """
+        return self.entries.pop(key, default)
+
+
+class Workspace:
+    """
+    A folder of Plugin JSON files opened for editing.  The folder is listed by reading only the header of each file,
+    its name, author and menu count, and a Plugin is decoded when it is first requested.  The most recently used
+    Plugins are kept decoded in an LRUCache, so switching between them does not read their files again.  A Plugin with
+    unsaved edits is held until it is saved, whether or not it is still in the cache.
+
+    """
+    def __init__(self, plugin_path: pathlib.Path, plugin_capacity: int = 32):
+        """
+        Creates an instance of Workspace.  The folder is listed by the first call of headers.
+
+        :param plugin_path: a Path object pointing to the folder containing the Plugin JSON files
+        :type plugin_path: pathlib.Path
+        :param plugin_capacity: the number of decoded Plugins kept
+        :type plugin_capacity: int
+
+        """
+        self.plugin_path: pathlib.Path = pathlib.Path(plugin_path)
+        self.plugins = LRUCache(plugin_capacity)
+        self.modified_plugins: dict[pathlib.Path, model.Plugin] = {}
+        self.plugin_headers: Optional[list[jh.PluginHeader]] = None
+        self.decode_count: int = 0
+
+    def headers(self, refresh: bool = False) -> list[jh.PluginHeader]:
+        """
+        List the headers of the Plugin JSON files in the folder, in sorted path order
+
+        :param refresh: read the folder again, rather than returning the headers read before
+        :type refresh: bool
+        :return: the headers
+        :rtype: list[plugin_manager.model.json_handler.PluginHeader]
+
+        """
+        if self.plugin_headers is None or refresh:
+            self.plugin_headers = jh.read_plugin_headers(self.plugin_path)
+        return self.plugin_headers
+
+    def plugin(self, json_path: pathlib.Path) -> Optional[model.Plugin]:
+        """
+        Returns the Plugin in a JSON file of the folder, decoding the file unless the Plugin is modified or cached
+
+        :param json_path: the path of the file
+        :type json_path: pathlib.Path
+        :return: the Plugin, or None if the file does not contain one
+        :rtype: Optional[plugin_manager.model.plugin.Plugin]
+
+        """
+        json_path = pathlib.Path(json_path)
+        plugin: Optional[model.Plugin] = self.modified_plugins.get(json_path)
+        if plugin is None:
+            plugin = self.plugins.get(json_path)
+        if plugin is None:
+            plugin = jh.decode_plugin_file(json_path)
+            self.decode_count += 1
+            if not isinstance(plugin, model.Plugin):
+                return None
+        self.plugins.put(json_path, plugin)
+        return plugin
+
+    def keep_modified(self, json_path: pathlib.Path, plugin: model.Plugin) -> None:
+        """
+        Hold a Plugin with unsaved edits, so it is returned by plugin until it is saved
+
+        :param json_path: the path of the Plugin's file
+        :type json_path: pathlib.Path
+        :param plugin: the edited Plugin
+        :type plugin: plugin_manager.model.plugin.Plugin
+        :return: None
+
+        """
+        json_path = pathlib.Path(json_path)
+        self.modified_plugins[json_path] = plugin
+        self.plugins.put(json_path, plugin)
+
+    def forget(self, json_path: pathlib.Path, plugin: model.Plugin) -> None:
+        """
+        Drop a Plugin held for a file, after it was saved to another file, so the file is decoded again when it is
+        next requested.  Has no effect if a different Plugin is held for the file.
+
+        :param json_path: the path of the file the Plugin was read from
+        :type json_path: pathlib.Path
+        :param plugin: the Plugin saved to another file
+        :type plugin: plugin_manager.model.plugin.Plugin
+        :return: None
+
+        """
+        json_path = pathlib.Path(json_path)
+        if self.modified_plugins.get(json_path) is plugin:
+            del self.modified_plugins[json_path]
+        if json_path in self.plugins and self.plugins.entries[json_path] is plugin:
+            self.plugins.pop(json_path)
+
+    def saved(self, json_path: pathlib.Path, plugin: model.Plugin) -> jh.PluginHeader:
+        """
+        Record that a Plugin was written to its file, and update the file's header
+
+        :param json_path: the path of the Plugin's file
+        :type json_path: pathlib.Path
+        :param plugin: the saved Plugin
+        :type plugin: plugin_manager.model.plugin.Plugin
+        :return: the file's new header
+        :rtype: plugin_manager.model.json_handler.PluginHeader
+
+        """
+        json_path = pathlib.Path(json_path)
+        self.modified_plugins.pop(json_path, None)
+        self.plugins.put(json_path, plugin)
+        header = jh.PluginHeader(json_path=json_path, name=plugin.name, description=plugin.description,
+                                 author_name=plugin.author_name, author_email=plugin.author_email,
+                                 menu_count=len(plugin.menus))
+        if self.plugin_headers is not None:
+            self.plugin_headers = [other for other in self.plugin_headers if other.json_path != json_path]
+            self.plugin_headers.append(header)
+            self.plugin_headers.sort(key=lambda other: other.json_path)
+        return header
@@ -0,0 +1,53 @@
+import pytest
+
+import plugin_manager.gui.command_journal as command_journal
+
+
+class AppendCommand(command_journal.Command):
+    """
+    Appends a value to a list, and records when it is discarded
+
+    """
+    def __init__(self, values: list, value, discarded: list):
+        self.values = values
+        self.value = value
+        self.discarded = discarded
+        self.values.append(value)
+
+    def undo(self) -> None:
+        assert self.values.pop() == self.value
+
+    def redo(self) -> None:
+        self.values.append(self.value)
+
+    def discard(self) -> None:
+        self.discarded.append(self.value)
+
+
+@pytest.mark.Plugins
+def test_command_journal():
+    values: list = []
+    discarded: list = []
+    journal = command_journal.CommandJournal(capacity=3)
+    assert not journal.can_undo and journal.undo() is None and journal.redo() is None
+    for value in range(0, 4):
+        journal.record(AppendCommand(values, value, discarded))
+    assert discarded == [0] and len(journal) == 3, 'The oldest command should be discarded when the journal is full'
+
+    journal.undo()
+    journal.undo()
+    assert values == [0, 1] and journal.can_redo
+    journal.redo()
+    assert values == [0, 1, 2]
+    journal.record(AppendCommand(values, 4, discarded))
+    assert discarded == [0, 3] and not journal.can_redo, 'Recording a command should discard the undone commands'
+
+    for undo_idx in range(0, 3):
+        journal.undo()
+    assert values == [0] and journal.undo() is None
+    journal.clear()
+    assert sorted(discarded) == [0, 1, 2, 3, 4] and len(journal) == 0
+    with pytest.raises(ValueError):
+        command_journal.CommandJournal(capacity=0)
+    with pytest.raises(TypeError):
+        command_journal.Command()
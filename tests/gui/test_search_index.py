@@ -0,0 +1,57 @@
+import time
+import pytest
+
+import plugin_manager.gui.search_index as search_index
+
+from tests.test_tools import attr_error
+
+
+@pytest.mark.Plugins
+def test_search_index():
+    index = search_index.SearchIndex()
+    index.add('a', 'TPS Report entry_point1 select_person')
+    index.add('b', 'Prophet and Loss entry_point2')
+    index.add('c', 'Mission Statement entry_point1 select_person select_dp_type')
+    assert len(index) == 3 and 'b' in index
+    assert index.search('report') == {'a'}
+    assert index.search('ENTRY_POINT1') == {'a', 'c'}
+    assert index.search('select_person entry_point1') == {'a', 'c'}
+    assert index.search('dp_type person') == {'c'}
+    assert index.search('ss') == set(), 'A short term should only match the start of a word'
+    assert index.search('mi') == {'c'}
+    assert index.search('pr lo') == {'b'}
+    assert index.search('oss') == {'b'}
+    assert index.search('xyz') == set() and index.search('prophet xyz') == set()
+    assert index.search('  ') == {'a', 'b', 'c'}
+
+    index.add('b', 'Profit and Gain entry_point2')
+    assert index.search('loss') == set() and index.search('gain') == {'b'}
+    index.remove('a')
+    index.remove('missing')
+    assert index.search('select_person') == {'c'}
+    assert 'tps' not in index.trigram_keys, 'Trigrams no longer used should be dropped'
+
+
+@pytest.mark.Benchmark
+def test_search_index_benchmark():
+    index = search_index.SearchIndex()
+    item_count: int = 20000
+    for item_idx in range(0, item_count):
+        index.add(item_idx, f'Item {item_idx:05d} entry_point{item_idx % 50} select_person')
+    texts = index.texts
+
+    def scan(term: str) -> set:
+        return {key for key, text in texts.items() if term in text}
+
+    start = time.perf_counter()
+    for run_idx in range(0, 10):
+        expected = scan('1234')
+    scan_time: float = time.perf_counter() - start
+    start = time.perf_counter()
+    for run_idx in range(0, 10):
+        matches = index.search('1234')
+    search_time: float = time.perf_counter() - start
+    assert matches == expected and len(matches) == 12
+    print(f'\nSearching {item_count} texts, linear scan: {scan_time * 100:.2f} msec, trigram index: '
+          f'{search_time * 100:.2f} msec')
+    assert search_time < scan_time, attr_error('Search Time', scan_time, search_time)
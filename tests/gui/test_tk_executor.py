@@ -0,0 +1,119 @@
+import threading
+import time
+from typing import Callable, Optional
+import pytest
+
+import plugin_manager.gui.tk_executor as tk_executor
+import plugin_manager.model.plugin as plugin
+
+from tests.test_tools import attr_error
+
+
+class AfterLoop:
+    """
+    Stands in for a Tk widget's after and after_cancel methods, running the scheduled callbacks on the test thread
+    when pump is called
+
+    """
+    def __init__(self):
+        self.thread = threading.current_thread()
+        self.callbacks: dict[str, Callable] = {}
+        self.next_id: int = 0
+
+    def after(self, ms: int, callback: Callable) -> str:
+        self.next_id += 1
+        after_id = f'after#{self.next_id}'
+        self.callbacks[after_id] = callback
+        return after_id
+
+    def after_cancel(self, after_id: str) -> None:
+        self.callbacks.pop(after_id, None)
+
+    def pump(self, until: Callable[[], bool], timeout: float = 5.0) -> None:
+        deadline = time.perf_counter() + timeout
+        while not until():
+            assert time.perf_counter() < deadline, 'Timed out waiting for the after loop'
+            time.sleep(0.001)
+            callbacks, self.callbacks = self.callbacks, {}
+            for callback in callbacks.values():
+                callback()
+
+
+@pytest.mark.Plugins
+def test_tk_call_executor():
+    after_loop = AfterLoop()
+    executor = tk_executor.TkCallExecutor(after_loop, max_workers=2, poll_interval=1)
+    release = threading.Event()
+    results: list[tuple[str, threading.Thread]] = []
+    errors: list[BaseException] = []
+
+    def slow_call(value: str) -> str:
+        release.wait(timeout=5)
+        return value
+
+    assert executor.submit('slow', slow_call, 'first', on_result=lambda result: results.append(
+        (result, threading.current_thread())))
+    assert not executor.submit('slow', slow_call, 'duplicate'), 'A duplicate call should not be submitted'
+    assert executor.submit('error', lambda: 1 / 0, on_error=errors.append)
+    assert executor.metrics.deduplicated == 1 and executor.in_flight_keys() == ['slow', 'error']
+    after_loop.pump(until=lambda: len(errors) == 1)
+    assert isinstance(errors[0], ZeroDivisionError)
+    assert results == []
+    release.set()
+    after_loop.pump(until=lambda: len(results) == 1)
+    assert results == [('first', after_loop.thread)], 'Results should be delivered on the polling thread'
+    assert executor.in_flight_keys() == [] and after_loop.callbacks == {}, 'Polling should stop when idle'
+    assert executor.submit('slow', slow_call, 'again'), 'A finished call may be submitted again'
+    after_loop.pump(until=lambda: executor.metrics.delivered == 3)
+    metrics = executor.metrics
+    assert (metrics.submitted, metrics.completed, metrics.failed) == (3, 2, 1), f'Metrics {metrics}'
+    assert metrics.max_run >= metrics.mean_run > 0 and metrics.max_delivery >= metrics.mean_delivery >= 0
+    executor.shutdown()
+
+
+@pytest.mark.Plugins
+def test_tk_call_executor_create_menu():
+    after_loop = AfterLoop()
+    results: list = []
+    executor = tk_executor.TkCallExecutor(after_loop, poll_interval=1, result_action=results.append)
+    selections: list[tuple] = []
+
+    def selection_action(select_person: bool, select_date_range: bool, select_dp_type: bool, entry_point: Callable):
+        selections.append((threading.current_thread(), select_person, select_date_range, select_dp_type))
+        return entry_point('person')
+
+    item = plugin.PluginMenuItem(title='Report', entry_point_name='dumps', select_person=True,
+                                 select_date_range=True, select_dp_type=False)
+    added: list[tuple[str, Callable]] = []
+    menu = plugin.PluginMenu(title='Menu', module_name='json', items=[item])
+    for lazy in (False, True):
+        menu.create_menu(not_found_action=lambda msg=None: msg, selection_action=selection_action,
+                         add_menu_item=lambda label, action: added.append((label, action)), add_menu=lambda label: None,
+                         module_cache=plugin.ModuleCache(), lazy=lazy, wrap_entry_point=executor.wrap_entry_point)
+    assert added[0][1]() is True and added[0][1]() is False, 'A second click should be deduplicated'
+    after_loop.pump(until=lambda: len(results) == 1)
+    assert results == ['"person"'] and selections[0] == (after_loop.thread, True, True, False)
+    added[1][1]()
+    after_loop.pump(until=lambda: len(results) == 2)
+    assert executor.metrics.submitted == 2 and executor.metrics.deduplicated == 1
+    executor.shutdown()
+
+
+@pytest.mark.Benchmark
+def test_tk_call_executor_responsiveness():
+    after_loop = AfterLoop()
+    executor = tk_executor.TkCallExecutor(after_loop, max_workers=4, poll_interval=1)
+    finished: list[str] = []
+    start = time.perf_counter()
+    for call_idx in range(0, 8):
+        executor.submit(call_idx, time.sleep, 0.05, on_result=lambda result, idx=call_idx: finished.append(idx))
+    submit_time: float = time.perf_counter() - start
+    after_loop.pump(until=lambda: len(finished) == 8)
+    elapsed: float = time.perf_counter() - start
+    metrics = executor.metrics
+    print(f'\n8 calls of 50 msec on 4 threads, submit: {submit_time * 1000:.2f} msec, total: {elapsed * 1000:.1f} '
+          f'msec, max queue depth: {metrics.max_queue_depth}, mean wait: {metrics.mean_wait * 1000:.1f} msec, '
+          f'mean delivery: {metrics.mean_delivery * 1000:.2f} msec')
+    assert submit_time < 0.05, attr_error('Submit Time', 0.05, submit_time)
+    assert metrics.max_queue_depth >= 4
+    executor.shutdown()
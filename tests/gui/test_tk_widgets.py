@@ -0,0 +1,470 @@
+import os
+import pathlib
+import time
+import tkinter as tk
+import pytest
+
+import plugin_manager.gui.tk_executor as tk_executor
+import plugin_manager.model.entry_points as entry_points
+import plugin_manager.model.workspace as workspace
+import plugin_manager.model.plugin as plugin
+
+from tests.plugin_fixtures import corpus_plugin, write_plugin_corpus, write_plugin_module
+from tests.test_tools import attr_error
+from tests.model.test_plugin import compare_plugin
+
+tk_widgets = pytest.importorskip('plugin_manager.gui.tk_widgets')
+ttkb = pytest.importorskip('ttkbootstrap')
+
+
+@pytest.fixture
+def tk_root():
+    """
+    Provides a hidden ttkbootstrap Window for the widgets under test, skipping the test if no display is available
+
+    """
+    try:
+        root = ttkb.Window(themename='darkly')
+    except tk.TclError:
+        pytest.skip('A display is required to create Tk widgets')
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+def ignore_event(event=None) -> None:
+    pass
+
+
+@pytest.mark.Plugins
+def test_menu_tree_registry(tk_root):
+    corpus = corpus_plugin(0, menu_count=2, item_count=3)
+    tree = tk_widgets.PluginMenuTree(tk_root, select_menu_action=ignore_event, select_item_action=ignore_event,
+                                     menus=corpus.menus)
+    menu_iids = tree.get_children('')
+    assert tree.node_object(menu_iids[0]) is corpus.menus[0]
+    item_iid = tree.get_children(menu_iids[1])[2]
+    assert tree.node_object(item_iid) is corpus.menus[1].items[2]
+    assert tree.set(item_iid, tk_widgets.PluginMenuTree.ITEM_STR) == corpus.menus[1].items[2].__str__()
+    tree.delete(menu_iids[0])
+    assert len(tree.nodes) == 4, 'Deleting a menu node should discard the objects of the menu and its items'
+    with pytest.raises(ValueError):
+        tree.node_object(menu_iids[0])
+    rebuilt = tree.rebuild_plugin(corpus_plugin(0, menu_count=0))
+    assert [menu.title for menu in rebuilt.menus] == ['Menu 1']
+    assert len(rebuilt.menus[0].items) == 3
+
+
+@pytest.mark.Benchmark
+def test_menu_tree_rebuild_benchmark(tk_root):
+    corpus = corpus_plugin(0, menu_count=50, item_count=99)
+    tree = tk_widgets.PluginMenuTree(tk_root, select_menu_action=ignore_event, select_item_action=ignore_event,
+                                     menus=corpus.menus)
+    tree.populate_all()
+    assert len(tree.nodes) == 5000
+
+    start = time.perf_counter()
+    for menu in corpus.menus:
+        eval(menu.__repr__(), {'model': plugin})
+        for item in menu.items:
+            eval(item.__repr__(), {'model': plugin})
+    eval_time: float = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rebuilt = tree.rebuild_plugin(corpus_plugin(0, menu_count=0))
+    rebuild_time: float = time.perf_counter() - start
+    compare_plugin(rebuilt, corpus_plugin(0, menu_count=50, item_count=99))
+    print(f'\nRebuilding a 5000 node tree, eval of each node: {eval_time * 1000:.1f} msec, registry rebuild: '
+          f'{rebuild_time * 1000:.1f} msec')
+    assert rebuild_time < eval_time, attr_error('Rebuild Time', eval_time, rebuild_time)
+
+
+@pytest.mark.Plugins
+def test_menu_tree_lazy_population(tk_root):
+    corpus = corpus_plugin(0, menu_count=20, item_count=50)
+    tree = tk_widgets.PluginMenuTree(tk_root, select_menu_action=ignore_event, select_item_action=ignore_event,
+                                     menus=corpus.menus)
+    menu_iids = tree.get_children('')
+    assert len(menu_iids) == 20, 'Every menu node should be inserted up front'
+    assert len(tree.nodes) == 20 + tk_widgets.PluginMenuTree.POPULATE_BATCH
+    assert tree.get_children(menu_iids[-1]) == ()
+    rebuilt = tree.rebuild_plugin(corpus_plugin(0, menu_count=0))
+    compare_plugin(rebuilt, corpus_plugin(0, menu_count=20, item_count=50))
+
+    tree.focus(menu_iids[-1])
+    tree.open_menu(None)
+    assert len(tree.get_children(menu_iids[-1])) == 50
+    assert tree.item(tree.get_children(menu_iids[-1])[0], 'values')[1] == corpus.menus[-1].items[0].__str__()
+    tree.delete(menu_iids[-2])
+    assert menu_iids[-2] not in tree.pending
+    tree.populate_all()
+    assert len(tree.nodes) == 19 * 51
+
+
+@pytest.mark.Benchmark
+def test_menu_tree_open_benchmark(tk_root):
+    open_times: list[float] = []
+    for item_count in (10, 1000):
+        corpus = corpus_plugin(0, menu_count=20, item_count=item_count)
+        start = time.perf_counter()
+        tree = tk_widgets.PluginMenuTree(tk_root, select_menu_action=ignore_event, select_item_action=ignore_event,
+                                         menus=corpus.menus)
+        tree.update_idletasks()
+        open_times.append(time.perf_counter() - start)
+        tree.destroy()
+    print(f'\nOpening a tree of 20 menus, 10 items each: {open_times[0] * 1000:.1f} msec, 1000 items each: '
+          f'{open_times[1] * 1000:.1f} msec')
+    assert open_times[1] < open_times[0] * 20, attr_error('Open Time', open_times[0] * 20, open_times[1])
+
+
+def count_get_children(tree) -> list:
+    """
+    Record the nodes whose children the tree lists, to check how much of the tree a rebuild walks
+
+    """
+    calls: list = []
+    get_children = tree.get_children
+
+    def counted_get_children(item=None):
+        calls.append(item)
+        return get_children(item)
+    tree.get_children = counted_get_children
+    return calls
+
+
+@pytest.mark.Plugins
+def test_menu_tree_dirty_tracking(tk_root):
+    corpus = corpus_plugin(0, menu_count=10, item_count=5)
+    tree = tk_widgets.PluginMenuTree(tk_root, select_menu_action=ignore_event, select_item_action=ignore_event,
+                                     menus=corpus.menus)
+    menu_iids = tree.get_children('')
+    tree.rebuild_plugin(corpus)
+    assert not tree.modified
+    calls = count_get_children(tree)
+    tree.rebuild_plugin(corpus)
+    assert calls == [], 'A rebuild with no edits should not walk the tree'
+
+    item_iid, new_item = tree.insert_menu_item(menu_iids[3], 2)
+    calls.clear()
+    assert tree.modified
+    tree.rebuild_plugin(corpus)
+    assert calls == [menu_iids[3]], 'Only the edited menu should be rebuilt'
+    assert corpus.menus[3].items[2] is new_item and len(corpus.menus[3].items) == 6
+
+    new_item.title = 'Edited Item'
+    tree.save_item_attr(item_iid, new_item)
+    calls.clear()
+    tree.rebuild_plugin(corpus)
+    assert calls == [] and corpus.menus[3].items[2].title == 'Edited Item'
+
+    tree.delete(*tree.get_children(menu_iids[5]))
+    tree.delete(menu_iids[0])
+    calls.clear()
+    tree.rebuild_plugin(corpus)
+    assert calls == [menu_iids[5], '']
+    assert [menu.title for menu in corpus.menus] == [f'Menu {menu_idx}' for menu_idx in (1, 2, 3, 4, 6, 7, 8, 9)]
+
+
+@pytest.mark.Benchmark
+def test_menu_tree_save_benchmark(tk_root):
+    corpus = corpus_plugin(0, menu_count=50, item_count=99)
+    tree = tk_widgets.PluginMenuTree(tk_root, select_menu_action=ignore_event, select_item_action=ignore_event,
+                                     menus=corpus.menus)
+    tree.populate_all()
+    for menu_iid in tree.get_children(''):
+        tree.dirty_menus.add(menu_iid)
+    start = time.perf_counter()
+    tree.rebuild_plugin(corpus)
+    full_time: float = time.perf_counter() - start
+
+    menu_iids = tree.get_children('')
+    start = time.perf_counter()
+    for save_idx in range(0, 10):
+        tree.insert_menu_item(menu_iids[save_idx], 0)
+        tree.rebuild_plugin(corpus)
+    incremental_time: float = (time.perf_counter() - start) / 10
+    assert sum(len(menu.items) for menu in corpus.menus) == 4960
+    print(f'\nSaving a 5000 node tree, full rebuild: {full_time * 1000:.2f} msec, rebuild after one edit: '
+          f'{incremental_time * 1000:.2f} msec')
+    assert incremental_time < full_time, attr_error('Save Time', full_time, incremental_time)
+
+
+def pump_until(root, until, timeout: float = 5.0) -> None:
+    """
+    Run the Tk event loop until the provided condition is met
+
+    """
+    deadline = time.perf_counter() + timeout
+    while not until():
+        assert time.perf_counter() < deadline, 'Timed out waiting for the Tk event loop'
+        root.update()
+        time.sleep(0.001)
+
+
+@pytest.mark.Plugins
+def test_entry_point_widget_background(tk_root, tmp_path):
+    write_plugin_module(tmp_path, 'background_package.background_module', ['action1', 'action2'])
+    discovery = entry_points.EntryPointDiscovery(search_path=[str(tmp_path)])
+    executor = tk_executor.TkCallExecutor(tk_root)
+    try:
+        widget = tk_widgets.EntryPointWidget(tk_root, 'background_package.background_module', 'action2', 0, 0,
+                                             discovery=discovery, executor=executor)
+        assert widget.loading and widget.entry_point_name_var.get() == tk_widgets.EntryPointWidget.LOADING_TEXT
+        assert widget.get_entry_point_name() == 'action2'
+        pump_until(tk_root, lambda: not widget.loading)
+        assert widget.get_entry_point_names() == ['action1', 'action2']
+        assert widget.get_entry_point_name() == 'action2'
+
+        cached = tk_widgets.EntryPointWidget(tk_root, 'background_package.background_module', 'action1', 0, 0,
+                                             discovery=discovery, executor=executor)
+        assert not cached.loading and cached.get_entry_point_name() == 'action1', \
+            'Cached entry points should be listed without waiting for the executor'
+        widget.load_entry_points('background_package.missing_module', 'action1')
+        pump_until(tk_root, lambda: not widget.loading)
+        assert widget.get_entry_point_names() == ['action1'] and widget.get_entry_point_name() == 'action1', \
+            'An entry point name that is not found should be kept rather than cleared'
+        widget.load_entry_points('background_package.missing_module', '')
+        pump_until(tk_root, lambda: not widget.loading)
+        assert widget.get_entry_point_names() == [] and widget.get_entry_point_name() == ''
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.Plugins
+def test_entry_point_widget_switch_module(tk_root, tmp_path):
+    write_plugin_module(tmp_path, 'switch_package.cached_module', ['action1'])
+    write_plugin_module(tmp_path, 'switch_package.loading_module', ['action2'])
+    discovery = entry_points.EntryPointDiscovery(search_path=[str(tmp_path)])
+    discovery.entry_points('switch_package.cached_module')
+    executor = tk_executor.TkCallExecutor(tk_root)
+    try:
+        widget = tk_widgets.EntryPointWidget(tk_root, 'switch_package.loading_module', 'action2', 0, 0,
+                                             discovery=discovery, executor=executor)
+        assert widget.loading and str(widget.combo.cget('state')) == tk.DISABLED
+        widget.load_entry_points('switch_package.cached_module', 'action1')
+        assert str(widget.combo.cget('state')) == tk.NORMAL, \
+            'Switching to a cached module while loading should enable the combobox'
+        pump_until(tk_root, lambda: discovery.cached_entry_points('switch_package.loading_module') is not None)
+        tk_root.update()
+        assert str(widget.combo.cget('state')) == tk.NORMAL
+        assert widget.get_entry_point_names() == ['action1'] and widget.get_entry_point_name() == 'action1'
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.Plugins
+def test_entry_point_widget_reexported(tk_root, tmp_path):
+    write_plugin_module(tmp_path, 'reexport_package.reexport_module', ['action1'],
+                        source='from os.path import join as report\nalias = report\n')
+    discovery = entry_points.EntryPointDiscovery(search_path=[str(tmp_path)])
+    widget = tk_widgets.EntryPointWidget(tk_root, 'reexport_package.reexport_module', 'alias', 0, 0,
+                                         discovery=discovery)
+    assert widget.get_entry_point_names() == ['report', 'alias', 'action1']
+    assert widget.get_entry_point_name() == 'alias', 'A re-exported or assigned entry point should be selected'
+
+
+def widget_count(widget) -> int:
+    return 1 + sum(widget_count(child) for child in widget.winfo_children())
+
+
+def current_rss() -> int:
+    """
+    Returns the resident set size of the test process in bytes, skipping the test if it can not be read
+
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        pytest.skip('The resident set size can not be read on this platform')
+
+
+@pytest.mark.Benchmark
+def test_plugin_widget_footer_pooling(tk_root):
+    corpus = corpus_plugin(0, menu_count=10, item_count=99)
+    plugin_widget = tk_widgets.PluginWidget(tk_root, plugin=corpus)
+    tree = plugin_widget.menu_tree
+    tree.populate_all()
+    iids: list[str] = []
+    for menu_iid in tree.get_children(''):
+        iids.append(menu_iid)
+        iids.extend(tree.get_children(menu_iid))
+
+    def click(iid: str) -> None:
+        tree.selection_set(iid)
+        if tree.parent(iid) == '':
+            plugin_widget.select_menu(None)
+        else:
+            plugin_widget.select_menu_item(None)
+        tk_root.update_idletasks()
+
+    for iid in iids[0:100]:
+        click(iid)
+    widgets_before: int = widget_count(tk_root)
+    rss_before: int = current_rss()
+    for iid in iids[0:1000]:
+        click(iid)
+    plugin_widget.cancel()
+    widgets_after: int = widget_count(tk_root)
+    rss_after: int = current_rss()
+    print(f'\nClicking through 1000 nodes, Tk widgets: {widgets_before} before, {widgets_after} after, RSS growth: '
+          f'{(rss_after - rss_before) / 1024:.0f} KB')
+    assert widgets_after == widgets_before, attr_error('Widget Count', widgets_before, widgets_after)
+    assert plugin_widget.footer_widget is plugin_widget.blank_footer
+    assert rss_after - rss_before < 8 * 1024 * 1024, attr_error('RSS Growth', 0, rss_after - rss_before)
+    plugin_widget.destroy()
+
+
+@pytest.mark.Plugins
+def test_menu_tree_filter(tk_root):
+    corpus = corpus_plugin(0, menu_count=3, item_count=4)
+    corpus.menus[1].items[2].title = 'Quarterly Report'
+    corpus.menus[2].items[0].entry_point_name = 'report_action'
+    tree = tk_widgets.PluginMenuTree(tk_root, select_menu_action=ignore_event, select_item_action=ignore_event,
+                                     menus=corpus.menus)
+    menu_iids = tree.get_children('')
+    item_iids = {menu_iid: tree.get_children(menu_iid) for menu_iid in menu_iids}
+    assert tree.filter('report') == 2
+    assert tree.get_children('') == (menu_iids[1], menu_iids[2])
+    assert tree.get_children(menu_iids[1]) == (item_iids[menu_iids[1]][2], )
+    assert tree.get_children(menu_iids[2]) == (item_iids[menu_iids[2]][0], )
+
+    corpus.menus[0].items[3].title = 'Annual Report'
+    tree.save_item_attr(item_iids[menu_iids[0]][3], corpus.menus[0].items[3])
+    assert tree.filter('repor') == 3, 'A saved node should be indexed again'
+    assert tree.get_children('') == menu_iids
+    assert tree.get_children(menu_iids[0]) == (item_iids[menu_iids[0]][3], )
+    assert tree.filter('select_person item') == 5
+    assert tree.get_children(menu_iids[0]) == (item_iids[menu_iids[0]][0], item_iids[menu_iids[0]][2])
+    assert tree.get_children(menu_iids[1]) == (item_iids[menu_iids[1]][0], )
+
+    tree.filter('')
+    assert tree.get_children('') == menu_iids
+    assert all(tree.get_children(menu_iid) == item_iids[menu_iid] for menu_iid in menu_iids)
+    tree.filter('quarterly')
+    tree.insert_menu_item(menu_iids[0], 0)
+    assert tree.visible is None and len(tree.get_children(menu_iids[2])) == 4, \
+        'Inserting a node should clear the filter'
+
+
+@pytest.mark.Plugins
+def test_menu_tree_filter_pending(tk_root, monkeypatch):
+    monkeypatch.setattr(tk_widgets.PluginMenuTree, 'POPULATE_BATCH', 4)
+    corpus = corpus_plugin(0, menu_count=3, item_count=4)
+    corpus.menus[1].items[2].title = 'Quarterly Report'
+    tree = tk_widgets.PluginMenuTree(tk_root, select_menu_action=ignore_event, select_item_action=ignore_event,
+                                     menus=corpus.menus)
+    menu_iids = tree.get_children('')
+    assert set(tree.pending) == {menu_iids[1], menu_iids[2]}
+    assert tree.filter('quarterly') == 1
+    assert set(tree.pending) == {menu_iids[2]}, 'Only the menu of a matching pending item should be populated'
+    assert tree.get_children('') == (menu_iids[1], )
+    assert len(tree.get_children(menu_iids[1])) == 1
+    assert not any(parent_iid == menu_iids[0] for parent_iid in tree.node_parents.values()), \
+        'The item nodes of a menu that is not shown should not be looked at'
+
+    tree.filter('')
+    assert tree.get_children('') == menu_iids
+    assert len(tree.get_children(menu_iids[0])) == 4 and len(tree.get_children(menu_iids[1])) == 4
+    assert menu_iids[2] in tree.pending
+
+
+@pytest.mark.Plugins
+def test_workspace_list(tk_root, tmp_path):
+    plugin_path = write_plugin_corpus(pathlib.Path(tmp_path, 'plugins'), 3)
+    plugin_workspace = workspace.Workspace(plugin_path)
+    workspace_list = tk_widgets.WorkspaceList(tk_root, select_action=ignore_event)
+    headers = plugin_workspace.headers()
+    workspace_list.set_headers(headers)
+    assert workspace_list.get_children('') == tuple(str(header.json_path) for header in headers)
+    assert str(workspace_list.item(str(headers[1].json_path), 'values')[2]) == '2'
+    workspace_list.selection_set(str(headers[2].json_path))
+    assert workspace_list.selected_path() == headers[2].json_path
+
+    edited_plugin = plugin_workspace.plugin(headers[1].json_path)
+    plugin_widget = tk_widgets.PluginWidget(tk_root, plugin=edited_plugin)
+    assert not plugin_widget.modified
+    plugin_widget.name_widget.set_value('Renamed Plugin')
+    assert plugin_widget.modified, 'An edit of the general info should be detected'
+    header = plugin_workspace.saved(headers[1].json_path, plugin_widget.rebuild_plugin())
+    workspace_list.update_header(header)
+    assert workspace_list.item(str(header.json_path), 'values')[0] == 'Renamed Plugin'
+    assert not plugin_widget.modified
+    plugin_widget.destroy()
+
+
+@pytest.mark.Plugins
+def test_plugin_widget_undo(tk_root):
+    corpus = corpus_plugin(0, menu_count=3, item_count=4)
+    plugin_widget = tk_widgets.PluginWidget(tk_root, plugin=corpus, journal_size=3)
+    tree = plugin_widget.menu_tree
+    tree.populate_all()
+    menu_iids = tree.get_children('')
+    item_iid = tree.get_children(menu_iids[1])[2]
+
+    def select(iid: str) -> None:
+        tree.selection_set(iid)
+        if tree.parent(iid) == '':
+            plugin_widget.select_menu(None)
+        else:
+            plugin_widget.select_menu_item(None)
+
+    select(item_iid)
+    plugin_widget.menu_item_widget.title_widget.set_value('Renamed Item')
+    plugin_widget.save_menu_item()
+    assert tree.node_object(item_iid).title == 'Renamed Item'
+    select(item_iid)
+    plugin_widget.delete()
+    assert item_iid not in tree.nodes and tree.exists(item_iid), 'A deleted node should be detached, not deleted'
+    select(menu_iids[0])
+    plugin_widget.insert_below()
+    new_menu_iid = plugin_widget.current_menu_iid
+    assert tree.get_children('')[1] == new_menu_iid
+
+    plugin_widget.undo()
+    assert tree.get_children('') == menu_iids
+    plugin_widget.undo()
+    assert tree.get_children(menu_iids[1])[2] == item_iid and tree.node_object(item_iid).title == 'Renamed Item'
+    plugin_widget.undo()
+    assert tree.node_object(item_iid).title == 'Item 1.2' and not plugin_widget.journal.can_undo
+    plugin_widget.redo()
+    plugin_widget.redo()
+    rebuilt = plugin_widget.rebuild_plugin()
+    assert [item.title for item in rebuilt.menus[1].items] == ['Item 1.0', 'Item 1.1', 'Item 1.3']
+    assert len(rebuilt.menus) == 3
+
+    select(menu_iids[2])
+    plugin_widget.delete()
+    assert not tree.exists(new_menu_iid), 'Recording an edit should free the nodes of the undone insert'
+    select(menu_iids[0])
+    plugin_widget.insert_above()
+    select(menu_iids[0])
+    plugin_widget.insert_above()
+    assert not tree.exists(item_iid), 'A deletion dropped from the full journal should free its detached node'
+    assert len(plugin_widget.journal) == 3
+    plugin_widget.destroy()
+
+
+@pytest.mark.Benchmark
+def test_plugin_widget_undo_benchmark(tk_root):
+    corpus = corpus_plugin(0, menu_count=200, item_count=100)
+    start = time.perf_counter()
+    plugin_widget = tk_widgets.PluginWidget(tk_root, plugin=corpus)
+    tree = plugin_widget.menu_tree
+    tree.populate_all()
+    reload_time: float = time.perf_counter() - start
+    item_iids: list[str] = [tree.get_children(menu_iid)[50] for menu_iid in tree.get_children('')[0:100]]
+
+    start = time.perf_counter()
+    for iid in item_iids:
+        plugin_widget.record(tk_widgets.NodeCommand(tree, iid, inserted=False))
+    for iid in item_iids:
+        plugin_widget.undo()
+    for iid in item_iids:
+        plugin_widget.redo()
+    edit_time: float = (time.perf_counter() - start) / (3 * len(item_iids))
+    print(f'\nTree of {len(tree.nodes) + len(item_iids)} nodes, rebuilding: {reload_time * 1000:.1f} msec, '
+          f'delete, undo or redo: {edit_time * 1000:.3f} msec')
+    assert tree.get_children(tree.get_children('')[0])[50] != item_iids[0]
+    assert edit_time * 100 < reload_time, attr_error('Undo Time', reload_time / 100, edit_time)
+    plugin_widget.destroy()
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+from typing import Any
+import pytest
+
+import plugin_manager.model.async_menu as async_menu
+import plugin_manager.model.plugin as plugin
+
+from tests.plugin_fixtures import write_plugin_module
+from tests.test_tools import attr_error
+
+ASYNC_SOURCE = '''
+import asyncio
+import threading
+
+
+async def async_action(*args):
+    await asyncio.sleep(0)
+    return 'async_action', args
+
+
+async def slow_action(*args):
+    await asyncio.sleep(10)
+
+
+def thread_action(*args):
+    return threading.current_thread().name
+'''
+
+
+def menu_items(entry_point_names: list[str]) -> list[plugin.PluginMenuItem]:
+    return [plugin.PluginMenuItem(title=f'Item {name}', entry_point_name=name, select_person=idx == 0,
+                                  select_date_range=False, select_dp_type=True)
+            for idx, name in enumerate(entry_point_names)]
+
+
+@pytest.mark.Plugins
+def test_create_menu_async(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(tmp_path)
+    write_plugin_module(tmp_path, 'async_package.async_module', ['action1'], source=ASYNC_SOURCE)
+    menus = [plugin.PluginMenu(title='Async Menu', module_name='async_package.async_module',
+                               items=menu_items(['async_action', 'action1', 'thread_action', 'missing_action'])),
+             plugin.PluginMenu(title='Missing Menu', module_name='async_package.missing_module',
+                               items=menu_items(['action1']))]
+
+    async def not_found_action(msg: str = 'not found') -> str:
+        return msg
+
+    async def run() -> tuple[list[tuple[str, Any]], list[str], list[Any]]:
+        added: list[tuple[str, Any]] = []
+        menu_titles: list[str] = []
+
+        async def add_menu(label: str) -> None:
+            menu_titles.append(label)
+
+        await async_menu.create_menus_async(menus, not_found_action, None,
+                                            lambda label, action: added.append((label, action)), add_menu,
+                                            module_cache=plugin.ModuleCache())
+        results = [await action('arg') for label, action in added]
+        return added, menu_titles, results
+
+    added, menu_titles, results = asyncio.run(run())
+    assert menu_titles == ['Async Menu', 'Missing Menu']
+    assert [label for label, action in added] == ['Item async_action', 'Item action1', 'Item thread_action',
+                                                  'Item missing_action', 'Item action1 not found']
+    assert results[0] == ('async_action', ('arg',))
+    assert results[1] == ('action1', ('arg',))
+    assert results[2] != threading.main_thread().name, 'Synchronous entry points should run off the event loop'
+    assert results[3] == 'Entry Point missing_action not found in module async_package.async_module'
+    assert results[4] == 'not found'
+
+
+@pytest.mark.Plugins
+def test_async_selection_timeout_and_cancel(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(tmp_path)
+    write_plugin_module(tmp_path, 'async_sel_package.async_module', ['action1'], source=ASYNC_SOURCE)
+    menu = plugin.PluginMenu(title='Async Menu', module_name='async_sel_package.async_module',
+                             items=menu_items(['async_action', 'slow_action']))
+    selections: list[tuple] = []
+
+    async def selection_action(select_person: bool, select_date_range: bool, select_dp_type: bool, entry_point):
+        selections.append((select_person, select_date_range, select_dp_type))
+        await asyncio.sleep(0)
+        return entry_point('selected')
+
+    async def run() -> None:
+        added: list[tuple[str, Any]] = []
+        await async_menu.create_menu_async(menu, lambda msg=None: msg, selection_action,
+                                           lambda label, action: added.append((label, action)), lambda label: None,
+                                           module_cache=plugin.ModuleCache(), timeout=0.05)
+        assert await added[0][1]() == ('async_action', ('selected',))
+        assert selections == [(True, False, True)]
+        with pytest.raises(asyncio.TimeoutError):
+            await added[1][1]()
+        task = added[1][1].loop.create_task(added[1][1].invoke(timeout=5))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        def call_from_thread():
+            return added[0][1]().result(timeout=5)
+
+        result = await asyncio.get_running_loop().run_in_executor(None, call_from_thread)
+        assert result == ('async_action', ('selected',))
+
+    asyncio.run(run())
+
+
+@pytest.mark.Benchmark
+def test_create_menu_async_benchmark(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(tmp_path)
+    module_count: int = 8
+    for module_idx in range(0, module_count):
+        write_plugin_module(tmp_path, f'async_bench_package.module{module_idx}', ['action1'],
+                            source='import time\ntime.sleep(0.05)\n')
+    menus = [plugin.PluginMenu(title=f'Menu {module_idx}', module_name=f'async_bench_package.module{module_idx}',
+                               items=menu_items(['action1'])) for module_idx in range(0, module_count)]
+
+    async def run() -> tuple[float, int]:
+        ticks: int = 0
+        building = True
+
+        async def ticker():
+            nonlocal ticks
+            while building:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        ticker_task = asyncio.get_running_loop().create_task(ticker())
+        start = time.perf_counter()
+        await async_menu.create_menus_async(menus, lambda msg=None: msg, None, lambda label, action: None,
+                                            lambda label: None, module_cache=plugin.ModuleCache())
+        elapsed = time.perf_counter() - start
+        building = False
+        await ticker_task
+        return elapsed, ticks
+
+    elapsed, ticks = asyncio.run(run())
+    print(f'\n{module_count} modules taking 50 msec to import, async menu build: {elapsed * 1000:.1f} msec, '
+          f'event loop ticks during the build: {ticks}')
+    assert elapsed < module_count * 0.05, attr_error('Menu Build Time', module_count * 0.05, elapsed)
+    assert ticks > 3, 'The event loop should keep running while modules are imported'
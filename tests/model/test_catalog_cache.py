@@ -0,0 +1,150 @@
+import os
+import pathlib
+import marshal
+import time
+import pytest
+
+import plugin_manager.model.catalog_cache as cc
+import plugin_manager.model.json_handler as jh
+
+from tests.plugin_fixtures import corpus_plugin, write_plugin_corpus
+from tests.test_tools import attr_error
+from tests.model.test_plugin import compare_plugin
+
+
+def age_files(plugin_path: pathlib.Path, seconds: int = 60) -> None:
+    """
+    Move the modification times of the plugin files back, so they fall outside the cache's modification time race
+    window
+
+    """
+    for json_path in plugin_path.glob('*.json'):
+        stat = json_path.stat()
+        os.utime(json_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 1_000_000_000))
+
+
+@pytest.mark.Plugins
+def test_catalog_cache_incremental(tmp_path):
+    plugin_path = write_plugin_corpus(pathlib.Path(tmp_path, 'plugins'), 20)
+    age_files(plugin_path)
+    cache = cc.CatalogCache(plugin_path)
+    assert cache.cache_path.parent == tmp_path, 'The cache should be stored next to the plugin folder'
+    plugins = cache.load()
+    assert cache.stats.full_load and cache.stats.decoded == 20, f'Cold load stats {cache.stats}'
+    for plugin, check_plugin in zip([corpus_plugin(idx) for idx in range(0, 20)], plugins):
+        compare_plugin(plugin, check_plugin)
+
+    plugins = cache.load()
+    assert not cache.stats.full_load, 'Warm load should use the cache'
+    assert (cache.stats.reused, cache.stats.decoded) == (20, 0), f'Warm load stats {cache.stats}'
+    assert len(plugins) == 20
+
+    changed = corpus_plugin(3)
+    changed.description = 'Changed description'
+    jh.save_plugins([changed], plugin_path)
+    pathlib.Path(plugin_path, 'Corpus_Author-Corpus_Plugin_00003.json').replace(
+        pathlib.Path(plugin_path, 'corpus-00003.json'))
+    pathlib.Path(plugin_path, 'corpus-00007.json').unlink()
+    write_plugin_corpus(plugin_path, 1, start=20)
+    plugins = cache.load()
+    assert (cache.stats.decoded, cache.stats.removed) == (2, 1), f'Incremental load stats {cache.stats}'
+    assert sorted(cache.stats.changed_files) == ['corpus-00003.json', 'corpus-00020.json']
+    assert len(plugins) == 20
+    assert plugins[3].description == 'Changed description', \
+        attr_error('Description', 'Changed description', plugins[3].description)
+
+    touched = pathlib.Path(plugin_path, 'corpus-00005.json')
+    os.utime(touched, ns=(touched.stat().st_atime_ns, touched.stat().st_mtime_ns + 1_000_000_000))
+    cache.load()
+    assert cache.stats.decoded == 0, 'A file with a new mtime and unchanged contents should not be decoded'
+
+
+@pytest.mark.Plugins
+def test_catalog_cache_fallback(tmp_path):
+    plugin_path = write_plugin_corpus(pathlib.Path(tmp_path, 'plugins'), 5)
+    cache = cc.CatalogCache(plugin_path)
+    cache.load()
+
+    cache.cache_path.write_bytes(cache.cache_path.read_bytes()[:40])
+    plugins = cache.load()
+    assert cache.stats.full_load and len(plugins) == 5, 'A corrupt cache should fall back to a full load'
+
+    cache.cache_path.write_bytes(marshal.dumps({'version': cc.CACHE_VERSION + 1, 'written_ns': time.time_ns(),
+                                                'entries': {}}))
+    plugins = cache.load()
+    assert cache.stats.full_load and len(plugins) == 5, 'A cache version mismatch should fall back to a full load'
+    cache.load()
+    assert not cache.stats.full_load, 'The cache should be rewritten after a fallback'
+
+
+@pytest.mark.Plugins
+def test_catalog_cache_race_window(tmp_path):
+    plugin_path = write_plugin_corpus(pathlib.Path(tmp_path, 'plugins'), 5)
+    age_files(plugin_path)
+    cache = cc.CatalogCache(plugin_path)
+    cache.load()
+    cached = marshal.loads(cache.cache_path.read_bytes())
+    newest_ns: int = max(json_path.stat().st_mtime_ns for json_path in plugin_path.glob('*.json'))
+    cached['written_ns'] = newest_ns + cc.MTIME_RACE_NS // 2
+    cache.cache_path.write_bytes(marshal.dumps(cached))
+    cache.load()
+    assert (cache.stats.verified, cache.stats.decoded) == (5, 0), f'Racy load stats {cache.stats}'
+    cache.load()
+    assert cache.stats.verified == 0, 'Files verified by hash should not be hashed again once outside the window'
+
+
+@pytest.mark.Plugins
+def test_catalog_cache_non_plugin_json(tmp_path):
+    plugin_path = write_plugin_corpus(pathlib.Path(tmp_path, 'plugins'), 3)
+    pathlib.Path(plugin_path, 'settings.json').write_text('{}')
+    pathlib.Path(plugin_path, 'values.json').write_text('[1, 2, 3]')
+    cache = cc.CatalogCache(plugin_path)
+    assert len(cache.load()) == 3, 'JSON files that do not hold a Plugin should be skipped'
+    assert len(cache.load()) == 3 and not cache.stats.full_load
+
+
+@pytest.mark.Plugins
+def test_catalog_cache_file_records(tmp_path):
+    plugin_path = pathlib.Path(tmp_path, 'plugins')
+    plugin_path.mkdir()
+    jh.save_plugins([corpus_plugin(idx) for idx in range(0, 3)], plugin_path)
+    cache = cc.CatalogCache(plugin_path)
+    assert jh.save_plugins(cache.load(), plugin_path).written == []
+    assert jh.save_plugins(cache.load(), plugin_path).written == [], \
+        'Plugins read from the cache should record their files, so an unchanged save writes nothing'
+
+
+@pytest.mark.Plugins
+def test_catalog_cache_unwritable(tmp_path, monkeypatch):
+    plugin_path = write_plugin_corpus(pathlib.Path(tmp_path, 'plugins'), 3)
+
+    def refuse_temp_file(*args, **kwargs):
+        raise PermissionError('Permission denied')
+
+    monkeypatch.setattr(cc.tempfile, 'mkstemp', refuse_temp_file)
+    cache = cc.CatalogCache(plugin_path)
+    assert [plugin.name for plugin in cache.load()] == [corpus_plugin(idx).name for idx in range(0, 3)], \
+        'A cache that can not be written should not stop the Plugins loading'
+    assert cache.stats.full_load and not cache.cache_path.exists()
+
+
+@pytest.mark.Benchmark
+def test_catalog_cache_warm_start(tmp_path):
+    plugin_path = write_plugin_corpus(pathlib.Path(tmp_path, 'plugins'), 2000)
+    age_files(plugin_path)
+    start = time.perf_counter()
+    cold_plugins = cc.retrieve_plugins_cached(plugin_path)
+    cold = time.perf_counter() - start
+    warm: float = float('inf')
+    uncached: float = float('inf')
+    for attempt in range(0, 3):
+        start = time.perf_counter()
+        warm_plugins = cc.retrieve_plugins_cached(plugin_path)
+        warm = min(warm, time.perf_counter() - start)
+        start = time.perf_counter()
+        jh.retrieve_plugins(plugin_path)
+        uncached = min(uncached, time.perf_counter() - start)
+    assert len(cold_plugins) == len(warm_plugins) == 2000
+    print(f'\n2000 files uncached: {uncached * 1000:.1f} msec, cold cache: {cold * 1000:.1f} msec, '
+          f'warm cache: {warm * 1000:.1f} msec')
+    assert warm < uncached, attr_error('Warm Start', uncached, warm)
@@ -0,0 +1,76 @@
+import os
+import pathlib
+import sys
+import pytest
+
+import plugin_manager.model.entry_points as entry_points
+
+from tests.plugin_fixtures import write_plugin_module
+from tests.test_tools import attr_error
+
+
+@pytest.mark.Plugins
+def test_discover_entry_points(tmp_path):
+    module_path = write_plugin_module(tmp_path, 'static_package.sub_package.static_module', ['action1', 'action2'],
+                                      source='raise RuntimeError("plugin code should not run")\n\n'
+                                             'async def async_action():\n    pass\n\n'
+                                             'class NotAnEntryPoint:\n    def method(self):\n        pass\n')
+    pathlib.Path(tmp_path, 'static_package', '__init__.py').write_text('raise RuntimeError("package code ran")\n')
+    discovery = entry_points.EntryPointDiscovery(search_path=[str(tmp_path)])
+    names = discovery.entry_points('static_package.sub_package.static_module')
+    assert names == ['async_action', 'action1', 'action2'], attr_error('Entry Points', ['async_action', 'action1',
+                                                                                        'action2'], names)
+    assert 'static_package' not in sys.modules, 'Discovery should not import the package'
+    assert discovery.has_entry_point('static_package.sub_package.static_module', 'action2')
+    assert not discovery.has_entry_point('static_package.sub_package.static_module', 'NotAnEntryPoint')
+    assert entry_points.find_module_source('static_package.sub_package.static_module', [str(tmp_path)]) == \
+        module_path
+    assert discovery.entry_points('static_package.sub_package.missing_module') is None
+    assert discovery.entry_points('static_package.no_such_package.static_module') is None
+    assert discovery.entry_points('') is None
+
+    discovery.entry_points('static_package.sub_package.static_module')
+    assert discovery.parse_count == 1, 'An unchanged file should not be parsed again'
+    module_path.write_text(module_path.read_text() + '\ndef action3():\n    pass\n')
+    stat = module_path.stat()
+    os.utime(module_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert discovery.entry_points('static_package.sub_package.static_module')[-1] == 'action3'
+    assert discovery.parse_count == 2
+
+    module_path.write_text('def broken(:\n')
+    assert discovery.entry_points('static_package.sub_package.static_module') is None
+
+
+@pytest.mark.Plugins
+def test_cached_entry_points(tmp_path):
+    module_path = write_plugin_module(tmp_path, 'cached_package.cached_module', ['action1'])
+    discovery = entry_points.EntryPointDiscovery(search_path=[str(tmp_path)])
+    assert discovery.cached_entry_points('cached_package.cached_module') is None
+    assert discovery.entry_points('cached_package.cached_module') == ['action1']
+    assert discovery.cached_entry_points('cached_package.cached_module') == ['action1']
+
+    write_plugin_module(tmp_path, 'cached_package.cached_module', ['action1', 'action2'])
+    stat = module_path.stat()
+    os.utime(module_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert discovery.cached_entry_points('cached_package.cached_module') is None, \
+        'A changed source file should not be answered from the cache'
+    assert discovery.entry_points('cached_package.cached_module') == ['action1', 'action2']
+    assert discovery.cached_entry_points('cached_package.cached_module') == ['action1', 'action2']
+    discovery.invalidate()
+    assert discovery.cached_entry_points('cached_package.cached_module') is None
+
+
+@pytest.mark.Plugins
+def test_parse_entry_points_bindings():
+    source = ('from .impl import report, summary as brief_summary\n'
+              'from .other import *\n'
+              'import os\n'
+              'VERSION = "1.0"\n'
+              'LIMITS = {"rows": 10}\n'
+              'alias = report\n'
+              'partial_report = functools.partial(report, 1)\n'
+              'lambda_action = lambda *args: args\n'
+              'def action1():\n    pass\n')
+    names = entry_points.parse_entry_points(source)
+    expected = ['report', 'brief_summary', 'alias', 'partial_report', 'lambda_action', 'action1']
+    assert names == expected, attr_error('Entry Points', expected, names)
@@ -0,0 +1,105 @@
+import importlib
+import os
+import pathlib
+import sys
+import time
+import pytest
+
+import plugin_manager.model.entry_points as entry_points
+import plugin_manager.model.finder as finder
+import plugin_manager.model.plugin as plugin
+
+from tests.plugin_fixtures import write_plugin_module
+from tests.test_tools import attr_error
+
+
+@pytest.fixture
+def plugin_finder(tmp_path) -> finder.PluginModuleFinder:
+    """
+    Provides a PluginModuleFinder for a plugin root folder that is not on sys.path, and uninstalls it afterwards
+
+    """
+    plugin_root = pathlib.Path(tmp_path, 'plugin_root')
+    plugin_root.mkdir()
+    plugin_finder = finder.PluginModuleFinder([plugin_root]).install()
+    yield plugin_finder
+    plugin_finder.uninstall()
+
+
+@pytest.mark.Plugins
+def test_plugin_module_finder(plugin_finder):
+    plugin_root = pathlib.Path(plugin_finder.roots[0])
+    module_path = write_plugin_module(plugin_root, 'finder_package.sub_package.finder_module', ['action1', 'action2'])
+    assert sys.meta_path[0] is plugin_finder and finder.installed_finders() == [plugin_finder]
+    item = plugin.PluginMenuItem(title='Item', entry_point_name='action2', select_person=False,
+                                 select_date_range=False, select_dp_type=False)
+    found, entry_point = item.import_entry_point('finder_package.sub_package.finder_module', lambda msg=None: msg)
+    assert found and entry_point() == ('action2', ())
+    assert sys.modules['finder_package.sub_package.finder_module'].__file__ == str(module_path)
+    assert entry_points.find_module_source('finder_package.sub_package.finder_module') == module_path
+    assert entry_points.EntryPointDiscovery().entry_points('finder_package.sub_package.finder_module') == \
+        ['action1', 'action2']
+    with pytest.raises(plugin.PluginNotFoundError):
+        item.import_entry_point('finder_package.sub_package.missing_module', lambda msg=None: msg)
+    assert importlib.import_module('json') is sys.modules['json'], 'Other modules should use the default finders'
+
+    scans = plugin_finder.scan_count
+    plugin_finder.find_spec('finder_package.sub_package.finder_module')
+    assert plugin_finder.scan_count == scans, 'Unchanged folders should not be scanned again'
+    write_plugin_module(plugin_root, 'finder_package.sub_package.new_module', ['action3'])
+    folder = pathlib.Path(plugin_root, 'finder_package', 'sub_package')
+    os.utime(folder, ns=(folder.stat().st_atime_ns, folder.stat().st_mtime_ns + 1_000_000_000))
+    found, entry_point = item.import_entry_point('finder_package.sub_package.new_module', lambda msg=None: msg)
+    assert not found, 'action2 is not defined in the new module'
+    assert 'finder_package.sub_package.new_module' in sys.modules
+    assert plugin_finder.scan_count == scans + 1, 'Only the changed folder should be scanned again'
+
+    plugin_finder.uninstall()
+    assert finder.installed_finders() == []
+    with pytest.raises(ModuleNotFoundError):
+        importlib.import_module('finder_package.other_module')
+
+
+@pytest.mark.Plugins
+def test_plugin_module_finder_shadowing(plugin_finder):
+    plugin_root = pathlib.Path(plugin_finder.roots[0])
+    pathlib.Path(plugin_root, 'json.py').write_text('def action1(*args):\n    return args\n')
+    module_path = write_plugin_module(plugin_root, 'shadow_plugin_module', ['action1'])
+    assert plugin_finder.find_spec('json') is None and plugin_finder.module_path('json') is None
+    assert entry_points.find_module_source('json') != pathlib.Path(plugin_root, 'json.py'), \
+        'A plugin module should not shadow a standard library module'
+    assert entry_points.find_module_source('shadow_plugin_module') == module_path
+    assert plugin_finder.find_spec('other_module') is None, 'Names not in the plugin roots should not be claimed'
+
+
+@pytest.mark.Benchmark
+def test_plugin_module_finder_benchmark(tmp_path, monkeypatch):
+    module_count: int = 50
+    plugin_root = pathlib.Path(tmp_path, 'plugin_root')
+    for prefix in ('path_scan', 'indexed'):
+        for module_idx in range(0, module_count):
+            write_plugin_module(plugin_root, f'{prefix}_module{module_idx}', ['action1'])
+    monkeypatch.syspath_prepend(plugin_root)
+    for folder_idx in range(0, 300):
+        empty_path = pathlib.Path(tmp_path, 'sys_path', f'entry{folder_idx}')
+        empty_path.mkdir(parents=True)
+        monkeypatch.syspath_prepend(empty_path)
+    importlib.invalidate_caches()
+
+    def import_modules(prefix: str) -> float:
+        start = time.perf_counter()
+        for module_idx in range(0, module_count):
+            importlib.import_module(f'{prefix}_module{module_idx}')
+        return time.perf_counter() - start
+
+    path_scan: float = import_modules('path_scan')
+    plugin_finder = finder.PluginModuleFinder([plugin_root]).install()
+    try:
+        indexed: float = import_modules('indexed')
+    finally:
+        plugin_finder.uninstall()
+    assert sys.modules['indexed_module0'].__spec__.name == 'indexed_module0'
+    assert plugin_finder.scan_count == 1, 'The plugin modules should be found through the index'
+    print(f'\n{module_count} plugin modules behind {len(sys.path)} sys.path entries, sys.path scan: '
+          f'{path_scan * 1000:.1f} msec, indexed finder: {indexed * 1000:.1f} msec')
+    assert indexed < path_scan, attr_error('Import Time', path_scan, indexed)
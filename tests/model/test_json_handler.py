@@ -1,12 +1,16 @@
 import decimal
 import json
+import os
 import pathlib
+import stat
+import time
+import tracemalloc
 import pytest
 
 import plugin_manager.model.json_handler as jh
 import plugin_manager.model.plugin as plugin_model
 
-from tests.plugin_fixtures import plugin_fixture, plugin_menus_fixture
+from tests.plugin_fixtures import plugin_fixture, plugin_menus_fixture, corpus_plugin, write_plugin_corpus
 from tests.test_tools import compare_object, attr_error
 from tests.model.test_plugin import compare_plugin, compare_menu
 
@@ -16,18 +20,32 @@ def test_plugin_json(tmpdir, plugin_menus_fixture, plugin_fixture):
     for menu in plugin_menus_fixture:
         json_str = json.dumps(menu, cls=jh.PluginJSONEncoder)
         assert json_str is not None and len(json_str) > 0, f'No JSON Output for Menu {menu.title}'
-        check_menu = json.loads(eval(json_str), object_hook=jh.plugin_object_hook)
+        check_menu = jh.decode_plugin_json(json_str)
         assert check_menu is not None, "JSON PluginMenu de-serialization failed"
         compare_menu(menu, check_menu)
 
     for plugin in plugin_fixture:
         json_str = json.dumps(plugin, cls=jh.PluginJSONEncoder)
         assert json_str is not None and len(json_str) > 0, f'No JSON Output for Plugin {plugin.name}'
-        check_plugin = json.loads(eval(json_str), object_hook=jh.plugin_object_hook)
+        assert json.loads(json_str)['format'] == jh.JSON_FORMAT, 'Plugin JSON is not a single nested document'
+        check_plugin = jh.decode_plugin_json(json_str)
         assert check_plugin is not None, "JSON Plugin de-serialization failed"
         compare_plugin(plugin, check_plugin)
 
 
+@pytest.mark.Plugins
+def test_plugin_json_v1(tmpdir, plugin_fixture):
+    for plugin in plugin_fixture:
+        json_str = json.dumps(plugin, cls=jh.PluginJSONEncoderV1)
+        assert isinstance(json.loads(json_str), str), 'Format 1 JSON should be an encoded string'
+        check_plugin = jh.decode_plugin_json(json_str)
+        assert isinstance(check_plugin, plugin_model.Plugin), "Format 1 JSON Plugin de-serialization failed"
+        compare_plugin(plugin, check_plugin)
+        for menu, check_menu in zip(plugin.menus, check_plugin.menus):
+            assert len(menu.items) == len(check_menu.items), \
+                f'Menu {menu.title}: {attr_error("Item Count", len(menu.items), len(check_menu.items))}'
+
+
 @pytest.mark.Plugins
 def test_save_and_retrieve_plugin(tmpdir, plugin_fixture):
     plugin_path = pathlib.Path(tmpdir, 'plugins')
@@ -35,6 +53,193 @@ def test_save_and_retrieve_plugin(tmpdir, plugin_fixture):
     jh.save_plugins(plugin_fixture, plugin_path)
     check_plugins: list[plugin_model.Plugin] = jh.retrieve_plugins(plugin_path)
     assert len(check_plugins) == len(plugin_fixture), f'Wrote {len(plugin_fixture)} files, Read {len(check_plugins)} files'
+    # retrieve_plugins returns the Plugins in sorted file path order
+    for plugin, check_plugin in zip(sorted(plugin_fixture, key=jh.plugin_file_name), check_plugins):
+        compare_plugin(plugin, check_plugin)
+
+
+@pytest.mark.Plugins
+@pytest.mark.parametrize('max_workers, decode_processes', [(None, None), (4, None), (4, 2)])
+def test_retrieve_plugins_parallel(tmp_path, max_workers, decode_processes):
+    plugin_path = write_plugin_corpus(pathlib.Path(tmp_path, 'plugins'), 50)
+    pathlib.Path(plugin_path, 'corpus-00025.5.json').write_text('{"truncated": ')
+    pathlib.Path(plugin_path, 'corpus-00030.5.json').write_text('{"foo": 1}')
+    check_plugins = jh.retrieve_plugins(plugin_path, max_workers=max_workers, decode_processes=decode_processes)
+    assert len(check_plugins) == 50, attr_error('Plugin Count', 50, len(check_plugins))
+    names = [plugin.name for plugin in check_plugins]
+    assert names == [corpus_plugin(idx).name for idx in range(0, 50)], 'Plugins not returned in sorted path order'
+    for check_plugin in check_plugins:
+        compare_plugin(corpus_plugin(int(check_plugin.name[-5:])), check_plugin)
+
+
+
+@pytest.mark.Plugins
+def test_iter_plugins(tmpdir, plugin_fixture):
+    plugin_path = pathlib.Path(tmpdir, 'plugins')
+    plugin_path.mkdir(exist_ok=True)
+    jh.save_plugins(plugin_fixture, plugin_path)
+    pathlib.Path(plugin_path, 'not_a_plugin.json').write_text('{"truncated": ')
+    pathlib.Path(plugin_path, 'readme.txt').write_text('not json')
+    pathlib.Path(plugin_path, 'stray.json').write_text('{"foo": 1}')
+    assert jh.decode_plugin_text('{"foo": 1}') is None, 'JSON that does not encode a Plugin should not be decoded'
+    plugin_iter = jh.iter_plugins(plugin_path)
+    assert not isinstance(plugin_iter, list), 'iter_plugins should return an iterator'
+    check_plugins = sorted(plugin_iter, key=lambda p: p.name)
+    assert len(check_plugins) == len(plugin_fixture), attr_error('Plugin Count', len(plugin_fixture), len(check_plugins))
     for plugin, check_plugin in zip(plugin_fixture, check_plugins):
         compare_plugin(plugin, check_plugin)
 
+
+def iter_plugins_peak(plugin_path: pathlib.Path) -> tuple[int, int]:
+    tracemalloc.start()
+    count = 0
+    for _ in jh.iter_plugins(plugin_path):
+        count += 1
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, peak
+
+
+@pytest.mark.Benchmark
+def test_iter_plugins_memory(tmp_path):
+    plugin_path = write_plugin_corpus(pathlib.Path(tmp_path, 'plugins'), 1000)
+    small_count, small_peak = iter_plugins_peak(plugin_path)
+    write_plugin_corpus(plugin_path, 9000, start=1000)
+    large_count, large_peak = iter_plugins_peak(plugin_path)
+    assert (small_count, large_count) == (1000, 10000)
+    print(f'\niter_plugins peak: {small_peak} bytes for {small_count} files, {large_peak} bytes for {large_count} files')
+    assert large_peak < small_peak * 2, attr_error('Peak Memory', small_peak, large_peak)
+
+
+def large_plugin(menu_count: int, item_count: int) -> plugin_model.Plugin:
+    menus: list[plugin_model.PluginMenu] = []
+    for menu_idx in range(0, menu_count):
+        items = [plugin_model.PluginMenuItem(title=f'Item {menu_idx}.{item_idx}', entry_point_name='entry_point1',
+                                             select_person=item_idx % 2 == 0, select_date_range=item_idx % 3 == 0,
+                                             select_dp_type=False) for item_idx in range(0, item_count)]
+        menus.append(plugin_model.PluginMenu(title=f'Menu {menu_idx}', module_name='dummy_package.dummy_module1',
+                                             items=items))
+    return plugin_model.Plugin(name='Large Plugin', description='Benchmark plugin', author_name='Bench Mark',
+                               author_email='bench@example.com', menus=menus)
+
+
+@pytest.mark.Benchmark
+def test_json_round_trip_benchmark():
+    plugin = large_plugin(menu_count=10, item_count=500)
+    item_count = 10 * 500
+    timings: dict[str, float] = {}
+    for label, encoder in (('format 1', jh.PluginJSONEncoderV1), ('format 2', jh.PluginJSONEncoder)):
+        start = time.perf_counter()
+        check_plugin = jh.decode_plugin_json(json.dumps(plugin, cls=encoder))
+        timings[label] = time.perf_counter() - start
+        assert len(check_plugin.menus) == len(plugin.menus)
+        assert sum(len(menu.items) for menu in check_plugin.menus) == item_count
+        print(f'\n{label}: {timings[label] * 1_000_000 / item_count:.2f} usec per item round trip')
+    assert timings['format 2'] < timings['format 1'], attr_error('Round Trip', timings['format 1'], timings['format 2'])
+
+
+@pytest.fixture(scope='module')
+def plugin_corpora(tmp_path_factory) -> dict[int, pathlib.Path]:
+    return {count: write_plugin_corpus(pathlib.Path(tmp_path_factory.mktemp('corpus'), 'plugins'), count)
+            for count in (100, 1000, 10000)}
+
+
+@pytest.mark.Benchmark
+@pytest.mark.parametrize('count', [100, 1000, 10000])
+def test_retrieve_plugins_parallel_benchmark(plugin_corpora, count):
+    modes = {'serial': {}, 'threads': {'max_workers': 8}, 'threads+processes': {'max_workers': 8, 'decode_processes': 2}}
+    for label, kwargs in modes.items():
+        start = time.perf_counter()
+        check_plugins = jh.retrieve_plugins(plugin_corpora[count], **kwargs)
+        elapsed = time.perf_counter() - start
+        assert len(check_plugins) == count
+        print(f'\n{count} files {label}: {elapsed * 1000:.1f} msec')
+
+
+@pytest.mark.Plugins
+def test_save_plugins_dirty_tracking(tmp_path, plugin_fixture):
+    plugin_path = pathlib.Path(tmp_path, 'plugins')
+    plugin_path.mkdir()
+    summary = jh.save_plugins(plugin_fixture, plugin_path)
+    assert len(summary.written) == 2 and len(summary.unchanged) == 0, f'First save {summary}'
+
+    plugins = jh.retrieve_plugins(plugin_path)
+    mtimes = {json_path: json_path.stat().st_mtime_ns for json_path in summary.written}
+    summary = jh.save_plugins(plugins, plugin_path)
+    assert len(summary.written) == 0 and len(summary.unchanged) == 2, f'Unchanged save {summary}'
+    assert all(json_path.stat().st_mtime_ns == mtime for json_path, mtime in mtimes.items())
+
+    plugins[0].description = 'Edited description'
+    summary = jh.save_plugins(plugins, plugin_path)
+    assert summary.written == [pathlib.Path(plugin_path, jh.plugin_file_name(plugins[0]))], f'Edited save {summary}'
+    assert summary.unchanged == [pathlib.Path(plugin_path, jh.plugin_file_name(plugins[1]))]
+    assert sorted(path.name for path in plugin_path.iterdir()) == sorted(jh.plugin_file_name(p) for p in plugins), \
+        'Temporary files should not be left in the plugin folder'
+    check_plugin = jh.decode_plugin_file(summary.written[0])
+    assert check_plugin.description == 'Edited description'
+
+    external_path = pathlib.Path(plugin_path, jh.plugin_file_name(plugins[1]))
+    external_path.write_text(external_path.read_text().replace(plugins[1].description, 'External edit'))
+    os.utime(external_path, ns=(external_path.stat().st_atime_ns, external_path.stat().st_mtime_ns + 1_000_000_000))
+    summary = jh.save_plugins(plugins, plugin_path)
+    assert summary.written == [external_path], 'A file edited since it was read should be written'
+
+
+@pytest.mark.Plugins
+def test_save_plugins_without_reading(tmp_path, plugin_fixture, monkeypatch):
+    plugin_path = pathlib.Path(tmp_path, 'plugins')
+    plugin_path.mkdir()
+    jh.save_plugins(plugin_fixture, plugin_path)
+    loaded = jh.retrieve_plugins(plugin_path, max_workers=2, decode_processes=1)
+
+    def no_reads(*args, **kwargs):
+        raise AssertionError('Deciding whether a Plugin changed should not read its file')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(pathlib.Path, 'open', no_reads)
+        patch.setattr(pathlib.Path, 'read_bytes', no_reads)
+        patch.setattr(pathlib.Path, 'read_text', no_reads)
+        for plugins in (plugin_fixture, loaded):
+            summary = jh.save_plugins(plugins, plugin_path)
+            assert len(summary.written) == 0 and len(summary.unchanged) == 2, f'Unchanged save {summary}'
+    assert jh.save_plugins([plugin_model.Plugin(name=plugin_fixture[0].name, description=plugin_fixture[0].description,
+                                                author_name=plugin_fixture[0].author_name,
+                                                author_email=plugin_fixture[0].author_email,
+                                                menus=list(plugin_fixture[0].menus))], plugin_path).written, \
+        'A Plugin that was not read from or written to its file should be written'
+
+
+@pytest.mark.Plugins
+def test_save_plugins_interrupted(tmp_path, plugin_fixture, monkeypatch):
+    plugin_path = pathlib.Path(tmp_path, 'plugins')
+    plugin_path.mkdir()
+    jh.save_plugins(plugin_fixture, plugin_path)
+    before = {path.name: path.read_text() for path in plugin_path.iterdir()}
+
+    def failing_replace(src, dst):
+        raise OSError('simulated crash')
+
+    plugin_fixture[0].description = 'Never written'
+    plugin_fixture[1].description = 'Never written'
+    monkeypatch.setattr(jh.os, 'replace', failing_replace)
+    with pytest.raises(OSError):
+        jh.save_plugins(plugin_fixture, plugin_path)
+    after = {path.name: path.read_text() for path in plugin_path.iterdir()}
+    assert after == before, 'An interrupted save should leave the existing files intact'
+
+
+@pytest.mark.Plugins
+def test_save_plugins_file_mode(tmp_path, plugin_fixture):
+    plugin_path = pathlib.Path(tmp_path, 'plugins')
+    plugin_path.mkdir()
+    umask = os.umask(0o022)
+    try:
+        summary = jh.save_plugins(plugin_fixture, plugin_path)
+        assert all(stat.S_IMODE(json_path.stat().st_mode) == 0o644 for json_path in summary.written), \
+            'A new file should get the mode the umask allows'
+        summary.written[0].chmod(0o664)
+        plugin_fixture[0].description = 'Edited description'
+        summary = jh.save_plugins(plugin_fixture, plugin_path)
+        assert stat.S_IMODE(summary.written[0].stat().st_mode) == 0o664, 'A replaced file should keep its mode'
+    finally:
+        os.umask(umask)
@@ -1,6 +1,17 @@
+from dataclasses import dataclass
+import importlib
+import pathlib
+import pickle
+import random
+import time
+import tracemalloc
+import sys
+from typing import Any, Callable, Optional
+import pytest
+
 import plugin_manager.model.plugin as plugin
 from tests.test_tools import compare_object, attr_error
-from tests.plugin_fixtures import plugin_fixture, plugin_menus_fixture
+from tests.plugin_fixtures import plugin_fixture, plugin_menus_fixture, write_plugin_module
 
 
 def menu_error_preamble(title: str) -> str:
@@ -49,3 +60,347 @@ def compare_plugin(plugin: plugin.Plugin, check_plugin: plugin.Plugin):
         for menu, check_menu in zip(plugin.menus, check_plugin.menus):
             compare_menu(menu, check_menu)
 
+
+
+def numbered_menu(item_count: int) -> plugin.PluginMenu:
+    return plugin.PluginMenu(title='Numbered Menu', module_name='dummy_package.dummy_module1',
+                             items=[plugin.PluginMenuItem(title=f'Item {idx}', entry_point_name='entry_point1',
+                                                          select_person=False, select_date_range=False,
+                                                          select_dp_type=False) for idx in range(0, item_count)])
+
+
+@pytest.mark.Plugins
+def test_menu_item_title_index():
+    menu = numbered_menu(10)
+    assert isinstance(menu.items, plugin.TitleIndexedList)
+    assert menu.get_menu_item('Item 3') is menu.items[3]
+    assert menu.get_menu_item('No Such Item') is None, 'A missing title should return None'
+
+    menu.add_item(plugin.PluginMenuItem(title='Item 10', entry_point_name='entry_point2', select_person=True,
+                                        select_date_range=False, select_dp_type=False))
+    assert menu.get_menu_item('Item 10') is menu.items[10]
+    menu.remove_menu_item('Item 0')
+    assert menu.get_menu_item('Item 0') is None
+    assert menu.get_menu_item('Item 1') is menu.items[0], 'Positions should follow a removal'
+    menu.remove_menu_item('No Such Item')
+    assert len(menu.items) == 10
+
+    menu.items.insert(0, plugin.PluginMenuItem(title='Inserted', entry_point_name='entry_point1',
+                                               select_person=False, select_date_range=False, select_dp_type=False))
+    assert menu.get_menu_item('Item 1') is menu.items[1], 'Positions should follow a direct insert'
+    menu.items.reverse()
+    assert menu.get_menu_item('Inserted') is menu.items[-1], 'Positions should follow a direct reverse'
+    del menu.items[0]
+    assert menu.get_menu_item('Item 10') is None
+    menu.items[0].title = 'Renamed'
+    assert menu.get_menu_item('Renamed') is menu.items[0], 'The index should follow a title change'
+    assert menu.get_menu_item('Item 9') is None
+
+    menu.items = [plugin.PluginMenuItem(title='Replaced', entry_point_name='entry_point1', select_person=False,
+                                        select_date_range=False, select_dp_type=False)]
+    assert isinstance(menu.items, plugin.TitleIndexedList), 'An assigned list should be indexed'
+    assert menu.get_menu_item('Replaced') is menu.items[0]
+    assert 'Replaced' in menu.items and menu.items.index('Replaced') == 0
+
+
+@pytest.mark.Plugins
+def test_title_index_bounds():
+    menu = numbered_menu(10)
+    menu.items.append(plugin.PluginMenuItem(title='Item 3', entry_point_name='entry_point1', select_person=False,
+                                            select_date_range=False, select_dp_type=False))
+    titles: list[str] = [item.title for item in menu.items]
+    for args in ((0, 3), (0, 4), (3, 4), (4, ), (4, 10), (4, 11), (-8, ), (-1, ), (0, -8), (-20, 2), (12, 20)):
+        try:
+            expected = titles.index('Item 3', *args)
+        except ValueError:
+            expected = None
+        try:
+            found = menu.items.index('Item 3', *args)
+        except ValueError:
+            found = None
+        assert found == expected, attr_error(f'index bounds {args}', expected, found)
+
+
+@pytest.mark.Plugins
+def test_title_index_random_mutations():
+    rng = random.Random(7)
+    menu = numbered_menu(0)
+
+    def new_item(title: str) -> plugin.PluginMenuItem:
+        return plugin.PluginMenuItem(title=title, entry_point_name='entry_point1', select_person=False,
+                                     select_date_range=False, select_dp_type=False)
+
+    for _ in range(0, 2000):
+        title = f'Item {rng.randint(0, 40)}'
+        action = rng.random()
+        if action < 0.3:
+            menu.items.append(new_item(title))
+        elif action < 0.5 and len(menu.items) > 0:
+            del menu.items[rng.randrange(len(menu.items))]
+        elif action < 0.6:
+            menu.remove_menu_item(title)
+        elif action < 0.7:
+            menu.items.insert(rng.randint(0, len(menu.items)), new_item(title))
+        elif action < 0.75 and len(menu.items) > 0:
+            menu.items[rng.randrange(len(menu.items))].title = title
+        expected = next((item for item in menu.items if item.title == title), None)
+        assert menu.get_menu_item(title) is expected, f'Title index out of step for {title}'
+
+
+@pytest.mark.Plugins
+def test_plugin_menu_title_index(plugin_menus_fixture):
+    test_plugin = plugin.Plugin(name='Test Plugin', description='Test', author_name='Test Author',
+                                author_email='test@example.com', menus=None)
+    assert test_plugin.get_menu('Menu One') is None
+    for menu in plugin_menus_fixture:
+        test_plugin.add_menu(menu)
+    assert test_plugin.get_menu('Menu Two') is plugin_menus_fixture[1]
+    test_plugin.remove_menu('Menu One')
+    assert test_plugin.get_menu('Menu One') is None
+    assert test_plugin.get_menu('Menu Two') is test_plugin.menus[0]
+
+
+@pytest.mark.Benchmark
+@pytest.mark.parametrize('item_count', [10000, 100000])
+def test_title_index_benchmark(item_count):
+    menu = numbered_menu(item_count)
+    titles = [f'Item {idx}' for idx in range(0, item_count, item_count // 100)]
+    start = time.perf_counter()
+    for title in titles:
+        next((item for item in menu.items if item.title == title), None)
+    linear = (time.perf_counter() - start) / len(titles)
+    start = time.perf_counter()
+    menu.get_menu_item(titles[0])
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    for title in titles:
+        assert menu.get_menu_item(title).title == title
+    indexed = (time.perf_counter() - start) / len(titles)
+    start = time.perf_counter()
+    for title in reversed(titles):
+        menu.remove_menu_item(title)
+    removal = (time.perf_counter() - start) / len(titles)
+    assert len(menu.items) == item_count - len(titles)
+    print(f'\n{item_count} items: linear scan {linear * 1_000_000:.2f} usec, index build {build * 1000:.2f} msec, '
+          f'indexed lookup {indexed * 1_000_000:.2f} usec, removal {removal * 1_000_000:.2f} usec')
+    assert indexed < linear, attr_error('Lookup Time', linear, indexed)
+
+
+@dataclass
+class DictMenuItem:
+    """
+    The layout PluginMenuItem had before it used __slots__, used as the baseline for test_menu_item_memory
+
+    """
+    title: str
+    entry_point_name: str
+    select_person: bool
+    select_date_range: bool
+    select_dp_type: bool
+
+
+@pytest.mark.Plugins
+def test_menu_item_select_flags():
+    item = plugin.PluginMenuItem(title='Item', entry_point_name='entry_point', select_person=True,
+                                 select_date_range=False, select_dp_type=True)
+    assert item.select_flags == plugin.SELECT_PERSON | plugin.SELECT_DP_TYPE
+    item.select_person = False
+    item.select_date_range = True
+    assert (item.select_person, item.select_date_range, item.select_dp_type) == (False, True, True)
+    assert item.select_flags == plugin.SELECT_DATE_RANGE | plugin.SELECT_DP_TYPE
+    assert not hasattr(item, '__dict__'), 'PluginMenuItem should not have a per-instance __dict__'
+    with pytest.raises(AttributeError):
+        item.sel_person = True
+    copy = pickle.loads(pickle.dumps(item))
+    assert (copy.title, copy.entry_point_name, copy.select_flags) == (item.title, item.entry_point_name,
+                                                                      item.select_flags)
+    assert plugin.PluginMenuItem.from_flags('Item', 'entry_point', item.select_flags).select_date_range
+    menu = plugin.PluginMenu(title='Menu', module_name=''.join(['dummy_package.', 'dummy_module1']), items=[])
+    assert menu.module_name is plugin.PluginMenu(title='Menu', module_name='dummy_package.dummy_module1',
+                                                 items=[]).module_name, 'Module names should be interned'
+
+
+@pytest.mark.Benchmark
+def test_menu_item_memory():
+    item_count: int = 100000
+
+    def measure(item_class) -> float:
+        tracemalloc.start()
+        items = [item_class(f'Item {idx}', ''.join(['entry_point_', str(idx % 10)]), idx % 2 == 0, False, True)
+                 for idx in range(0, item_count)]
+        size: int = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del items
+        return size / item_count
+
+    legacy: float = measure(DictMenuItem)
+    compact: float = measure(plugin.PluginMenuItem)
+    print(f'\n{item_count} menu items, bytes per item with __dict__: {legacy:.1f}, with __slots__: {compact:.1f}')
+    assert compact < legacy * 0.75, attr_error('Bytes per Item', legacy * 0.75, compact)
+
+
+def record_menu(menu: plugin.PluginMenu, module_cache: plugin.ModuleCache, lazy: bool = False,
+                selection_action: Optional[Callable] = None) -> list[tuple[str, Any]]:
+    """
+    Build a menu with create_menu, recording the labels and actions of the menu items that would be added
+
+    """
+    added: list[tuple[str, Any]] = []
+    menu.create_menu(not_found_action=lambda msg=None: msg, selection_action=selection_action,
+                     add_menu_item=lambda label, action: added.append((label, action)),
+                     add_menu=lambda label: None, module_cache=module_cache, lazy=lazy)
+    return added
+
+
+@pytest.mark.Plugins
+def test_module_cache(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(tmp_path)
+    write_plugin_module(tmp_path, 'cache_package.good_module', ['action1', 'action2'])
+    pathlib.Path(tmp_path, 'cache_package', 'broken_module.py').write_text('from os import no_such_name\n')
+    imports: list[str] = []
+    real_import_module = plugin.import_module
+
+    def counting_import(name: str):
+        imports.append(name)
+        return real_import_module(name)
+
+    monkeypatch.setattr(plugin, 'import_module', counting_import)
+    module_cache = plugin.ModuleCache()
+    items = [plugin.PluginMenuItem(title=f'Item {idx}', entry_point_name=f'action{idx % 3 + 1}',
+                                   select_person=False, select_date_range=False, select_dp_type=False)
+             for idx in range(0, 6)]
+    menus = [plugin.PluginMenu(title=f'Menu {module_name}', module_name=f'cache_package.{module_name}', items=items)
+             for module_name in ('good_module', 'missing_module', 'broken_module', 'good_module')]
+    added = [record_menu(menu, module_cache) for menu in menus]
+    assert sorted(imports) == ['cache_package.broken_module', 'cache_package.good_module',
+                               'cache_package.missing_module'], 'Each module should be imported once'
+    assert added[0][0][1]() == ('action1', ())
+    assert added[0][2][1]() == 'Entry Point action3 not found in module cache_package.good_module'
+    assert [label for label, action in added[1]] == [f'Item {idx} not found' for idx in range(0, 6)]
+    assert [label for label, action in added[2]] == [f'Item {idx} import error' for idx in range(0, 6)]
+    with pytest.raises(plugin.PluginNotFoundError) as first:
+        module_cache.resolve('cache_package.missing_module')
+    with pytest.raises(plugin.PluginNotFoundError) as second:
+        module_cache.resolve('cache_package.missing_module')
+    assert first.value is not second.value, 'Each lookup should raise a new exception'
+
+    write_plugin_module(tmp_path, 'cache_package.missing_module', ['action1'])
+    importlib.invalidate_caches()
+    record_menu(menus[1], module_cache)
+    assert imports.count('cache_package.missing_module') == 1, 'Failures should be cached until invalidated'
+    module_cache.invalidate('cache_package.missing_module')
+    assert record_menu(menus[1], module_cache)[0][1]() == ('action1', ())
+    assert imports.count('cache_package.missing_module') == 2
+    module_cache.invalidate()
+    record_menu(menus[0], module_cache)
+    assert imports.count('cache_package.good_module') == 2
+
+
+@pytest.mark.Plugins
+def test_module_cache_failure_ttl(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(tmp_path)
+    clock: list[float] = [100.0]
+    monkeypatch.setattr(plugin.time, 'monotonic', lambda: clock[0])
+    module_cache = plugin.ModuleCache(failure_ttl=5.0)
+    with pytest.raises(plugin.PluginNotFoundError):
+        module_cache.resolve('ttl_package.late_module')
+    write_plugin_module(tmp_path, 'ttl_package.late_module', ['action1'])
+    clock[0] += 4.0
+    with pytest.raises(plugin.PluginNotFoundError):
+        module_cache.resolve('ttl_package.late_module')
+    clock[0] += 1.0
+    assert 'action1' in module_cache.resolve('ttl_package.late_module'), \
+        'A module installed after its failure expired should be found'
+    assert module_cache.failures == {}
+    assert plugin.default_module_cache.failure_ttl == plugin.DEFAULT_FAILURE_TTL, \
+        'The default cache should not keep failures forever'
+
+
+@pytest.mark.Benchmark
+def test_module_cache_benchmark(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(tmp_path)
+    for module_idx in range(0, 10):
+        write_plugin_module(tmp_path, f'bench_package.module{module_idx}', ['action1', 'action2'])
+    menus = [plugin.PluginMenu(title=f'Menu {menu_idx}', module_name=f'bench_package.module{menu_idx % 20}',
+                               items=[plugin.PluginMenuItem(title=f'Item {item_idx}', entry_point_name='action1',
+                                                            select_person=False, select_date_range=False,
+                                                            select_dp_type=False) for item_idx in range(0, 10)])
+             for menu_idx in range(0, 500)]
+    start = time.perf_counter()
+    for menu in menus:
+        for item in menu.items:
+            try:
+                item.import_entry_point(menu.module_name, lambda msg=None: msg)
+            except plugin.PluginNotFoundError:
+                pass
+    uncached = time.perf_counter() - start
+    module_cache = plugin.ModuleCache()
+    start = time.perf_counter()
+    for menu in menus:
+        record_menu(menu, module_cache)
+    cached = time.perf_counter() - start
+    print(f'\n500 menus, 5000 items, half in missing modules, uncached: {uncached * 1000:.1f} msec, '
+          f'cached: {cached * 1000:.1f} msec')
+    assert cached < uncached, attr_error('Menu Build Time', uncached, cached)
+
+
+@pytest.mark.Plugins
+def test_lazy_entry_points(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(tmp_path)
+    write_plugin_module(tmp_path, 'lazy_package.lazy_module', ['action1'])
+    module_cache = plugin.ModuleCache()
+    items = [plugin.PluginMenuItem(title='Found', entry_point_name='action1', select_person=True,
+                                   select_date_range=False, select_dp_type=True),
+             plugin.PluginMenuItem(title='Not Found', entry_point_name='action2', select_person=False,
+                                   select_date_range=False, select_dp_type=False)]
+    added = record_menu(plugin.PluginMenu(title='Lazy', module_name='lazy_package.lazy_module', items=items),
+                        module_cache, lazy=True)
+    assert [label for label, action in added] == ['Found', 'Not Found']
+    assert 'lazy_package.lazy_module' not in sys.modules, 'Building a lazy menu should not import the module'
+    proxy = added[0][1]
+    assert proxy('arg') == ('action1', ('arg',))
+    assert proxy.resolved and 'lazy_package.lazy_module' in sys.modules
+    assert proxy.entry_point is sys.modules['lazy_package.lazy_module'].action1
+    assert added[1][1]() == 'Entry Point action2 not found in module lazy_package.lazy_module'
+
+    selections: list[tuple] = []
+    added = record_menu(plugin.PluginMenu(title='Lazy', module_name='lazy_package.lazy_module', items=items),
+                        module_cache, lazy=True, selection_action=lambda *args: selections.append(args))
+    added[0][1]()
+    assert selections == [(True, False, True, sys.modules['lazy_package.lazy_module'].action1)]
+    assert added[1][1]() == 'Entry Point action2 not found in module lazy_package.lazy_module'
+    assert len(selections) == 1, 'The selection action should not be invoked for a missing entry point'
+
+    added = record_menu(plugin.PluginMenu(title='Missing', module_name='lazy_package.missing_module', items=items),
+                        module_cache, lazy=True)
+    assert added[0][1]() == 'Module lazy_package.missing_module not found'
+    assert not added[0][1].resolved
+
+
+@pytest.mark.Benchmark
+def test_lazy_entry_point_benchmark(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(tmp_path)
+    module_count: int = 10
+    for package_name in ('eager_slow_package', 'lazy_slow_package'):
+        for module_idx in range(0, module_count):
+            write_plugin_module(tmp_path, f'{package_name}.module{module_idx}', ['action1'],
+                                source='import time\ntime.sleep(0.02)\n')
+
+    def build_menus(package_name: str, lazy: bool) -> float:
+        module_cache = plugin.ModuleCache()
+        start = time.perf_counter()
+        for module_idx in range(0, module_count):
+            menu = plugin.PluginMenu(title=f'Menu {module_idx}', module_name=f'{package_name}.module{module_idx}',
+                                     items=[plugin.PluginMenuItem(title=f'Item {item_idx}', entry_point_name='action1',
+                                                                  select_person=False, select_date_range=False,
+                                                                  select_dp_type=False)
+                                            for item_idx in range(0, 10)])
+            record_menu(menu, module_cache, lazy=lazy)
+        return time.perf_counter() - start
+
+    eager: float = build_menus('eager_slow_package', False)
+    lazy: float = build_menus('lazy_slow_package', True)
+    print(f'\n{module_count} modules taking 20 msec to import, eager startup: {eager * 1000:.1f} msec, '
+          f'lazy startup: {lazy * 1000:.1f} msec')
+    assert lazy < module_count * 0.02 / 10, attr_error('Lazy Startup', module_count * 0.02 / 10, lazy)
+    assert lazy < eager, attr_error('Startup Time', eager, lazy)
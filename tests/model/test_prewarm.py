@@ -0,0 +1,93 @@
+import time
+import pytest
+
+import plugin_manager.model.plugin as plugin
+import plugin_manager.model.prewarm as prewarm
+
+from tests.plugin_fixtures import write_plugin_module
+from tests.test_tools import attr_error
+from tests.model.test_plugin import record_menu
+
+
+def module_plugin(name: str, module_names: list[str], item_count: int = 5) -> plugin.Plugin:
+    """
+    Creates a Plugin with a menu for each of the provided module names, each menu's items referring to action1
+
+    """
+    menus = [plugin.PluginMenu(title=f'Menu {menu_idx}', module_name=module_name,
+                               items=[plugin.PluginMenuItem(title=f'Item {item_idx}', entry_point_name='action1',
+                                                            select_person=False, select_date_range=False,
+                                                            select_dp_type=False) for item_idx in range(0, item_count)])
+             for menu_idx, module_name in enumerate(module_names)]
+    return plugin.Plugin(name=name, description='Pre-warm test plugin', author_name='Prewarm Author',
+                         author_email='prewarm@example.com', menus=menus)
+
+
+@pytest.mark.Plugins
+def test_prewarm_modules(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(tmp_path)
+    write_plugin_module(tmp_path, 'prewarm_package.module1', ['action1'])
+    write_plugin_module(tmp_path, 'prewarm_package.module2', ['action1'])
+    plugins = [module_plugin('Plugin 1', ['prewarm_package.module1', 'prewarm_package.module2']),
+               module_plugin('Plugin 2', ['prewarm_package.module2', 'prewarm_package.missing_module'])]
+    assert prewarm.plugin_module_names(plugins) == ['prewarm_package.module1', 'prewarm_package.module2',
+                                                    'prewarm_package.missing_module']
+    module_cache = plugin.ModuleCache()
+    report = prewarm.prewarm_modules(plugins, max_workers=2, module_cache=module_cache)
+    assert report.imported == ['prewarm_package.module1', 'prewarm_package.module2']
+    assert [timing.module_name for timing in report.failures] == ['prewarm_package.missing_module']
+    assert report.failures[0].error == 'PluginNotFoundError: Module prewarm_package.missing_module not found'
+    assert report.pending == []
+
+    imports: list[str] = []
+    monkeypatch.setattr(plugin, 'import_module', lambda name: imports.append(name))
+    added = [record_menu(menu, module_cache) for menu in plugins[1].menus]
+    assert imports == [], 'create_menu should resolve against the pre-warmed modules'
+    assert added[0][0][1]() == ('action1', ())
+    assert added[1][0][0] == 'Item 0 not found'
+
+
+@pytest.mark.Plugins
+def test_prewarm_pending(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(tmp_path)
+    write_plugin_module(tmp_path, 'pending_package.slow_module', ['action1'], source='import time\ntime.sleep(0.5)\n')
+    prewarmer = prewarm.ModulePrewarmer([module_plugin('Plugin', ['pending_package.slow_module'])],
+                                        module_cache=plugin.ModuleCache()).start()
+    report = prewarmer.report(timeout=0.01)
+    assert report.pending == ['pending_package.slow_module'] and not prewarmer.done()
+    report = prewarmer.report()
+    assert report.imported == ['pending_package.slow_module'] and prewarmer.done()
+    assert report.timings[0].seconds >= 0.5
+
+
+@pytest.mark.Benchmark
+def test_prewarm_benchmark(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(tmp_path)
+    module_count: int = 16
+    plugins: dict[str, list[plugin.Plugin]] = {}
+    for package_name in ('serial_io_package', 'prewarm_io_package'):
+        module_names = [f'{package_name}.module{module_idx}' for module_idx in range(0, module_count)]
+        for module_name in module_names:
+            # time.sleep releases the GIL, as a module reading files or network storage while it is imported would
+            write_plugin_module(tmp_path, module_name, ['action1'], source='import time\ntime.sleep(0.02)\n')
+        plugins[package_name] = [module_plugin(f'Plugin {plugin_idx}', module_names[plugin_idx::4])
+                                 for plugin_idx in range(0, 4)]
+
+    def build_menus(catalog: list[plugin.Plugin], module_cache: plugin.ModuleCache) -> None:
+        for catalog_plugin in catalog:
+            for menu in catalog_plugin.menus:
+                record_menu(menu, module_cache)
+
+    start = time.perf_counter()
+    build_menus(plugins['serial_io_package'], plugin.ModuleCache())
+    serial = time.perf_counter() - start
+    start = time.perf_counter()
+    module_cache = plugin.ModuleCache()
+    report = prewarm.prewarm_modules(plugins['prewarm_io_package'], max_workers=8, module_cache=module_cache)
+    build_menus(plugins['prewarm_io_package'], module_cache)
+    prewarmed = time.perf_counter() - start
+    assert len(report.imported) == module_count
+    print(f'\n{module_count} modules taking 20 msec to import, serial: {serial * 1000:.1f} msec, '
+          f'pre-warmed with 8 threads: {prewarmed * 1000:.1f} msec, '
+          f'slowest module: {max(timing.seconds for timing in report.timings) * 1000:.1f} msec')
+    assert prewarmed < serial / 2, attr_error('Menu Build Time', serial / 2, prewarmed)
@@ -0,0 +1,134 @@
+from concurrent.futures.process import BrokenProcessPool
+import os
+import pathlib
+import sys
+import time
+import pytest
+
+import plugin_manager.model.plugin as plugin
+import plugin_manager.model.sandbox as sandbox
+
+from tests.plugin_fixtures import write_plugin_module
+from tests.test_tools import attr_error
+
+SANDBOX_SOURCE = '''
+import functools
+import os
+
+
+def add(*args, scale=1):
+    return sum(args) * scale
+
+
+def pid(*args):
+    return os.getpid()
+
+
+def crash(*args):
+    os._exit(1)
+
+
+scaled_add = functools.partial(add, scale=2)
+'''
+
+IMPORT_SIDE_EFFECT_SOURCE = '''
+import pathlib
+pathlib.Path(__file__).with_suffix('.imported').write_text(str(os.getpid()))
+'''
+
+
+@pytest.mark.Plugins
+def test_sandbox_executor(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(tmp_path)
+    write_plugin_module(tmp_path, 'sandbox_package.sandbox_module', [], source=SANDBOX_SOURCE)
+    with sandbox.SandboxExecutor(preload=['sandbox_package.sandbox_module'], max_workers=1,
+                                 max_calls_per_worker=3) as executor:
+        assert executor.call('sandbox_package.sandbox_module', 'add', 1, 2, scale=10, timeout=30) == 30
+        worker = executor.call('sandbox_package.sandbox_module', 'pid', timeout=30)
+        assert worker != os.getpid(), 'The entry point should run in a worker process'
+        assert executor.call('sandbox_package.sandbox_module', 'pid', timeout=30) == worker
+        assert executor.call('sandbox_package.sandbox_module', 'pid', timeout=30) != worker, \
+            'The worker should be replaced after max_calls_per_worker calls'
+        with pytest.raises(plugin.PluginNotFoundError):
+            executor.call('sandbox_package.missing_module', 'add', timeout=30)
+        with pytest.raises(AttributeError):
+            executor.call('sandbox_package.sandbox_module', 'missing_entry_point', timeout=30)
+
+        with pytest.raises(BrokenProcessPool):
+            executor.call('sandbox_package.sandbox_module', 'crash', timeout=30)
+        assert executor.call('sandbox_package.sandbox_module', 'add', 2, 3, timeout=30) == 5, \
+            'The pool should be recreated after a worker crashes'
+        assert executor.restarts == 1
+
+        items = [plugin.PluginMenuItem(title=title, entry_point_name=entry_point_name, select_person=True,
+                                       select_date_range=False, select_dp_type=False)
+                 for title, entry_point_name in [('Add', 'add'), ('Scaled Add', 'scaled_add')]]
+        added: list = []
+        plugin.PluginMenu(title='Sandbox', module_name='sandbox_package.sandbox_module', items=items).create_menu(
+            not_found_action=lambda msg=None: msg,
+            selection_action=lambda sp, sd, st, entry_point: entry_point(4, 5),
+            add_menu_item=lambda label, action: added.append(action), add_menu=lambda label: None,
+            module_cache=plugin.ModuleCache(), wrap_entry_point=executor.wrap_entry_point)
+        assert added[0]().result(timeout=30) == 9
+        assert added[1]().result(timeout=30) == 18, 'Aliased entry points should be run from the menu\'s module'
+
+
+@pytest.mark.Plugins
+def test_sandbox_module_cache(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(tmp_path)
+    write_plugin_module(tmp_path, 'sandbox_import_package.sandbox_module', [],
+                        source=SANDBOX_SOURCE + IMPORT_SIDE_EFFECT_SOURCE)
+    marker = pathlib.Path(tmp_path, 'sandbox_import_package', 'sandbox_module.imported')
+    items = [plugin.PluginMenuItem(title=title, entry_point_name=entry_point_name, select_person=True,
+                                   select_date_range=False, select_dp_type=False)
+             for title, entry_point_name in [('Add', 'add'), ('Scaled Add', 'scaled_add'), ('Missing', 'missing')]]
+    labels: list = []
+    added: list = []
+    with sandbox.SandboxExecutor(max_workers=1) as executor:
+        for module_name in ('sandbox_import_package.sandbox_module', 'sandbox_import_package.missing_module'):
+            plugin.PluginMenu(title='Sandbox', module_name=module_name, items=items).create_menu(
+                not_found_action=lambda msg=None: msg,
+                selection_action=lambda sp, sd, st, entry_point: entry_point(4, 5),
+                add_menu_item=lambda label, action: (labels.append(label), added.append(action)),
+                add_menu=lambda label: None, module_cache=executor.module_cache)
+        assert labels == ['Add', 'Scaled Add', 'Missing', 'Add not found', 'Scaled Add not found',
+                          'Missing not found']
+        assert 'sandbox_import_package.sandbox_module' not in sys.modules and not marker.exists(), \
+            'Building the menu should not import the plugin module in the host'
+        assert added[0]().result(timeout=30) == 9
+        assert added[1]().result(timeout=30) == 18
+        assert int(marker.read_text()) not in (0, os.getpid()), 'The module should be imported in a worker'
+
+
+@pytest.mark.Plugins
+def test_sandbox_pool_replacement(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(tmp_path)
+    monkeypatch.setattr(sandbox, 'POOL_RECYCLES_WORKERS', False)
+    write_plugin_module(tmp_path, 'sandbox_package.sandbox_module', [], source=SANDBOX_SOURCE)
+    with sandbox.SandboxExecutor(max_workers=1, max_calls_per_worker=2) as executor:
+        worker = executor.call('sandbox_package.sandbox_module', 'pid', timeout=30)
+        assert executor.call('sandbox_package.sandbox_module', 'pid', timeout=30) == worker
+        assert executor.call('sandbox_package.sandbox_module', 'pid', timeout=30) != worker, \
+            'The pool should be replaced after max_calls_per_worker calls when workers are not recycled'
+        assert executor.restarts == 0
+
+
+@pytest.mark.Benchmark
+def test_sandbox_invocation_overhead(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(tmp_path)
+    write_plugin_module(tmp_path, 'sandbox_bench_package.sandbox_module', [],
+                        source=SANDBOX_SOURCE + '\nimport time\ntime.sleep(0.1)\n')
+    call_count: int = 20
+    with sandbox.SandboxExecutor(preload=['sandbox_bench_package.sandbox_module'], max_workers=1) as executor:
+        executor.warm_up()
+        start = time.perf_counter()
+        for call_idx in range(0, call_count):
+            executor.call('sandbox_bench_package.sandbox_module', 'add', call_idx, timeout=30)
+        warm: float = (time.perf_counter() - start) / call_count
+    start = time.perf_counter()
+    for call_idx in range(0, 3):
+        with sandbox.SandboxExecutor(max_workers=1) as executor:
+            executor.call('sandbox_bench_package.sandbox_module', 'add', call_idx, timeout=30)
+    cold: float = (time.perf_counter() - start) / 3
+    print(f'\nper invocation overhead, warm worker: {warm * 1000:.2f} msec, cold worker: {cold * 1000:.1f} msec')
+    assert warm < cold, attr_error('Invocation Overhead', cold, warm)
@@ -0,0 +1,56 @@
+import pathlib
+import pytest
+
+import plugin_manager.model.json_handler as jh
+import plugin_manager.model.snapshot as snapshot
+
+from tests.plugin_fixtures import plugin_fixture, plugin_menus_fixture, corpus_plugin, write_plugin_corpus
+from tests.test_tools import attr_error
+from tests.model.test_plugin import compare_plugin, compare_menu
+
+
+@pytest.mark.Plugins
+def test_snapshot_round_trip(tmp_path, plugin_fixture):
+    snapshot_path = pathlib.Path(tmp_path, 'plugins.snapshot')
+    assert snapshot.export_snapshot(plugin_fixture, snapshot_path) == len(plugin_fixture)
+    with snapshot.load_snapshot(snapshot_path) as catalog:
+        assert len(catalog) == len(plugin_fixture), attr_error('Plugin Count', len(plugin_fixture), len(catalog))
+        for plugin, check_plugin in zip(plugin_fixture, catalog):
+            compare_plugin(plugin, check_plugin)
+            for menu, check_menu in zip(plugin.menus, check_plugin.menus):
+                assert len(menu.items) == len(check_menu.items)
+                compare_menu(menu, check_menu)
+        assert catalog[-1] is catalog[len(plugin_fixture) - 1], 'Built Plugins should be cached'
+
+
+@pytest.mark.Plugins
+def test_snapshot_lazy_access(tmp_path):
+    plugin_path = write_plugin_corpus(pathlib.Path(tmp_path, 'plugins'), 50)
+    snapshot_path = pathlib.Path(tmp_path, 'plugins.snapshot')
+    snapshot.export_snapshot(plugin_path, snapshot_path)
+    with snapshot.load_snapshot(snapshot_path) as catalog:
+        assert len(catalog) == 50
+        assert catalog.menu_titles(10) == ['Menu 0', 'Menu 1']
+        menu = catalog.get_menu(10, 'Menu 1')
+        compare_menu(corpus_plugin(10).menus[1], menu)
+        assert catalog.get_menu(10, 'Menu 1') is menu, 'A built menu should be cached'
+        assert catalog.get_menu(10, 'No Such Menu') is None
+        assert all(plugin is None for plugin in catalog.plugins), 'Menu access should not build Plugins'
+        assert sum(menu is not None for menu in catalog.menus) == 1, 'Only the requested menu should be built'
+        assert catalog[10].menus[1] is menu, 'A Plugin should be built from the cached menus'
+        compare_plugin(corpus_plugin(20), catalog[20])
+        assert sum(plugin is not None for plugin in catalog.plugins) == 2, 'Only the accessed Plugins should be built'
+        assert sum(menu is not None for menu in catalog.menus) == 4, 'Only the menus of built Plugins should be built'
+        assert catalog.get_menu(20, 'Menu 0') is catalog[20].menus[0]
+        assert [plugin.name for plugin in catalog[30:33]] == [corpus_plugin(idx).name for idx in range(30, 33)]
+        assert sum(plugin is not None for plugin in catalog.plugins) == 5, 'A slice should only build its Plugins'
+        names = [plugin.name for plugin in catalog]
+        assert names == [plugin.name for plugin in jh.retrieve_plugins(plugin_path)]
+
+
+@pytest.mark.Plugins
+def test_snapshot_invalid_file(tmp_path):
+    snapshot_path = pathlib.Path(tmp_path, 'plugins.snapshot')
+    snapshot_path.write_bytes(b'not a snapshot file at all, but long enough for a header')
+    with pytest.raises(ValueError):
+        snapshot.load_snapshot(snapshot_path)
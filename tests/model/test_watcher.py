@@ -0,0 +1,159 @@
+import importlib
+import json
+import os
+import pathlib
+import sys
+import time
+import pytest
+
+import plugin_manager.model.entry_points as entry_points
+import plugin_manager.model.json_handler as jh
+import plugin_manager.model.plugin as plugin
+import plugin_manager.model.watcher as watcher
+
+from tests.plugin_fixtures import corpus_plugin, write_plugin_corpus, write_plugin_module
+from tests.test_tools import attr_error
+
+
+def touch_later(file_path: pathlib.Path) -> None:
+    """
+    Move a file's modification time a second forward, so a rewrite within the same clock tick is still detected
+
+    """
+    stat = file_path.stat()
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.mark.Plugins
+def test_plugin_watcher(tmp_path, monkeypatch):
+    module_root = pathlib.Path(tmp_path, 'modules')
+    module_path = write_plugin_module(module_root, 'watched_package.watched_module', ['action1'])
+    monkeypatch.syspath_prepend(module_root)
+    importlib.invalidate_caches()
+    plugin_path = pathlib.Path(tmp_path, 'plugins')
+    write_plugin_corpus(plugin_path, 3)
+    watched_plugin = corpus_plugin(3)
+    watched_plugin.menus[0].module_name = 'watched_package.watched_module'
+    jh.save_plugins([watched_plugin], plugin_path)
+
+    module_cache = plugin.ModuleCache()
+    discovery = entry_points.EntryPointDiscovery()
+    plugin_changes: list[watcher.PluginChange] = []
+    module_changes: list[watcher.ModuleChange] = []
+    plugin_watcher = watcher.PluginWatcher(plugin_path, plugin_changes.append, module_changes.append, module_cache,
+                                           discovery)
+    assert len(plugin_watcher.start()) == 4
+    assert str(module_path) not in plugin_watcher.module_names, 'A module that was not imported is not watched'
+    module_cache.resolve('watched_package.watched_module')
+    monkeypatch.setitem(sys.modules, 'watched_package.watched_module', sys.modules['watched_package.watched_module'])
+    assert discovery.entry_points('watched_package.watched_module') == ['action1']
+    assert plugin_watcher.poll() == [], 'Nothing changed since the watcher started'
+    assert str(module_path) in plugin_watcher.module_names, 'A module imported after start should be watched'
+
+    write_plugin_module(module_root, 'watched_package.watched_module', ['action1', 'action2'])
+    touch_later(module_path)
+    changes = plugin_watcher.poll()
+    assert changes == module_changes and plugin_changes == []
+    assert module_changes[0].module_name == 'watched_package.watched_module' and module_changes[0].error is None
+    assert [changed.name for changed in module_changes[0].plugins] == [watched_plugin.name]
+    assert 'watched_package.watched_module' not in module_cache.namespaces
+    assert module_cache.resolve('watched_package.watched_module')['action2']() == ('action2', ())
+    assert discovery.entry_points('watched_package.watched_module') == ['action1', 'action2']
+
+    module_path.write_text('def action1(:\n')
+    touch_later(module_path)
+    module_changes.clear()
+    plugin_watcher.poll()
+    assert module_changes[0].error.startswith('SyntaxError'), 'A failed reload should be reported, not raised'
+
+    changed_plugin = corpus_plugin(1, menu_count=1)
+    pathlib.Path(plugin_path, 'corpus-00001.json').write_text(json.dumps(changed_plugin, cls=jh.PluginJSONEncoder))
+    touch_later(pathlib.Path(plugin_path, 'corpus-00001.json'))
+    pathlib.Path(plugin_path, 'corpus-00002.json').unlink()
+    write_plugin_corpus(plugin_path, 1, start=7)
+    module_changes.clear()
+    changes = plugin_watcher.poll()
+    assert changes == plugin_changes and module_changes == []
+    assert [(change.file_name, change.kind) for change in plugin_changes] == \
+        [('corpus-00001.json', 'changed'), ('corpus-00002.json', 'removed'), ('corpus-00007.json', 'added')]
+    assert len(plugin_changes[0].plugin.menus) == 1 and len(plugin_changes[0].previous.menus) == 2
+    assert plugin_changes[1].plugin is None and plugin_changes[1].previous.name == corpus_plugin(2).name
+    assert sorted(plugin_watcher.plugins) == ['Corpus_Author-Corpus_Plugin_00003.json', 'corpus-00000.json',
+                                              'corpus-00001.json', 'corpus-00007.json']
+
+
+@pytest.mark.Plugins
+def test_plugin_watcher_non_plugin_json(tmp_path):
+    plugin_path = write_plugin_corpus(pathlib.Path(tmp_path, 'plugins'), 2)
+    pathlib.Path(plugin_path, 'settings.json').write_text('{"foo": 1}')
+    plugin_changes: list[watcher.PluginChange] = []
+    plugin_watcher = watcher.PluginWatcher(plugin_path, plugin_changes.append)
+    assert [started.name for started in plugin_watcher.start()] == [corpus_plugin(idx).name for idx in range(0, 2)]
+    assert 'settings.json' not in plugin_watcher.plugins
+
+    pathlib.Path(plugin_path, 'settings.json').write_text('{"foo": 2}')
+    touch_later(pathlib.Path(plugin_path, 'settings.json'))
+    pathlib.Path(plugin_path, 'values.json').write_text('[1, 2, 3]')
+    changed_plugin = corpus_plugin(1, menu_count=1)
+    pathlib.Path(plugin_path, 'corpus-00001.json').write_text(json.dumps(changed_plugin, cls=jh.PluginJSONEncoder))
+    touch_later(pathlib.Path(plugin_path, 'corpus-00001.json'))
+    plugin_watcher.poll()
+    assert [(change.file_name, change.kind, change.plugin) for change in plugin_changes[1:]] == \
+        [('settings.json', 'changed', None), ('values.json', 'added', None)], \
+        'A JSON file that does not hold a Plugin should be reported as holding no Plugin'
+    assert plugin_changes[0].file_name == 'corpus-00001.json' and len(plugin_changes[0].plugin.menus) == 1
+    assert sorted(plugin_watcher.plugins) == ['corpus-00000.json', 'corpus-00001.json']
+
+
+@pytest.mark.Plugins
+def test_plugin_watcher_stat_budget(tmp_path, monkeypatch):
+    for folder_idx in range(0, 4):
+        module_root = pathlib.Path(tmp_path, f'folder{folder_idx}')
+        write_plugin_module(module_root, f'budget_module{folder_idx}', ['action1'])
+        monkeypatch.syspath_prepend(module_root)
+    importlib.invalidate_caches()
+    for folder_idx in range(0, 4):
+        monkeypatch.setitem(sys.modules, f'budget_module{folder_idx}',
+                            importlib.import_module(f'budget_module{folder_idx}'))
+    plugins: list[plugin.Plugin] = []
+    for idx in range(0, 10):
+        budget_plugin = corpus_plugin(idx, menu_count=4, item_count=1)
+        for menu_idx, menu in enumerate(budget_plugin.menus):
+            menu.module_name = f'budget_module{menu_idx}'
+        plugins.append(budget_plugin)
+    plugin_path = pathlib.Path(tmp_path, 'plugins')
+    plugin_path.mkdir()
+    jh.save_plugins(plugins, plugin_path)
+    plugin_watcher = watcher.PluginWatcher(plugin_path, stat_budget=4)
+    plugin_watcher.start()
+    assert len(plugin_watcher.module_files) == 4
+    polled: list[int] = []
+    for poll_idx in range(0, 4):
+        plugin_watcher.poll()
+        polled.append(plugin_watcher.last_poll_files)
+    assert polled == [10, 4, 10, 4], 'Each poll should stop scanning folders once the budget is used'
+
+
+@pytest.mark.Benchmark
+def test_plugin_watcher_benchmark(tmp_path):
+    plugin_count: int = 2000
+    plugin_path = write_plugin_corpus(pathlib.Path(tmp_path, 'plugins'), plugin_count)
+    plugin_watcher = watcher.PluginWatcher(plugin_path)
+    plugin_watcher.start()
+
+    def per_file_stat() -> float:
+        start = time.perf_counter()
+        for json_path in jh.plugin_files(plugin_path):
+            json_path.stat()
+        return time.perf_counter() - start
+
+    def watcher_poll() -> float:
+        start = time.perf_counter()
+        assert plugin_watcher.poll() == []
+        return time.perf_counter() - start
+
+    stat_time: float = min(per_file_stat() for run_idx in range(0, 3))
+    poll_time: float = min(watcher_poll() for run_idx in range(0, 3))
+    print(f'\nPolling {plugin_count} plugin files, glob and stat: {stat_time * 1000:.1f} msec, watcher poll: '
+          f'{poll_time * 1000:.1f} msec')
+    assert poll_time < stat_time, attr_error('Poll Time', stat_time, poll_time)
@@ -0,0 +1,124 @@
+import json
+import pathlib
+import time
+import pytest
+
+import plugin_manager.model.json_handler as jh
+import plugin_manager.model.workspace as workspace
+
+from tests.plugin_fixtures import corpus_plugin, write_plugin_corpus
+from tests.test_tools import attr_error
+
+
+@pytest.mark.Plugins
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, jh.HEADER_CHUNK_SIZE])
+def test_read_plugin_header(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(jh, 'HEADER_CHUNK_SIZE', chunk_size)
+    test_plugin = corpus_plugin(0, menu_count=12, item_count=1)
+    json_path = pathlib.Path(tmp_path, 'plugin.json')
+    json_path.write_text(json.dumps(test_plugin, cls=jh.PluginJSONEncoder, indent=2))
+    header = jh.read_plugin_header(json_path)
+    assert header == jh.PluginHeader(json_path=json_path, name=test_plugin.name,
+                                     description=test_plugin.description, author_name=test_plugin.author_name,
+                                     author_email=test_plugin.author_email, menu_count=12)
+
+
+@pytest.mark.Plugins
+def test_read_plugin_header_fallback(tmp_path):
+    test_plugin = corpus_plugin(0, menu_count=3)
+    v1_path = pathlib.Path(tmp_path, 'v1.json')
+    v1_path.write_text(json.dumps(test_plugin, cls=jh.PluginJSONEncoderV1))
+    header = jh.read_plugin_header(v1_path)
+    assert header.name == test_plugin.name and header.menu_count == 3, 'Format 1 files should be decoded in full'
+    pathlib.Path(tmp_path, 'list.json').write_text('[1, 2]')
+    pathlib.Path(tmp_path, 'broken.json').write_text('{"name": ')
+    assert jh.read_plugin_header(pathlib.Path(tmp_path, 'list.json')) is None
+    assert [header.json_path.name for header in jh.read_plugin_headers(tmp_path)] == ['v1.json']
+
+
+@pytest.mark.Plugins
+def test_lru_cache():
+    evicted: list[tuple] = []
+    cache = workspace.LRUCache(2, on_evict=lambda key, value: evicted.append((key, value)))
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert evicted == [('b', 2)], 'The least recently used value should be evicted'
+    assert cache.keys() == ['a', 'c'] and 'b' not in cache and len(cache) == 2
+    assert cache.pop('a') == 1 and evicted == [('b', 2)]
+    with pytest.raises(ValueError):
+        workspace.LRUCache(0)
+
+
+@pytest.mark.Plugins
+def test_workspace(tmp_path):
+    plugin_path = write_plugin_corpus(pathlib.Path(tmp_path, 'plugins'), 4)
+    plugin_workspace = workspace.Workspace(plugin_path, plugin_capacity=2)
+    headers = plugin_workspace.headers()
+    assert [header.name for header in headers] == [corpus_plugin(idx).name for idx in range(0, 4)]
+    assert plugin_workspace.decode_count == 0, 'Listing the folder should not decode the Plugins'
+
+    first_path = headers[0].json_path
+    first_plugin = plugin_workspace.plugin(first_path)
+    assert plugin_workspace.plugin(first_path) is first_plugin and plugin_workspace.decode_count == 1
+    first_plugin.name = 'Edited Plugin'
+    plugin_workspace.keep_modified(first_path, first_plugin)
+    plugin_workspace.plugin(headers[1].json_path)
+    plugin_workspace.plugin(headers[2].json_path)
+    assert first_path not in plugin_workspace.plugins
+    assert plugin_workspace.plugin(first_path) is first_plugin, 'Unsaved edits should outlive the cache'
+
+    jh.save_plugins([first_plugin], plugin_path)
+    header = plugin_workspace.saved(first_path, first_plugin)
+    assert header.name == 'Edited Plugin' and plugin_workspace.modified_plugins == {}
+    assert plugin_workspace.headers()[0] == header
+
+
+@pytest.mark.Plugins
+def test_workspace_save_as(tmp_path):
+    plugin_path = write_plugin_corpus(pathlib.Path(tmp_path, 'plugins'), 2)
+    plugin_workspace = workspace.Workspace(plugin_path)
+    headers = plugin_workspace.headers()
+    first_path = headers[0].json_path
+    first_plugin = plugin_workspace.plugin(first_path)
+    first_plugin.name = 'Renamed Plugin'
+    plugin_workspace.keep_modified(first_path, first_plugin)
+
+    new_path = pathlib.Path(plugin_path, 'renamed.json')
+    plugin_workspace.forget(headers[1].json_path, first_plugin)
+    assert headers[1].json_path not in plugin_workspace.plugins, 'Nothing should be held for an unread file'
+    plugin_workspace.forget(first_path, first_plugin)
+    plugin_workspace.saved(new_path, first_plugin)
+    assert first_path not in plugin_workspace.modified_plugins and first_path not in plugin_workspace.plugins
+    assert plugin_workspace.plugin(new_path) is first_plugin
+    assert plugin_workspace.plugin(first_path).name == corpus_plugin(0).name, \
+        'The file the Plugin was read from should be decoded again'
+
+    second_plugin = plugin_workspace.plugin(headers[1].json_path)
+    plugin_workspace.forget(headers[1].json_path, first_plugin)
+    assert plugin_workspace.plugin(headers[1].json_path) is second_plugin, 'Other Plugins should be kept'
+
+
+@pytest.mark.Benchmark
+def test_workspace_benchmark(tmp_path):
+    plugin_count: int = 200
+    plugin_path = pathlib.Path(tmp_path, 'plugins')
+    plugin_path.mkdir()
+    jh.save_plugins([corpus_plugin(idx, menu_count=20, item_count=50) for idx in range(0, plugin_count)], plugin_path)
+
+    def list_headers() -> float:
+        start = time.perf_counter()
+        assert len(workspace.Workspace(plugin_path).headers()) == plugin_count
+        return time.perf_counter() - start
+
+    def decode_all() -> float:
+        start = time.perf_counter()
+        assert len(jh.retrieve_plugins(plugin_path)) == plugin_count
+        return time.perf_counter() - start
+
+    decode_time: float = min(decode_all() for run_idx in range(0, 3))
+    header_time: float = min(list_headers() for run_idx in range(0, 3))
+    print(f'\nListing {plugin_count} plugins, full decode: {decode_time * 1000:.1f} msec, headers: '
+          f'{header_time * 1000:.1f} msec')
+    assert header_time * 5 < decode_time, attr_error('Header Time', decode_time / 5, header_time)
@@ -1,5 +1,8 @@
+import json
+import pathlib
 import pytest
 
+import plugin_manager.model.json_handler as jh
 import plugin_manager.model.plugin as plugin
 
 
@@ -66,3 +69,83 @@ def plugin_fixture(plugin_menus_fixture) -> list[plugin.Plugin]:
                           author_email='stevesjunk1@gmail.com',
                           menus=[plugin_menus_fixture[1]])]
 
+
+
+def corpus_plugin(plugin_idx: int, menu_count: int = 2, item_count: int = 5) -> plugin.Plugin:
+    """
+    Creates a Plugin object with a name unique to the provided index, for use in building plugin folders of
+    arbitrary size
+
+    :param plugin_idx: the index of the Plugin within the corpus
+    :type plugin_idx: int
+    :param menu_count: the number of PluginMenu objects in the Plugin
+    :type menu_count: int
+    :param item_count: the number of PluginMenuItem objects in each PluginMenu
+    :type item_count: int
+    :return: a Plugin object
+    :rtype: plugin_config.Plugin
+
+    """
+    menus: list[plugin.PluginMenu] = []
+    for menu_idx in range(0, menu_count):
+        items = [plugin.PluginMenuItem(title=f'Item {menu_idx}.{item_idx}', entry_point_name='entry_point1',
+                                       select_person=item_idx % 2 == 0, select_date_range=False,
+                                       select_dp_type=item_idx % 3 == 0) for item_idx in range(0, item_count)]
+        menus.append(plugin.PluginMenu(title=f'Menu {menu_idx}', module_name='dummy_package.dummy_module1',
+                                       items=items))
+    return plugin.Plugin(name=f'Corpus Plugin {plugin_idx:05d}', description='Generated test plugin',
+                         author_name='Corpus Author', author_email='corpus@example.com', menus=menus)
+
+
+def write_plugin_corpus(plugin_path: pathlib.Path, count: int, start: int = 0) -> pathlib.Path:
+    """
+    Writes count Plugin JSON files to the provided folder, creating the folder if necessary
+
+    :param plugin_path: the folder the JSON files will be written to
+    :type plugin_path: pathlib.Path
+    :param count: the number of Plugin JSON files to be written
+    :type count: int
+    :param start: the index of the first Plugin to be written
+    :type start: int
+    :return: the plugin folder
+    :rtype: pathlib.Path
+
+    """
+    plugin_path.mkdir(parents=True, exist_ok=True)
+    for plugin_idx in range(start, start + count):
+        json_str = json.dumps(corpus_plugin(plugin_idx), cls=jh.PluginJSONEncoder)
+        pathlib.Path(plugin_path, f'corpus-{plugin_idx:05d}.json').write_text(json_str)
+    return plugin_path
+
+
+def write_plugin_module(module_path: pathlib.Path, module_name: str, entry_points: list[str],
+                        source: str = '') -> pathlib.Path:
+    """
+    Writes a plugin module containing a function for each of the provided entry point names, creating the packages
+    named in module_name if necessary.  module_path must be on sys.path for the module to be imported.
+
+    :param module_path: the folder the module's top level package is written to
+    :type module_path: pathlib.Path
+    :param module_name: the dotted name of the module
+    :type module_name: str
+    :param entry_points: the names of the functions to be defined in the module
+    :type entry_points: list[str]
+    :param source: additional source code, placed ahead of the entry point functions
+    :type source: str
+    :return: the path of the module file
+    :rtype: pathlib.Path
+
+    """
+    *package_names, name = module_name.split('.')
+    module_path.mkdir(parents=True, exist_ok=True)
+    package_path: pathlib.Path = module_path
+    for package_name in package_names:
+        package_path = pathlib.Path(package_path, package_name)
+        package_path.mkdir(parents=True, exist_ok=True)
+        pathlib.Path(package_path, '__init__.py').touch()
+    lines: list[str] = [source]
+    for entry_point in entry_points:
+        lines.append(f'def {entry_point}(*args):\n    return {entry_point!r}, args\n')
+    file_path = pathlib.Path(package_path, f'{name}.py')
+    file_path.write_text('\n'.join(lines))
+    return file_path
@@ -70,9 +70,30 @@ def compare_mdyhms(datetime1: datetime, datetime2: datetime) -> bool:
         return False
 
 
+def object_state(obj: Any) -> dict[str, Any]:
+    """
+    Returns the attributes of an object as a dict, using the __dict__ property or, for classes that use __slots__,
+    the slot values
+
+    :param obj: the object whose attributes are to be returned
+    :type obj: Any
+    :return: the object's attributes keyed by name
+    :rtype: dict[str, Any]
+
+    """
+    if hasattr(obj, '__dict__'):
+        return obj.__dict__
+    state: dict[str, Any] = {}
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            if name not in state and hasattr(obj, name):
+                state[name] = getattr(obj, name)
+    return state
+
+
 def compare_object(obj1: Any, obj2: Any) -> bool:
     """
-    Compare two objects by comparing the entries in their __dict__ property
+    Compare two objects by comparing the entries in their __dict__ property, or their slot values
 
     :param obj1: the first of a pair of objects to be compared
     :type obj1: Any
@@ -82,18 +103,20 @@ def compare_object(obj1: Any, obj2: Any) -> bool:
     :rtype: bool
 
     """
-    if isinstance(obj2, obj1.__class__) and obj1.__dict__ == obj2.__dict__:
+    state1: dict[str, Any] = object_state(obj1)
+    state2: dict[str, Any] = object_state(obj2)
+    if isinstance(obj2, obj1.__class__) and state1 == state2:
         return True
     else:
-        for key, value in obj1.__dict__.items():
-            if key not in obj2.__dict__:
+        for key, value in state1.items():
+            if key not in state2:
                 return False
             elif not isinstance(value, (Decimal, float)):
-                if value != obj2.__dict__[key]:
+                if value != state2[key]:
                     return False
                 else:
                     return True
-            elif abs(value - obj2.__dict__[key]) > 0.1:
+            elif abs(value - state2[key]) > 0.1:
                 return False
             else:
                 return True